@@ -0,0 +1,184 @@
+"""
+Oppstartsmåling for KIAS Dørkonfigurator.
+
+Kjør: uv run python scripts/benchmark_startup.py [--repeat 5] [--doors 50] [--output fil.json]
+
+Måler med offscreen Qt, hver kjøring i en ny prosess:
+  - importtid per toppnivåpakke (python -X importtime -c "import main")
+  - tid til hovedvinduet er vist, via run_app (steg fra STARTUP_TIMINGS)
+  - første bygging av 3D-scenen (fra vist til scenen er lastet opp);
+    hoppes over (null i JSON, årsak i "skipped") når 3D ikke er
+    tilgjengelig eller scenen ikke blir ferdig innen SCENE_TIMEOUT
+  - første oppdatering av kappelisten med --doors dører
+
+Resultatet skrives som JSON (median per måling), slik at endringer kan
+sammenlignes mellom versjoner.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Maks ventetid på at 3D-scenen blir ferdig bygd (sekunder)
+SCENE_TIMEOUT = 30.0
+
+
+def _child_env() -> dict:
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return env
+
+
+def measure_imports() -> dict:
+    """Importtid (ms) per toppnivåpakke: summen av egen tid for modulene i pakken."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=ROOT, env=_child_env(), capture_output=True, text=True, check=True,
+    )
+    packages: dict = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _cumulative, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0.0) + int(self_us) / 1000
+    return packages
+
+
+def measure_startup(doors: int) -> dict:
+    """Kjører run_app i en ny prosess og returnerer stegtidene (ms)."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), '--child', '--doors', str(doors)],
+        cwd=ROOT, env=_child_env(), capture_output=True, text=True, check=True,
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['process_total'] = (time.perf_counter() - started) * 1000
+    return timings
+
+
+def _run_child(doors: int) -> None:
+    """Prosessen som måles: importerer og starter appen via run_app."""
+    t0 = time.perf_counter()
+    sys.path.insert(0, str(ROOT))
+    sys.argv = sys.argv[:1]
+
+    from src.gui import main_window
+    from src.gui.widgets import door_preview_3d
+    imported = time.perf_counter()
+    timings = {'import_main_window': (imported - t0) * 1000}
+
+    def on_started(window):
+        from PyQt6.QtCore import QTimer
+        from PyQt6.QtWidgets import QApplication
+
+        marks = main_window.STARTUP_TIMINGS
+        for stage in ('qapplication', 'theme', 'main_window', 'shown'):
+            timings[stage] = (marks[stage] - t0) * 1000
+        shown = marks['shown']
+        preview = window.door_preview
+
+        def scene_ready() -> bool:
+            return bool(preview._scene) and preview._build_future is None
+
+        def finish(skipped=None):
+            if skipped:
+                # Ingen scene å måle; ventetiden skal ikke se ut som en tegnetid
+                timings['first_scene'] = None
+                timings['skipped'] = {'first_scene': skipped}
+            else:
+                timings['first_scene'] = (time.perf_counter() - shown) * 1000
+            timings['first_scene_ready'] = scene_ready()
+
+            # Første oppdatering av kappelisten
+            import dataclasses
+            from src.models.production_list import get_production_list
+            prod_list = get_production_list()
+            prod_list.add_doors(dataclasses.replace(window.door) for _ in range(doors))
+            start = time.perf_counter()
+            window.production_list_tab.refresh()
+            timings['first_kappeliste_refresh'] = (time.perf_counter() - start) * 1000
+
+            preview.shutdown()
+            window.door_list_tab.shutdown()
+            QApplication.instance().quit()
+
+        def poll():
+            if scene_ready():
+                finish()
+            elif not door_preview_3d.HAS_3D:
+                finish(skipped='3D-visning ikke tilgjengelig (pyqtgraph/PyOpenGL)')
+            elif time.perf_counter() - shown > SCENE_TIMEOUT:
+                finish(skipped=f'scenen ble ikke ferdig innen {SCENE_TIMEOUT:.0f} s')
+            else:
+                QTimer.singleShot(5, poll)
+
+        poll()
+
+    try:
+        main_window.run_app(on_started=on_started)
+    except SystemExit:
+        pass
+    print(json.dumps(timings))
+
+
+def _median(values: list):
+    """Median av målingene som ble gjort (None = hoppet over i alle kjøringene)."""
+    measured = [v for v in values if v is not None]
+    return round(statistics.median(measured), 2) if measured else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='antall kjøringer (median)')
+    parser.add_argument('--doors', type=int, default=50, help='dører i kappelisten')
+    parser.add_argument('--output', type=Path, help='JSON-fil (standard: stdout)')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _run_child(args.doors)
+        return
+
+    runs = [measure_startup(args.doors) for _ in range(args.repeat)]
+    imports = [measure_imports() for _ in range(args.repeat)]
+    import_ms = {
+        p: round(statistics.median(run.get(p, 0.0) for run in imports), 2)
+        for p in {p for run in imports for p in run}
+    }
+
+    report = {
+        'version': (ROOT / 'VERSION').read_text(encoding='utf-8').strip(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'doors': args.doors,
+        'startup_ms': {
+            stage: _median([run[stage] for run in runs])
+            for stage in runs[0] if stage not in ('first_scene_ready', 'skipped')
+        },
+        'first_scene_ready': all(run['first_scene_ready'] for run in runs),
+        'skipped': {stage: reason for run in runs
+                    for stage, reason in run.get('skipped', {}).items()},
+        'import_ms': dict(sorted(import_ms.items(), key=lambda kv: -kv[1])),
+        'runs': runs,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text + '\n', encoding='utf-8')
+        print(f"Skrev {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Samlet og forsinket oppdatering ved endringer i dørskjemaet.
+
+Hvert tastetrykk i en spinbox eller tekstboks gir et values_changed-
+signal. I stedet for å bygge 3D-scenen og detaljfanen på nytt for
+hvert signal, samles endringene opp og kjøres én gang når brukeren
+har holdt opp en kort stund. Hver mottaker kjøres bare hvis minst ett
+av feltene den bryr seg om faktisk er endret.
+
+Mottakere registrert med throttle_ms kjøres i stedet straks ved første
+endring, og deretter høyst én gang per throttle_ms så lenge endringene
+fortsetter (siste endring kjøres alltid).
+"""
+from typing import Callable, Iterable, List, Optional, Set
+
+from PyQt6.QtCore import QObject, QTimer
+
+
+class _Consumer:
+    """Registrert mottaker med feltavhengigheter."""
+
+    __slots__ = ('name', 'callback', 'depends_on', 'ignores', 'throttle', 'dirty')
+
+    def __init__(self, name: str, callback: Callable[[], None],
+                 depends_on: Optional[Set[str]], ignores: Set[str],
+                 throttle: Optional[QTimer] = None):
+        self.name = name
+        self.callback = callback
+        self.depends_on = depends_on
+        self.ignores = ignores
+        # Tidsbryter for strupte mottakere (None = vanlig forsinket mottaker)
+        self.throttle = throttle
+        # Strupt mottaker har endringer som venter på neste kjøring
+        self.dirty = False
+
+    def wants(self, fields: Optional[Set[str]]) -> bool:
+        """True hvis mottakeren må kjøres for de endrede feltene."""
+        if fields is None:
+            return True  # Ukjent endring → alle kjøres
+        if self.depends_on is not None:
+            return bool(fields & self.depends_on)
+        return bool(fields - self.ignores)
+
+
+class ChangeScheduler(QObject):
+    """Slår sammen endringer og kjører berørte mottakere etter en pause.
+
+    Bruk:
+        scheduler = ChangeScheduler(delay_ms=150)
+        scheduler.register('preview', preview_update, ignores={'notes'},
+                           throttle_ms=100)
+        scheduler.register('detail', detail_update)
+        scheduler.schedule({'width'})   # ved hver endring
+    """
+
+    DEFAULT_DELAY_MS = 150
+
+    def __init__(self, delay_ms: int = DEFAULT_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self._consumers: List[_Consumer] = []
+        self._pending: Optional[Set[str]] = set()
+        self._has_pending = False
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def delay_ms(self) -> int:
+        """Forsinkelse i millisekunder før samlede endringer kjøres."""
+        return self._timer.interval()
+
+    @delay_ms.setter
+    def delay_ms(self, value: int) -> None:
+        self._timer.setInterval(max(0, int(value)))
+
+    def register(self, name: str, callback: Callable[[], None],
+                 depends_on: Optional[Iterable[str]] = None,
+                 ignores: Iterable[str] = (),
+                 throttle_ms: Optional[int] = None) -> None:
+        """Registrerer en mottaker.
+
+        Args:
+            name: Navn (for feilsøking)
+            callback: Kalles uten argumenter når mottakeren skal oppdateres
+            depends_on: Felter mottakeren avhenger av (None = alle)
+            ignores: Felter som ikke påvirker mottakeren (brukes når
+                     depends_on er None)
+            throttle_ms: Kjør straks og deretter høyst én gang per
+                         throttle_ms, i stedet for etter pausen (None = pause)
+        """
+        throttle = None
+        if throttle_ms is not None:
+            throttle = QTimer(self)
+            throttle.setSingleShot(True)
+            throttle.setInterval(max(0, int(throttle_ms)))
+        consumer = _Consumer(
+            name, callback,
+            set(depends_on) if depends_on is not None else None,
+            set(ignores), throttle,
+        )
+        if throttle is not None:
+            throttle.timeout.connect(lambda: self._run_throttled(consumer))
+        self._consumers.append(consumer)
+
+    def schedule(self, fields: Optional[Iterable[str]] = None) -> None:
+        """Registrerer endrede felter og (re)starter ventetiden.
+
+        Args:
+            fields: Endrede feltnavn, eller None hvis ukjent (alle mottakere kjøres)
+        """
+        if fields is not None:
+            fields = set(fields)
+        delayed = False
+        for consumer in self._consumers:
+            if consumer.throttle is None:
+                delayed = True
+            elif consumer.wants(fields):
+                consumer.dirty = True
+                if not consumer.throttle.isActive():
+                    self._run_throttled(consumer)
+        if not delayed:
+            return
+        if fields is None:
+            self._pending = None
+        elif self._pending is not None:
+            self._pending.update(fields)
+        self._has_pending = True
+        self._timer.start()
+
+    def _run_throttled(self, consumer: _Consumer) -> None:
+        """Kjører en strupt mottaker hvis den har endringer, og starter ny periode."""
+        if consumer.dirty:
+            consumer.dirty = False
+            consumer.throttle.start()
+            consumer.callback()
+
+    def has_pending(self) -> bool:
+        """True hvis det finnes endringer som ikke er kjørt ennå."""
+        return self._has_pending or any(c.dirty for c in self._consumers)
+
+    def flush(self) -> None:
+        """Kjører berørte mottakere umiddelbart for alle ventende endringer."""
+        self._timer.stop()
+        fields = self._pending
+        has_pending = self._has_pending
+        self._pending = set()
+        self._has_pending = False
+        for consumer in self._consumers:
+            if consumer.throttle is not None:
+                self._run_throttled(consumer)
+            elif has_pending and consumer.wants(fields):
+                consumer.callback()
+
+    def cancel(self) -> None:
+        """Forkaster ventende endringer uten å kjøre mottakerne."""
+        self._timer.stop()
+        self._pending = set()
+        self._has_pending = False
+        for consumer in self._consumers:
+            consumer.dirty = False
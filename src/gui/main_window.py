@@ -1,9 +1,12 @@
 """
 Hovedvindu for KIAS Dørkonfigurator.
 """
+import importlib
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -11,7 +14,7 @@ from PyQt6.QtWidgets import (
     QFileDialog, QProgressBar, QPushButton, QSplitter, QGroupBox,
     QTabWidget, QLabel, QScrollArea
 )
-from PyQt6.QtCore import Qt, QSettings, QSize
+from PyQt6.QtCore import Qt, QSettings, QSize, QTimer
 from PyQt6.QtGui import QAction, QKeySequence, QIcon
 
 try:
@@ -20,12 +23,12 @@ try:
 except ImportError:
     HAS_ICONS = False
 
-from ..models.door import DoorParams
+from ..models.door import DoorParams, METADATA_FIELDS
 from ..models.project import save_project, load_project, new_project, PROJECT_EXTENSION
 from ..models.production_list import get_production_list
-from ..export.pdf_exporter import export_door_pdf
 from ..utils.constants import APP_NAME, APP_VERSION, PROJECT_FILTER, DOOR_TYPES
 
+from .change_scheduler import ChangeScheduler
 from .widgets.door_form import DoorForm
 from .widgets.door_preview_3d import DoorPreview3D
 from .widgets import graphics_settings as gfx
@@ -34,12 +37,48 @@ from .widgets.production_list_tab import ProductionListTab
 from .widgets.detail_tab import DetailTab
 from .styles import ThemeManager, Theme
 
+# Eksportmodulene drar inn reportlab, svglib og python-docx. De importeres
+# først ved bruk, og forvarmes i en bakgrunnstråd etter at vinduet vises.
+EXPORT_WARMUP_DELAY_MS = 1500
+_EXPORT_MODULES = (
+    '..export.pdf_exporter',
+    '..export.pdf_kappeliste',
+    '..export.docx_ordretekst',
+)
+
+
+def _warm_up_exporters() -> None:
+    """Importerer eksportmodulene i bakgrunnen (feil ignoreres her)."""
+    def run():
+        for name in _EXPORT_MODULES:
+            try:
+                importlib.import_module(name, __package__)
+            except ImportError:
+                pass
+    threading.Thread(target=run, name='export-warmup', daemon=True).start()
+
 
 class MainWindow(QMainWindow):
     """Hovedvindu for KIAS Dørkonfigurator."""
 
     theme_manager: ThemeManager = None
 
+    # Pause (ms) før samlede skjemaendringer oppdaterer detaljfanen
+    PARAMS_UPDATE_DELAY_MS = 150
+    # 3D-visningen oppdateres straks (lav detaljgrad), deretter høyst én
+    # gang per PREVIEW_THROTTLE_MS mens redigeringen pågår
+    PREVIEW_THROTTLE_MS = 100
+
+    # Felter som ikke påvirker 3D-visningen
+    PREVIEW_IGNORED_FIELDS = METADATA_FIELDS | {
+        'lock_case', 'handle_type', 'espagnolett', 'lock_type',
+        'fire_rating', 'sound_rating', 'lead_thickness', 'surface_type',
+        'utforing', 'blade_type', 'avviserboyler',
+    }
+
+    # Felter som ikke påvirker detaljfanen (mål og ordretekst)
+    DETAIL_IGNORED_FIELDS = METADATA_FIELDS | {'wall_color'}
+
     def __init__(self):
         super().__init__()
 
@@ -50,6 +89,7 @@ class MainWindow(QMainWindow):
         self._prod_list = get_production_list()
 
         self._init_ui()
+        self._init_change_scheduler()
         self._create_menus()
         self._create_toolbar()
         self._create_statusbar()
@@ -246,6 +286,12 @@ class MainWindow(QMainWindow):
             action.triggered.connect(lambda checked, k=key: self._set_graphics_preset(k))
             graphics_menu.addAction(action)
             self._graphics_actions[key] = action
+        graphics_menu.addSeparator()
+        self._adaptive_lod_action = QAction("Lav detalj under redigering", self)
+        self._adaptive_lod_action.setCheckable(True)
+        self._adaptive_lod_action.setChecked(gfx.ADAPTIVE_LOD)
+        self._adaptive_lod_action.toggled.connect(gfx.set_adaptive_lod)
+        graphics_menu.addAction(self._adaptive_lod_action)
         self._update_graphics_menu()
 
         # Hjelp-meny
@@ -273,11 +319,39 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.statusbar)
         self.statusbar.showMessage("Klar")
 
+    def _init_change_scheduler(self):
+        """Setter opp samlet oppdatering av 3D-visning og detaljfane."""
+        self._changes = ChangeScheduler(self.PARAMS_UPDATE_DELAY_MS, self)
+        self._changes.register(
+            'preview', lambda: self.door_preview.update_door(self.door, interactive=True),
+            ignores=self.PREVIEW_IGNORED_FIELDS,
+            throttle_ms=self.PREVIEW_THROTTLE_MS,
+        )
+        self._changes.register(
+            'detail', lambda: self.detail_tab.update_door(self.door),
+            ignores=self.DETAIL_IGNORED_FIELDS,
+        )
+        self.door.clear_dirty()
+
     def _on_params_changed(self):
-        """Håndterer endringer i dørparametere."""
+        """Håndterer endringer i dørparametere.
+
+        Modell og tittel oppdateres straks; 3D-visningen oppdateres straks
+        med lav detaljgrad (strupt), detaljfanen samlet etter en kort pause,
+        og begge kun ved relevante felter.
+        """
         self.door_form.update_door(self.door)
+        changed = self.door.pop_dirty()
+        if not changed:
+            return
         self.unsaved_changes = True
         self._update_title()
+        self._changes.schedule(changed)
+
+    def _refresh_views(self):
+        """Oppdaterer 3D-visning og detaljfane umiddelbart (f.eks. etter lasting)."""
+        self._changes.cancel()
+        self.door.clear_dirty()
         self.door_preview.update_door(self.door)
         self.detail_tab.update_door(self.door)
 
@@ -359,8 +433,7 @@ class MainWindow(QMainWindow):
         self.door = DoorParams.from_dict(door.params.to_dict())
         self.door_form.load_door(self.door)
         self.door_form.update_door(self.door)
-        self.door_preview.update_door(self.door)
-        self.detail_tab.update_door(self.door)
+        self._refresh_views()
 
         # Bytt til forhåndsvisning og redigeringsmodus
         self.tab_widget.setCurrentWidget(self.door_preview)
@@ -416,8 +489,7 @@ class MainWindow(QMainWindow):
         self.unsaved_changes = False
         self.door_form.load_door(self.door)
         self.door_form.update_door(self.door)
-        self.door_preview.update_door(self.door)
-        self.detail_tab.update_door(self.door)
+        self._refresh_views()
         self._exit_edit_mode()
         self._update_title()
         self.statusbar.showMessage("Nytt prosjekt opprettet")
@@ -439,8 +511,7 @@ class MainWindow(QMainWindow):
                 self.unsaved_changes = False
                 self.door_form.load_door(self.door)
                 self.door_form.update_door(self.door)
-                self.door_preview.update_door(self.door)
-                self.detail_tab.update_door(self.door)
+                self._refresh_views()
                 self._exit_edit_mode()
                 self._update_title()
                 self.statusbar.showMessage(f"Åpnet: {filepath}")
@@ -459,8 +530,7 @@ class MainWindow(QMainWindow):
             self.unsaved_changes = False
             self.door_form.load_door(self.door)
             self.door_form.update_door(self.door)
-            self.door_preview.update_door(self.door)
-            self.detail_tab.update_door(self.door)
+            self._refresh_views()
             self._exit_edit_mode()
             self._update_title()
             self.statusbar.showMessage(f"Åpnet: {filepath}")
@@ -534,6 +604,7 @@ class MainWindow(QMainWindow):
                 self.door_form.update_door(self.door)
                 self.progress_bar.setValue(30)
 
+                from ..export.pdf_exporter import export_door_pdf
                 export_door_pdf(self.door, Path(filepath))
                 self.progress_bar.setValue(100)
 
@@ -671,14 +742,28 @@ class MainWindow(QMainWindow):
                 return
 
         self._save_settings()
+        self.door_preview.shutdown()
+        self.door_list_tab.shutdown()
         event.accept()
 
 
-def run_app():
-    """Applikasjonens inngangspunkt."""
+# Tidspunkt (time.perf_counter) for hvert oppstartsteg i run_app.
+# Leses av scripts/benchmark_startup.py.
+STARTUP_TIMINGS: Dict[str, float] = {}
+
+
+def run_app(on_started: Optional[Callable[['MainWindow'], None]] = None):
+    """Applikasjonens inngangspunkt.
+
+    Args:
+        on_started: Kalles med hovedvinduet når det er vist (brukes av
+                    oppstartsmålingen)
+    """
+    STARTUP_TIMINGS['run_app'] = time.perf_counter()
     app = QApplication(sys.argv)
     app.setApplicationName(APP_NAME)
     app.setApplicationVersion(APP_VERSION)
+    STARTUP_TIMINGS['qapplication'] = time.perf_counter()
 
     # Initialiser tema-manager og anvend tema
     MainWindow.theme_manager = ThemeManager()
@@ -686,9 +771,15 @@ def run_app():
         MainWindow.theme_manager.apply_theme(app)
     else:
         app.setStyle('Fusion')
+    STARTUP_TIMINGS['theme'] = time.perf_counter()
 
     window = MainWindow()
+    STARTUP_TIMINGS['main_window'] = time.perf_counter()
     window.show()
+    STARTUP_TIMINGS['shown'] = time.perf_counter()
+    QTimer.singleShot(EXPORT_WARMUP_DELAY_MS, _warm_up_exporters)
+    if on_started is not None:
+        QTimer.singleShot(0, lambda: on_started(window))
 
     # Åpne fil fra kommandolinje
     if len(sys.argv) > 1:
@@ -8,14 +8,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QTimer
 
 from ...models.door import DoorParams
-from ...utils.calculations import (
-    karm_bredde, karm_hoyde,
-    dorblad_bredde, dorblad_hoyde,
-    terskel_lengde, laminat_mal, laminat_2_mal,
-    dekklist_lengde,
-    sparkeplate_bredde, avviserboyler_lengde,
-    ryggforsterkning_hoyde, ryggforsterkning_overdel,
-)
+from ...utils.production_measures import production_measures
 from ...doors import DOOR_REGISTRY
 from ...utils.ordretekst import generer_ordretekst
 
@@ -198,19 +191,14 @@ class DetailTab(QWidget):
         """Oppdaterer visningen med verdier fra DoorParams."""
         fmt = self._fmt
 
-        # --- Felles utregninger ---
-        karm_type = door.karm_type
-        hinge_type = door.hinge_type
-        floyer = door.floyer
-        luftspalte = door.effective_luftspalte()
-        is_2floyet = floyer == 2
+        # --- Felles utregninger (delt med 3D, ordretekst og produksjonsliste) ---
+        m = production_measures(door)
+        is_2floyet = door.floyer == 2
 
-        karm_b = karm_bredde(karm_type, door.width, adjufix=door.adjufix)
-        karm_h = karm_hoyde(karm_type, door.height)
-        self.val_karm_b.setText(fmt(karm_b))
-        self.val_karm_h.setText(fmt(karm_h))
+        self.val_karm_b.setText(fmt(m.karm_bredde))
+        self.val_karm_h.setText(fmt(m.karm_hoyde))
 
-        terskel = terskel_lengde(karm_type, karm_b, floyer)
+        terskel = m.terskel_lengde
         self.val_terskel.setText(fmt(terskel) if terskel else "—")
 
         # Dekklist kun for SDI 2-fløyet
@@ -218,16 +206,15 @@ class DetailTab(QWidget):
         self.lbl_dekklist.setVisible(show_dekklist)
         self.val_dekklist.setVisible(show_dekklist)
         if show_dekklist:
-            self.val_dekklist.setText(fmt(dekklist_lengde(karm_h)))
+            self.val_dekklist.setText(fmt(m.dekklist_lengde))
 
-        # Har denne dørtypen laminat?
-        has_laminat = laminat_mal(karm_type, 100, 100, door_type=door.door_type) != (None, None)
-        # Har denne dørtypen laminat 2?
-        has_lam2 = has_laminat and laminat_2_mal(karm_type, 100, 100) != (None, None)
+        # Har denne dørtypen laminat / laminat 2?
+        has_laminat = m.has_laminat
+        has_lam2 = m.has_laminat_2
 
-        # --- Dørblad-beregninger ---
-        db_b_total = dorblad_bredde(karm_type, karm_b, floyer, hinge_type, door_type=door.door_type)
-        db_h = dorblad_hoyde(karm_type, karm_h, floyer, hinge_type, luftspalte, door_type=door.door_type)
+        # --- Dørblad-mål ---
+        db_b_total = m.dorblad_bredde
+        db_h = m.dorblad_hoyde
 
         # Oppdater laminat-labels basert på om laminat 2 finnes
         lam_label = "Laminat 1 B:" if has_lam2 else "Laminat B:"
@@ -248,9 +235,7 @@ class DetailTab(QWidget):
             self.blade2_group.setVisible(True)
 
             if db_b_total:
-                split_pct = door.floyer_split / 100.0
-                db1_b = round(db_b_total * split_pct)
-                db2_b = db_b_total - db1_b
+                db1_b, db2_b = m.blad_bredder
 
                 self.val_dorblad1_b.setText(fmt(db1_b))
                 self.val_dorblad2_b.setText(fmt(db2_b))
@@ -265,11 +250,11 @@ class DetailTab(QWidget):
 
             # Laminat per fløy
             if db1_b and db_h:
-                lam1_b, lam1_h = laminat_mal(karm_type, db1_b, db_h, hinge_type, door_type=door.door_type)
+                lam1_b, lam1_h = m.laminat[0]
                 self.val_laminat1_b.setText(fmt(lam1_b))
                 self.val_laminat1_h.setText(fmt(lam1_h))
                 if has_lam2:
-                    l2b, l2h = laminat_2_mal(karm_type, lam1_b, lam1_h)
+                    l2b, l2h = m.laminat_2[0]
                     self.val_laminat1_2_b.setText(fmt(l2b))
                     self.val_laminat1_2_h.setText(fmt(l2h))
             else:
@@ -279,11 +264,11 @@ class DetailTab(QWidget):
                 self.val_laminat1_2_h.setText("—")
 
             if db2_b and db_h:
-                lam2_b, lam2_h = laminat_mal(karm_type, db2_b, db_h, hinge_type, door_type=door.door_type)
+                lam2_b, lam2_h = m.laminat[1]
                 self.val_laminat2_b.setText(fmt(lam2_b))
                 self.val_laminat2_h.setText(fmt(lam2_h))
                 if has_lam2:
-                    l2b, l2h = laminat_2_mal(karm_type, lam2_b, lam2_h)
+                    l2b, l2h = m.laminat_2[1]
                     self.val_laminat2_2_b.setText(fmt(l2b))
                     self.val_laminat2_2_h.setText(fmt(l2h))
             else:
@@ -311,11 +296,11 @@ class DetailTab(QWidget):
             self.val_dorblad1_h.setText(fmt(db_h) if db_h else "—")
 
             if db_b and db_h:
-                lam_b, lam_h = laminat_mal(karm_type, db_b, db_h, hinge_type, door_type=door.door_type)
+                lam_b, lam_h = m.laminat[0]
                 self.val_laminat1_b.setText(fmt(lam_b))
                 self.val_laminat1_h.setText(fmt(lam_h))
                 if has_lam2:
-                    l2b, l2h = laminat_2_mal(karm_type, lam_b, lam_h)
+                    l2b, l2h = m.laminat_2[0]
                     self.val_laminat1_2_b.setText(fmt(l2b))
                     self.val_laminat1_2_h.setText(fmt(l2h))
                 else:
@@ -344,10 +329,7 @@ class DetailTab(QWidget):
 
         if show_pendel:
             # Bruk første blad-bredde for beregning
-            ref_db_b = db_b_total
-            if is_2floyet and db_b_total:
-                split_pct = door.floyer_split / 100.0
-                ref_db_b = round(db_b_total * split_pct)
+            ref_db_b = m.blad_bredder[0] if m.blad_bredder else db_b_total
 
             # Sparkeplate
             self.lbl_sparkeplate.setVisible(has_sparkeplate)
@@ -355,7 +337,7 @@ class DetailTab(QWidget):
             self.lbl_sparkeplate_h.setVisible(has_sparkeplate)
             self.val_sparkeplate_h.setVisible(has_sparkeplate)
             if has_sparkeplate and ref_db_b:
-                sp_b = sparkeplate_bredde(door.door_type, ref_db_b)
+                sp_b = m.sparkeplate_bredder[0]
                 self.val_sparkeplate.setText(fmt(sp_b))
                 self.val_sparkeplate_h.setText(fmt(door.sparkeplate_hoyde))
             elif has_sparkeplate:
@@ -367,7 +349,7 @@ class DetailTab(QWidget):
             self.lbl_avviserboyler.setVisible(show_avviserboyler)
             self.val_avviserboyler.setVisible(show_avviserboyler)
             if show_avviserboyler and ref_db_b:
-                av_l = avviserboyler_lengde(door.door_type, ref_db_b)
+                av_l = m.avviserboyler_lengder[0]
                 self.val_avviserboyler.setText(fmt(av_l))
             elif show_avviserboyler:
                 self.val_avviserboyler.setText("—")
@@ -376,7 +358,7 @@ class DetailTab(QWidget):
             self.lbl_ryggforst_h.setVisible(has_ryggforst_h)
             self.val_ryggforst_h.setVisible(has_ryggforst_h)
             if has_ryggforst_h and db_h:
-                rf_h = ryggforsterkning_hoyde(door.door_type, db_h)
+                rf_h = m.ryggforsterkning_hoyde
                 self.val_ryggforst_h.setText(fmt(rf_h))
             elif has_ryggforst_h:
                 self.val_ryggforst_h.setText("—")
@@ -385,7 +367,7 @@ class DetailTab(QWidget):
             self.lbl_ryggforst_overdel.setVisible(has_ryggforst_overdel)
             self.val_ryggforst_overdel.setVisible(has_ryggforst_overdel)
             if has_ryggforst_overdel and ref_db_b:
-                rfo = ryggforsterkning_overdel(door.door_type, ref_db_b)
+                rfo = m.ryggforsterkning_overdel[0]
                 self.val_ryggforst_overdel.setText(fmt(rfo))
             elif has_ryggforst_overdel:
                 self.val_ryggforst_overdel.setText("—")
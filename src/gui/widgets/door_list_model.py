@@ -0,0 +1,267 @@
+"""
+Tabellmodell og slett-delegat for dørlisten.
+
+DoorListModel viser ProductionList i en QTableView. sync() leser
+listens endringslogg (ProductionList.changes_since) og sender radvise
+rowsInserted/rowsRemoved/rowsMoved/dataChanged, slik at kostnaden følger
+endringen og ikke listelengden. Visningsteksten (med dørens etikett)
+beregnes først når en rad vises. Slett-knappen tegnes av
+DeleteButtonDelegate i stedet for én QPushButton per rad.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import (
+    QAbstractTableModel, QEvent, QModelIndex, QRectF, Qt, pyqtSignal,
+)
+from PyQt6.QtGui import QColor, QIcon, QImage, QPainter, QPixmap
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate
+
+from ...models.production_list import ProductionDoor, ProductionList
+from ...utils.constants import SWING_DIRECTIONS
+from .door_thumbnails import ThumbnailProvider
+
+# Radnummeret (#) vises i den vertikale overskriften, som følger radene
+# når de settes inn, fjernes eller flyttes
+HEADERS = ["DØR-ID", "NAVN", "FLØY", "STØRRELSE (BM)", "VEGGTYKKELSE",
+           "FARGE", "RETNING", "SLETT"]
+NAME_COLUMN = 1
+DELETE_COLUMN = 7
+# Kolonner som venstrejusteres (resten sentreres)
+_LEFT_COLUMNS = (1, 5)
+
+DELETE_TEXT = "Slett"
+DELETE_COLOR = QColor('#f44336')
+DELETE_HOVER_COLOR = QColor('#d32f2f')
+
+
+def _row_values(door: ProductionDoor) -> Tuple[str, ...]:
+    """Visningstekst for kolonnene 0–6 (SLETT utelatt)."""
+    p = door.params
+    if p.floyer == 2:
+        floy_str = f"2 ({p.floyer_split}/{100 - p.floyer_split})"
+    else:
+        floy_str = "1"
+    return (
+        p.project_id,
+        door.label,
+        floy_str,
+        f"{p.width} x {p.height}",
+        f"{p.thickness} mm",
+        p.color,
+        SWING_DIRECTIONS.get(p.swing_direction, p.swing_direction),
+    )
+
+
+class DoorListModel(QAbstractTableModel):
+    """Tabellmodell over produksjonslisten (én rad per dør)."""
+
+    def __init__(self, prod_list: ProductionList,
+                 thumbnails: Optional[ThumbnailProvider] = None, parent=None):
+        super().__init__(parent)
+        self._prod_list = prod_list
+        # Dør-ID per rad slik listen var ved forrige sync(), og visningstekst
+        # per rad (None = ikke beregnet ennå, lages i data())
+        self._ids: List[str] = [door.id for door in prod_list.doors]
+        self._values: List[Optional[Tuple[str, ...]]] = [None] * len(self._ids)
+        self._revision = prod_list.revision
+        self._thumbnails = thumbnails
+        self._icons: Dict[str, Tuple[str, QIcon]] = {}   # door_id → (nøkkel, ikon)
+        if thumbnails is not None:
+            thumbnails.thumbnail_ready.connect(self._on_thumbnail_ready)
+
+    # ------------------------------------------------------------------
+    # QAbstractTableModel
+    # ------------------------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return HEADERS[section]
+            return str(section + 1)
+        if role == Qt.ItemDataRole.TextAlignmentRole and orientation == Qt.Orientation.Vertical:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == DELETE_COLUMN:
+                return DELETE_TEXT
+            values = self._row_values(row)
+            return values[col] if values is not None else None
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if col in _LEFT_COLUMNS:
+                return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.DecorationRole and col == NAME_COLUMN:
+            return self._thumbnail(row)
+        return None
+
+    # ------------------------------------------------------------------
+    # Synkronisering
+    # ------------------------------------------------------------------
+
+    def door_id(self, row: int) -> Optional[str]:
+        """Dør-ID for en rad (None utenfor listen)."""
+        return self._ids[row] if 0 <= row < len(self._ids) else None
+
+    def row_of(self, door_id: str) -> Optional[int]:
+        """Raden som viser døren, eller None."""
+        row = self._prod_list.index_of(door_id)
+        if row is not None and row < len(self._ids) and self._ids[row] == door_id:
+            return row
+        # Listen er endret siden forrige sync(); slå opp i modellens egne rader
+        try:
+            return self._ids.index(door_id)
+        except ValueError:
+            return None
+
+    def _door(self, row: int) -> Optional[ProductionDoor]:
+        """Døren som vises i raden (None hvis den er fjernet fra listen)."""
+        return self._prod_list.get_door(self._ids[row])
+
+    def _row_values(self, row: int) -> Optional[Tuple[str, ...]]:
+        values = self._values[row]
+        if values is None:
+            door = self._door(row)
+            if door is None:
+                return None
+            values = self._values[row] = _row_values(door)
+        return values
+
+    def sync(self) -> None:
+        """Oppdaterer modellen fra produksjonslistens endringslogg.
+
+        Innsatte, fjernede og flyttede dører gir tilsvarende radsignaler.
+        Endrede dører får dataChanged, og visningsteksten deres beregnes
+        på nytt neste gang raden vises.
+        """
+        changes = self._prod_list.changes_since(self._revision)
+        self._revision = self._prod_list.revision
+        if changes is None or ('reset',) in changes:
+            # _reset() leser listen slik den er nå, inkludert senere endringer
+            self._reset()
+            return
+
+        updated = set()
+        for change in changes:
+            kind = change[0]
+            if kind == 'insert':
+                _, start, ids = change
+                self.beginInsertRows(QModelIndex(), start, start + len(ids) - 1)
+                self._ids[start:start] = ids
+                self._values[start:start] = [None] * len(ids)
+                self.endInsertRows()
+            elif kind == 'remove':
+                _, row, door_id = change
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._ids[row]
+                del self._values[row]
+                self.endRemoveRows()
+                self._icons.pop(door_id, None)
+                updated.discard(door_id)
+            elif kind == 'move':
+                _, old, new, door_id = change
+                # Qt oppgir målet som raden det flyttes foran
+                self.beginMoveRows(QModelIndex(), old, old, QModelIndex(),
+                                   new + 1 if new > old else new)
+                self._ids.insert(new, self._ids.pop(old))
+                self._values.insert(new, self._values.pop(old))
+                self.endMoveRows()
+            elif kind == 'update':
+                updated.add(change[2])
+
+        for door_id in updated:
+            row = self.row_of(door_id)
+            if row is not None:
+                self._values[row] = None
+                self.dataChanged.emit(self.index(row, 0),
+                                      self.index(row, len(HEADERS) - 1))
+
+    def _reset(self) -> None:
+        """Leser hele listen på nytt (etter clear() eller for gammel revisjon)."""
+        self.beginResetModel()
+        self._ids = [door.id for door in self._prod_list.doors]
+        self._values = [None] * len(self._ids)
+        self._icons.clear()
+        self.endResetModel()
+
+    # ------------------------------------------------------------------
+    # Miniatyrbilder
+    # ------------------------------------------------------------------
+
+    def _thumbnail(self, row: int) -> Optional[QIcon]:
+        """Ikon for raden; bestilles fra ThumbnailProvider første gang raden vises."""
+        if self._thumbnails is None:
+            return None
+        door = self._door(row)
+        if door is None:
+            return None
+        key = self._thumbnails.key(door.params)
+        cached = self._icons.get(door.id)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        image = self._thumbnails.request(door.id, door.params)
+        if image is None:
+            return None
+        icon = QIcon(QPixmap.fromImage(image))
+        self._icons[door.id] = (key, icon)
+        return icon
+
+    def _on_thumbnail_ready(self, door_id: str, key: str, image: QImage) -> None:
+        """Setter ferdig miniatyrbilde hvis modellen fortsatt viser døren med samme nøkkel."""
+        row = self.row_of(door_id)
+        if row is None:
+            return
+        door = self._door(row)
+        if door is None or self._thumbnails.key(door.params) != key:
+            return
+        self._icons[door_id] = (key, QIcon(QPixmap.fromImage(image)))
+        index = self.index(row, NAME_COLUMN)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+class DeleteButtonDelegate(QStyledItemDelegate):
+    """Tegner en rød slett-knapp i cellen og sender delete_requested ved klikk."""
+
+    delete_requested = pyqtSignal(int)   # rad
+
+    MARGIN = 4
+    RADIUS = 3
+
+    def _button_rect(self, option) -> QRectF:
+        return QRectF(option.rect).adjusted(self.MARGIN, self.MARGIN,
+                                            -self.MARGIN, -self.MARGIN)
+
+    def paint(self, painter: QPainter, option, index) -> None:
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        hover = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(DELETE_HOVER_COLOR if hover else DELETE_COLOR)
+        rect = self._button_rect(option)
+        painter.drawRoundedRect(rect, self.RADIUS, self.RADIUS)
+        painter.setPen(QColor('white'))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, DELETE_TEXT)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        size.setWidth(option.fontMetrics.horizontalAdvance(DELETE_TEXT) + 28)
+        return size
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and self._button_rect(option).contains(event.position())):
+            self.delete_requested.emit(index.row())
+            return True
+        return False
@@ -4,15 +4,19 @@ Viser alle dører i produksjonslisten med mulighet for redigering,
 sletting, import og eksport.
 """
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
     QPushButton, QLabel, QHeaderView, QMessageBox, QFileDialog, QAbstractItemView
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import QSize, pyqtSignal
 
 from ...models.production_list import ProductionList, get_production_list
 from ...models.door_list_io import save_door_list, load_door_list
-from ...export.docx_ordretekst import export_ordretekst_docx
-from ...utils.constants import DOOR_LIST_FILTER, SWING_DIRECTIONS
+from ...utils.constants import DOOR_LIST_FILTER, DOOR_LIST_COMPACT_FILTER
+from .door_list_model import DELETE_COLUMN, NAME_COLUMN, DeleteButtonDelegate, DoorListModel
+from .door_thumbnails import ThumbnailProvider
+
+# Miniatyrbilde i NAVN-kolonnen (piksler)
+THUMBNAIL_ICON_SIZE = 48
 
 
 class DoorListTab(QWidget):
@@ -25,6 +29,9 @@ class DoorListTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._prod_list: ProductionList = get_production_list()
+        # Miniatyrbilder bestilles av modellen når radene tegnes
+        self._thumbnails = ThumbnailProvider(parent=self)
+        self._model = DoorListModel(self._prod_list, self._thumbnails, self)
         self._init_ui()
 
     def _init_ui(self):
@@ -64,16 +71,18 @@ class DoorListTab(QWidget):
         layout.addLayout(toolbar)
 
         # --- Tabell ---
-        self.table = QTableWidget()
-        self.table.setColumnCount(9)
-        self.table.setHorizontalHeaderLabels([
-            "#", "DØR-ID", "NAVN", "FLØY", "STØRRELSE (BM)", "VEGGTYKKELSE",
-            "FARGE", "RETNING", "SLETT"
-        ])
+        self.table = QTableView()
+        self.table.setModel(self._model)
+        self._delete_delegate = DeleteButtonDelegate(self.table)
+        self._delete_delegate.delete_requested.connect(self._on_delete_requested)
+        self.table.setItemDelegateForColumn(DELETE_COLUMN, self._delete_delegate)
+        self.table.setMouseTracking(True)
         header = self.table.horizontalHeader()
         header.setStretchLastSection(False)
-        for col in range(self.table.columnCount()):
-            if col == 2:  # NAVN
+        # Kolonnebredder beregnes fra synlige rader, ikke hele listen
+        header.setResizeContentsPrecision(0)
+        for col in range(self._model.columnCount()):
+            if col == NAME_COLUMN:
                 header.setSectionResizeMode(col, QHeaderView.ResizeMode.Stretch)
             else:
                 header.setSectionResizeMode(col, QHeaderView.ResizeMode.ResizeToContents)
@@ -83,7 +92,11 @@ class DoorListTab(QWidget):
         self.table.setEditTriggers(
             QAbstractItemView.EditTrigger.NoEditTriggers
         )
-        self.table.verticalHeader().setVisible(False)
+        # Radnummer (#) i den vertikale overskriften, fast radhøyde
+        row_header = self.table.verticalHeader()
+        row_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        row_header.setDefaultSectionSize(THUMBNAIL_ICON_SIZE + 6)
+        self.table.setIconSize(QSize(THUMBNAIL_ICON_SIZE, THUMBNAIL_ICON_SIZE))
         self.table.doubleClicked.connect(self._on_double_click)
         layout.addWidget(self.table)
 
@@ -98,82 +111,22 @@ class DoorListTab(QWidget):
 
     def select_door(self, door_id: str):
         """Markerer raden til en bestemt dør i tabellen."""
-        doors = self._prod_list.doors
-        for row, door in enumerate(doors):
-            if door.id == door_id:
-                self.table.selectRow(row)
-                self.table.scrollTo(self.table.model().index(row, 0))
-                return
+        row = self._model.row_of(door_id)
+        if row is None:
+            return
+        self.table.selectRow(row)
+        self.table.scrollTo(self._model.index(row, 0))
 
     def refresh(self):
-        """Oppdaterer tabellen fra produksjonslisten."""
-        doors = self._prod_list.doors
-        self.table.setRowCount(len(doors))
-
-        for row, door in enumerate(doors):
-            p = door.params
-
-            # #
-            num_item = QTableWidgetItem(str(row + 1))
-            num_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 0, num_item)
-
-            # Dør-ID
-            id_item = QTableWidgetItem(p.project_id)
-            id_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 1, id_item)
-
-            # Navn
-            self.table.setItem(row, 2, QTableWidgetItem(door.label))
-
-            # Fløy
-            if p.floyer == 2:
-                split_a = p.floyer_split
-                split_b = 100 - split_a
-                floy_str = f"2 ({split_a}/{split_b})"
-            else:
-                floy_str = "1"
-            floy_item = QTableWidgetItem(floy_str)
-            floy_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 3, floy_item)
-
-            # Størrelse (BM)
-            size_str = f"{p.width} x {p.height}"
-            size_item = QTableWidgetItem(size_str)
-            size_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 4, size_item)
-
-            # Veggtykkelse
-            thick_item = QTableWidgetItem(f"{p.thickness} mm")
-            thick_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 5, thick_item)
-
-            # Farge
-            self.table.setItem(row, 6, QTableWidgetItem(p.color))
-
-            # Retning
-            direction = SWING_DIRECTIONS.get(p.swing_direction, p.swing_direction)
-            dir_item = QTableWidgetItem(direction)
-            dir_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 7, dir_item)
-
-            # Slett-knapp
-            del_btn = QPushButton("Slett")
-            del_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #f44336;
-                    color: white;
-                    border: none;
-                    border-radius: 3px;
-                    padding: 4px 10px;
-                }
-                QPushButton:hover { background-color: #d32f2f; }
-            """)
-            del_btn.clicked.connect(lambda _, did=door.id: self._delete_door(did))
-            self.table.setCellWidget(row, 8, del_btn)
-
-        self.summary_label.setText(f"Antall dører: {len(doors)}")
-        self.ordretekst_btn.setEnabled(len(doors) > 0)
+        """Oppdaterer tabellen fra produksjonslisten (kun endrede rader)."""
+        self._model.sync()
+        count = self._model.rowCount()
+        self.summary_label.setText(f"Antall dører: {count}")
+        self.ordretekst_btn.setEnabled(count > 0)
+
+    def shutdown(self):
+        """Stopper bakgrunnsgenerering av miniatyrbilder."""
+        self._thumbnails.shutdown()
 
     # ------------------------------------------------------------------
     # Signaler / hendelser
@@ -181,10 +134,15 @@ class DoorListTab(QWidget):
 
     def _on_double_click(self, index):
         """Håndterer dobbeltklikk – sender door_id til MainWindow."""
-        row = index.row()
-        doors = self._prod_list.doors
-        if 0 <= row < len(doors):
-            self.door_selected.emit(doors[row].id)
+        door_id = self._model.door_id(index.row())
+        if door_id is not None:
+            self.door_selected.emit(door_id)
+
+    def _on_delete_requested(self, row: int):
+        """Slett-knappen i en rad er klikket."""
+        door_id = self._model.door_id(row)
+        if door_id is not None:
+            self._delete_door(door_id)
 
     def _delete_door(self, door_id: str):
         """Sletter en dør etter bekreftelse."""
@@ -232,12 +190,14 @@ class DoorListTab(QWidget):
             )
             return
 
-        filepath, _ = QFileDialog.getSaveFileName(
-            self, "Eksporter dørliste", "", DOOR_LIST_FILTER
+        filepath, selected_filter = QFileDialog.getSaveFileName(
+            self, "Eksporter dørliste", "",
+            f"{DOOR_LIST_FILTER};;{DOOR_LIST_COMPACT_FILTER}"
         )
         if filepath:
             try:
-                save_door_list(self._prod_list, filepath)
+                save_door_list(self._prod_list, filepath,
+                               binary=selected_filter == DOOR_LIST_COMPACT_FILTER)
                 QMessageBox.information(
                     self, "Eksport fullført",
                     f"Dørliste eksportert til:\n{filepath}"
@@ -275,6 +235,7 @@ class DoorListTab(QWidget):
         )
         if filepath:
             try:
+                from ...export.docx_ordretekst import export_ordretekst_docx
                 export_ordretekst_docx(self._prod_list, filepath)
                 QMessageBox.information(
                     self, "Eksport fullført",
@@ -0,0 +1,323 @@
+"""
+Miniatyrbilder av dører for dørlisten.
+
+Bygger scenen med de samme byggerne som 3D-visningen (scene_builder) og
+tegner den med en enkel programvare-rasterisering i NumPy (z-buffer,
+flate farger), slik at det virker uten GPU og uten OpenGL-kontekst.
+Ferdige bilder lagres som PNG i en diskcache, med nøkkel fra feltene
+som påvirker geometrien, og genereres i en trådpool ved behov.
+Diskcachen holdes under DISK_CACHE_MAX_FILES filer; de minst nylig
+brukte slettes først.
+"""
+import dataclasses
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from PyQt6.QtCore import QObject, QStandardPaths, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from ...models.door import DoorParams
+from .scene_builder import MeshSpec, build_scene, component_keys
+
+# Bildestørrelse i piksler (kvadratisk)
+THUMBNAIL_SIZE = 96
+# Øk når tegningen endres, slik at gamle bilder i diskcachen ikke brukes
+THUMBNAIL_VERSION = 1
+# Komponenter som tegnes (vegg og rom utelates)
+THUMBNAIL_COMPONENTS = ('frame', 'klemsikring', 'blades', 'ryggforsterkning',
+                        'slepelist', 'hinges', 'handle', 'sparkeplater')
+# Kameravinkel (grader), lik startvinkelen i DoorPreview3D
+CAMERA_ELEVATION = 15
+CAMERA_AZIMUTH = -30
+# Oversampling per akse for glattere kanter
+SUPERSAMPLE = 2
+THUMBNAIL_WORKERS = 2
+# Maks antall bilder i minnet (LRU)
+MEMORY_CACHE_SIZE = 256
+# Maks antall PNG-filer i diskcachen. Overskrides grensen, slettes de
+# eldste filene (etter mtime) ned til DISK_CACHE_PRUNE_TO av grensen.
+DISK_CACHE_MAX_FILES = 2000
+DISK_CACHE_PRUNE_TO = 0.9
+
+# Maks antall kandidatpiksler per rasteriseringsbolk
+_CHUNK_PIXELS = 1 << 21
+
+
+# =============================================================================
+# RASTERISERING
+# =============================================================================
+
+def _camera_basis(elevation: float, azimuth: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(høyre, opp, mot kamera) for kamera som i pyqtgraph.setCameraPosition."""
+    el, az = np.radians(elevation), np.radians(azimuth)
+    eye = np.array([np.cos(el) * np.cos(az), np.cos(el) * np.sin(az), np.sin(el)])
+    right = np.array([-np.sin(az), np.cos(az), 0.0])
+    up = np.cross(eye, right)
+    return right, up, eye
+
+
+def rasterize(specs: Iterable[MeshSpec], size: int = THUMBNAIL_SIZE,
+              elevation: float = CAMERA_ELEVATION, azimuth: float = CAMERA_AZIMUTH,
+              supersample: int = SUPERSAMPLE, margin: float = 0.05) -> np.ndarray:
+    """Tegner mesh-data med ortografisk projeksjon og z-buffer.
+
+    Scenen skaleres til å fylle bildet. Flatefargene brukes direkte
+    (lyset er allerede beregnet av byggerne). Transparens ignoreres.
+
+    Returns:
+        RGBA-bilde (size, size, 4) uint8 med gjennomsiktig bakgrunn
+    """
+    specs = list(specs)
+    if not specs:
+        return np.zeros((size, size, 4), dtype=np.uint8)
+    tris = np.concatenate([spec.verts[spec.faces] for spec in specs])    # (T, 3, 3)
+    colors = np.concatenate([np.asarray(spec.colors, dtype=float) for spec in specs])
+
+    n = size * supersample
+    right, up, eye = _camera_basis(elevation, azimuth)
+    sx = tris @ right
+    sy = tris @ up
+    sz = -(tris @ eye)                  # Større = lenger unna
+
+    span = max(np.ptp(sx), np.ptp(sy), 1e-9)
+    scale = n * (1 - 2 * margin) / span
+    px = (sx - (sx.min() + sx.max()) / 2) * scale + n / 2
+    py = n / 2 - (sy - (sy.min() + sy.max()) / 2) * scale
+
+    x0 = np.clip(np.floor(px.min(axis=1)), 0, n - 1).astype(np.int64)
+    x1 = np.clip(np.ceil(px.max(axis=1)), 0, n - 1).astype(np.int64)
+    y0 = np.clip(np.floor(py.min(axis=1)), 0, n - 1).astype(np.int64)
+    y1 = np.clip(np.ceil(py.max(axis=1)), 0, n - 1).astype(np.int64)
+    ax, bx, cx = px.T
+    ay, by, cy = py.T
+    area = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    visible = np.abs(area) > 1e-12
+
+    zbuf = np.full(n * n, np.inf)
+    owner = np.full(n * n, -1, dtype=np.int64)
+
+    # Trekanter grupperes etter omsluttende boks (2er-potens), og alle
+    # piksler i boksen testes samtidig med barysentriske koordinater
+    extent = np.maximum(x1 - x0, y1 - y0) + 1
+    bins = 1 << np.ceil(np.log2(extent)).astype(np.int64)
+    for k in np.unique(bins[visible]):
+        selected = np.flatnonzero(visible & (bins == k))
+        step = max(1, _CHUNK_PIXELS // (k * k))
+        for start in range(0, len(selected), step):
+            t = selected[start:start + step]
+            offs = np.arange(k)
+            gx = x0[t, None, None] + offs[None, None, :]
+            gy = y0[t, None, None] + offs[None, :, None]
+            qx = gx + 0.5
+            qy = gy + 0.5
+            inv = 1.0 / area[t, None, None]
+            wa = ((cx[t, None, None] - bx[t, None, None]) * (qy - by[t, None, None])
+                  - (cy[t, None, None] - by[t, None, None]) * (qx - bx[t, None, None])) * inv
+            wb = ((ax[t, None, None] - cx[t, None, None]) * (qy - cy[t, None, None])
+                  - (ay[t, None, None] - cy[t, None, None]) * (qx - cx[t, None, None])) * inv
+            wc = 1.0 - wa - wb
+            inside = ((wa >= 0) & (wb >= 0) & (wc >= 0)
+                      & (gx <= x1[t, None, None]) & (gy <= y1[t, None, None]))
+            if not inside.any():
+                continue
+            depth = (wa * sz[t, 0, None, None] + wb * sz[t, 1, None, None]
+                     + wc * sz[t, 2, None, None])
+            tri_idx = np.broadcast_to(t[:, None, None], inside.shape)[inside]
+            pix = (gy * n + gx)[inside]
+            depth = depth[inside]
+
+            # Nærmeste kandidat per piksel, deretter mot z-bufferen
+            order = np.lexsort((depth, pix))
+            pix, depth, tri_idx = pix[order], depth[order], tri_idx[order]
+            first = np.ones(len(pix), dtype=bool)
+            first[1:] = pix[1:] != pix[:-1]
+            pix, depth, tri_idx = pix[first], depth[first], tri_idx[first]
+            closer = depth < zbuf[pix]
+            zbuf[pix[closer]] = depth[closer]
+            owner[pix[closer]] = tri_idx[closer]
+
+    covered = owner >= 0
+    image = np.zeros((n * n, 4))
+    image[covered, :3] = colors[owner[covered], :3]
+    image[covered, 3] = 1.0
+
+    # Nedsampling med forhåndsmultiplisert alfa
+    image = image.reshape(size, supersample, size, supersample, 4).mean(axis=(1, 3))
+    alpha = image[..., 3:]
+    image[..., :3] = np.divide(image[..., :3], alpha, out=np.zeros_like(image[..., :3]),
+                               where=alpha > 0)
+    return np.clip(np.round(image * 255), 0, 255).astype(np.uint8)
+
+
+def render_thumbnail(door: DoorParams, size: int = THUMBNAIL_SIZE) -> np.ndarray:
+    """Tegner et miniatyrbilde (RGBA uint8) av døren, lukket og med lav detaljgrad."""
+    scene = build_scene(door, THUMBNAIL_COMPONENTS, interactive=True)
+    specs: List[MeshSpec] = [spec for name in THUMBNAIL_COMPONENTS
+                             for spec in scene.get(name, ())]
+    return rasterize(specs, size)
+
+
+def thumbnail_key(door: DoorParams, size: int = THUMBNAIL_SIZE) -> str:
+    """Hash av feltene som påvirker miniatyrbildet (brukes som filnavn)."""
+    keys = component_keys(door, interactive=True)
+    parts = [(name, keys[name]) for name in THUMBNAIL_COMPONENTS]
+    text = repr((THUMBNAIL_VERSION, size, parts))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def to_qimage(pixels: np.ndarray) -> QImage:
+    """Kopierer et RGBA-array (h, w, 4) til et QImage."""
+    h, w = pixels.shape[:2]
+    data = np.ascontiguousarray(pixels)
+    return QImage(data.data, w, h, 4 * w, QImage.Format.Format_RGBA8888).copy()
+
+
+def default_cache_dir() -> str:
+    """Standard diskcache for miniatyrbilder (brukerens cache-mappe)."""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    return os.path.join(base or os.path.expanduser('~/.cache/KIASDorkonfigurator'),
+                        'thumbnails')
+
+
+def prune_disk_cache(cache_dir: str, max_files: int) -> int:
+    """Sletter de eldste PNG-filene (etter mtime) til maks max_files er igjen.
+
+    Returns:
+        Antall filer igjen i cachen
+    """
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.png') and entry.is_file():
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        pass
+    except FileNotFoundError:
+        return 0
+    if len(entries) <= max_files:
+        return len(entries)
+    entries.sort()
+    removed = 0
+    for _mtime, path in entries[:len(entries) - max_files]:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return len(entries) - removed
+
+
+# =============================================================================
+# LEVERANDØR
+# =============================================================================
+
+class ThumbnailProvider(QObject):
+    """Leverer miniatyrbilder fra minne, diskcache eller trådpool.
+
+    request() returnerer bildet med en gang hvis det ligger i minnet.
+    Ellers startes lasting/tegning i bakgrunnen, og thumbnail_ready
+    sendes (på GUI-tråden) når bildet er klart.
+    """
+
+    # (door_id, nøkkel, bilde)
+    thumbnail_ready = pyqtSignal(str, str, QImage)
+    # (nøkkel, bilde) fra arbeidertråden; tomt bilde ved feil
+    _loaded = pyqtSignal(str, QImage)
+
+    def __init__(self, cache_dir: Optional[str] = None, size: int = THUMBNAIL_SIZE,
+                 max_disk_files: int = DISK_CACHE_MAX_FILES, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.size = size
+        self.max_disk_files = max_disk_files
+        # Anslått antall filer i diskcachen (None = ikke talt ennå)
+        self._disk_count: Optional[int] = None
+        self._disk_lock = threading.Lock()
+        self._images: OrderedDict = OrderedDict()   # nøkkel → QImage
+        # nøkkel → door_id-er som venter på bildet
+        self._in_flight: Dict[str, Set[str]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loaded.connect(self._on_loaded)
+
+    def key(self, door: DoorParams) -> str:
+        """Cachenøkkel for døren med gjeldende bildestørrelse."""
+        return thumbnail_key(door, self.size)
+
+    def request(self, door_id: str, door: DoorParams) -> Optional[QImage]:
+        """Returnerer bildet hvis det er i minnet, ellers None og bestiller det."""
+        key = self.key(door)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+        waiting = self._in_flight.get(key)
+        if waiting is not None:
+            waiting.add(door_id)
+        else:
+            self._in_flight[key] = {door_id}
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=THUMBNAIL_WORKERS, thread_name_prefix='thumbnail')
+            future = self._executor.submit(self._load, key, dataclasses.replace(door))
+            future.add_done_callback(lambda f, key=key: self._emit_result(key, f))
+        return None
+
+    def _load(self, key: str, door: DoorParams) -> QImage:
+        """Leser bildet fra diskcachen, eller tegner og lagrer det (arbeidertråd)."""
+        path = os.path.join(self.cache_dir, f'{key}.png')
+        image = QImage(path)
+        if not image.isNull():
+            try:
+                os.utime(path)   # Nylig brukt: slettes sist ved opprydding
+            except OSError:
+                pass
+            return image
+        image = to_qimage(render_thumbnail(door, self.size))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        if image.save(tmp_path, 'PNG'):
+            os.replace(tmp_path, path)
+            self._disk_file_added()
+        return image
+
+    def _disk_file_added(self) -> None:
+        """Teller en ny fil i diskcachen og rydder når grensen overskrides."""
+        with self._disk_lock:
+            if self._disk_count is None:
+                self._disk_count = prune_disk_cache(self.cache_dir, self.max_disk_files)
+            else:
+                self._disk_count += 1
+            if self._disk_count > self.max_disk_files:
+                self._disk_count = prune_disk_cache(
+                    self.cache_dir, int(self.max_disk_files * DISK_CACHE_PRUNE_TO))
+
+    def _emit_result(self, key: str, future) -> None:
+        """Sender resultatet til GUI-tråden (kalles i arbeidertråden)."""
+        failed = future.cancelled() or future.exception() is not None
+        self._loaded.emit(key, QImage() if failed else future.result())
+
+    def _on_loaded(self, key: str, image: QImage) -> None:
+        """Legger ferdig bilde i minnecachen og varsler alle dører som venter på det (GUI-tråden)."""
+        door_ids = self._in_flight.pop(key, ())
+        if image.isNull():
+            return
+        self._images[key] = image
+        while len(self._images) > MEMORY_CACHE_SIZE:
+            self._images.popitem(last=False)
+        for door_id in door_ids:
+            self.thumbnail_ready.emit(door_id, key, image)
+
+    def shutdown(self) -> None:
+        """Avbryter ventende bestillinger og stopper trådpoolen."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._in_flight.clear()
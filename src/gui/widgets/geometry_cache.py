@@ -0,0 +1,58 @@
+"""
+Begrenset LRU-cache for ferdig 3D-geometri.
+
+Brukes av 3D-visningen for å gjenbruke vertex-/face-buffere når samme
+karmgeometri vises igjen (f.eks. ved bytte mellom dører i dørlisten).
+Treff og bom telles slik at størrelsen kan justeres.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Hashable
+
+
+class GeometryCache:
+    """Trådsikker LRU-cache med treff-/bom-statistikk."""
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], object]):
+        """Returnerer cachet verdi for nøkkelen, eller bygger og lagrer den."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Tømmer cachen og nullstiller statistikken."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Treff, bom, treffrate og størrelse."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
@@ -36,6 +36,11 @@ PRESETS = {
 PRESET_LABELS = {'lav': 'Lav', 'middels': 'Middels', 'hoy': 'Høy'}
 DEFAULT_PRESET = 'hoy'
 
+# Adaptiv detaljgrad: preset som brukes mens skjemaet redigeres, og pause
+# (ms) uten endringer før visningen tegnes med valgt preset igjen
+INTERACTIVE_PRESET = 'lav'
+INTERACTIVE_IDLE_MS = 400
+
 # =====================================================================
 # Aktive verdier (settes av apply_preset)
 # =====================================================================
@@ -65,6 +70,9 @@ BACKGROUND_COLOR = (58, 63, 72, 255)
 # Aktivt preset-navn
 current_preset = DEFAULT_PRESET
 
+# Lav detaljgrad under redigering (settes av set_adaptive_lod)
+ADAPTIVE_LOD = True
+
 
 def apply_preset(name: str) -> None:
     """Aktiverer et grafikkpreset og lagrer valget."""
@@ -84,13 +92,39 @@ def apply_preset(name: str) -> None:
     settings.setValue('graphics/preset', name)
 
 
+def set_adaptive_lod(enabled: bool) -> None:
+    """Slår adaptiv detaljgrad av/på og lagrer valget."""
+    global ADAPTIVE_LOD
+    ADAPTIVE_LOD = bool(enabled)
+    settings = QSettings("KIASDorkonfigurator", "KIASDorkonfigurator")
+    settings.setValue('graphics/adaptive_lod', ADAPTIVE_LOD)
+
+
+def detail_levels(interactive: bool = False) -> tuple:
+    """Segmenter og glatting for buede deler.
+
+    Returns:
+        (lever_tube_segments, lever_bend_segments, plate_corner_segments,
+        smooth_curved_parts) — fra INTERACTIVE_PRESET når interactive er
+        True og adaptiv detaljgrad er på, ellers fra aktivt preset.
+    """
+    if interactive and ADAPTIVE_LOD:
+        preset = PRESETS[INTERACTIVE_PRESET]
+        return (preset['lever_tube_segments'], preset['lever_bend_segments'],
+                preset['plate_corner_segments'], preset['smooth_curved_parts'])
+    return (LEVER_TUBE_SEGMENTS, LEVER_BEND_SEGMENTS,
+            PLATE_CORNER_SEGMENTS, SMOOTH_CURVED_PARTS)
+
+
 def load_saved_preset() -> None:
     """Laster lagret preset fra QSettings, eller bruker standard."""
+    global ADAPTIVE_LOD
     settings = QSettings("KIASDorkonfigurator", "KIASDorkonfigurator")
     name = settings.value('graphics/preset', DEFAULT_PRESET)
     if name not in PRESETS:
         name = DEFAULT_PRESET
     apply_preset(name)
+    ADAPTIVE_LOD = settings.value('graphics/adaptive_lod', True, type=bool)
 
 
 # Last lagret preset ved import
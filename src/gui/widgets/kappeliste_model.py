@@ -0,0 +1,212 @@
+"""
+Tabellmodeller for kappelisten.
+
+Radene bygges fra get_kappeliste_sections() / get_diverse_rows() som
+ferdige visningstupler. Ved hver oppdatering sammenlignes de nye radene
+med de forrige, og bare forskjellene sendes til visningen (rowsInserted,
+rowsRemoved, dataChanged). Seksjonsoverskrifter er egne rader i modellen.
+"""
+from difflib import SequenceMatcher
+from typing import Dict, List, Sequence, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QBrush, QColor, QFont
+
+SECTION_BACKGROUND = QColor('#FFC107')
+SECTION_FOREGROUND = QColor('#000000')
+
+_CENTER = Qt.AlignmentFlag.AlignCenter
+_LEFT = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+
+
+class _RowDiffModel(QAbstractTableModel):
+    """Tabellmodell over en liste med radtupler som oppdateres med diff."""
+
+    HEADERS: Tuple[str, ...] = ()
+    CENTER_COLUMNS: Tuple[int, ...] = ()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[tuple] = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (orientation == Qt.Orientation.Horizontal
+                and role == Qt.ItemDataRole.DisplayRole):
+            return self.HEADERS[section]
+        return None
+
+    def _alignment(self, col: int):
+        return _CENTER if col in self.CENTER_COLUMNS else _LEFT
+
+    def set_rows(self, rows: Sequence[tuple]) -> None:
+        """Erstatter radene og sender kun signaler for det som er endret.
+
+        Like lange erstatninger blir dataChanged, slik at rullposisjon og
+        markering beholdes når f.eks. et antall endres.
+        """
+        old = self._rows
+        new = list(rows)
+        if old == new:
+            return
+        opcodes = SequenceMatcher(None, old, new, autojunk=False).get_opcodes()
+        # Baklengs, slik at radnumrene foran endringen fortsatt stemmer
+        for tag, i1, i2, j1, j2 in reversed(opcodes):
+            if tag == 'equal':
+                continue
+            common = min(i2 - i1, j2 - j1) if tag == 'replace' else 0
+            if i2 - i1 > common:
+                self.beginRemoveRows(QModelIndex(), i1 + common, i2 - 1)
+                del self._rows[i1 + common:i2]
+                self.endRemoveRows()
+            if j2 - j1 > common:
+                self.beginInsertRows(QModelIndex(), i1 + common, i1 + j2 - j1 - 1)
+                self._rows[i1 + common:i1 + common] = new[j1 + common:j2]
+                self.endInsertRows()
+            if common:
+                self._rows[i1:i1 + common] = new[j1:j1 + common]
+                self.dataChanged.emit(self.index(i1, 0),
+                                      self.index(i1 + common - 1, len(self.HEADERS) - 1))
+
+
+class KappelisteModel(_RowDiffModel):
+    """Hovedtabellen (karm + dørramme) med seksjonsoverskrifter som rader.
+
+    Radtupler: (tittel,) for overskrifter, ellers de sju kolonneverdiene.
+    """
+
+    HEADERS = ("PROFILNAVN", "STK", "MM", "SLAGRETNING", "FARGE", "ORDRE", "MERKNAD")
+    CENTER_COLUMNS = (1, 2, 3)
+
+    @staticmethod
+    def build_rows(sections: Sequence[dict]) -> List[tuple]:
+        """Visningsrader fra get_kappeliste_sections().
+
+        Profilnavnet vises bare på første rad i en serie med samme profil.
+        """
+        rows: List[tuple] = []
+        for section in sections:
+            rows.append((section['title'],))
+            prev_profil = ''
+            for data in section['rows']:
+                show_name = data['profilnavn'] != prev_profil
+                prev_profil = data['profilnavn']
+                rows.append((
+                    data['profilnavn'] if show_name else '',
+                    str(data['stk']),
+                    data['mm'],
+                    data['slagretning'],
+                    data['farge'],
+                    data.get('ordre', ''),
+                    data.get('merknad', ''),
+                ))
+        return rows
+
+    def is_section(self, row: int) -> bool:
+        return len(self._rows[row]) == 1
+
+    def flags(self, index):
+        if not index.isValid() or self.is_section(index.row()):
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = self._rows[index.row()], index.column()
+        if len(row) == 1:
+            if role == Qt.ItemDataRole.DisplayRole and col == 0:
+                return f"  {row[0]}"
+            if role == Qt.ItemDataRole.BackgroundRole:
+                return QBrush(SECTION_BACKGROUND)
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return QBrush(SECTION_FOREGROUND)
+            if role == Qt.ItemDataRole.FontRole:
+                font = QFont()
+                font.setBold(True)
+                return font
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return row[col]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return self._alignment(col)
+        return None
+
+
+class DiverseModel(_RowDiffModel):
+    """Diverse-tabellen. MERKNAD er redigerbar og lagres per (forklaring, b, h).
+
+    Radtupler: de seks første kolonneverdiene + merknadsnøkkelen.
+    """
+
+    HEADERS = ("FORKLARING", "STK", "B MM", "H MM", "FARGE", "ORDRE", "MERKNAD")
+    CENTER_COLUMNS = (1, 2, 3)
+    MERKNAD_COLUMN = 6
+
+    def __init__(self, merknader: Dict[tuple, str], parent=None):
+        super().__init__(parent)
+        self._merknader = merknader
+
+    @staticmethod
+    def build_rows(diverse_rows: Sequence[dict]) -> List[tuple]:
+        """Visningsrader fra get_diverse_rows()."""
+        rows: List[tuple] = []
+        prev_forkl = ''
+        for data in diverse_rows:
+            show_name = data['forklaring'] != prev_forkl
+            prev_forkl = data['forklaring']
+            rows.append((
+                data['forklaring'] if show_name else '',
+                str(data['stk']),
+                data['b_mm'],
+                data['h_mm'],
+                data['farge'],
+                data.get('ordre', ''),
+                (data['forklaring'], data['b_mm'], data['h_mm']),
+            ))
+        return rows
+
+    def set_rows(self, rows: Sequence[tuple]) -> None:
+        """Som _RowDiffModel.set_rows; merknader for rader som ikke lenger vises forkastes."""
+        shown = {row[self.MERKNAD_COLUMN] for row in self._rows}
+        for key in [k for k in self._merknader if k not in shown]:
+            del self._merknader[key]
+        super().set_rows(rows)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() == self.MERKNAD_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = self._rows[index.row()], index.column()
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if col == self.MERKNAD_COLUMN:
+                return self._merknader.get(row[col], '')
+            return row[col]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return self._alignment(col)
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if (not index.isValid() or role != Qt.ItemDataRole.EditRole
+                or index.column() != self.MERKNAD_COLUMN):
+            return False
+        key = self._rows[index.row()][self.MERKNAD_COLUMN]
+        text = str(value or '')
+        if text:
+            self._merknader[key] = text
+        else:
+            self._merknader.pop(key, None)
+        self.dataChanged.emit(index, index)
+        return True
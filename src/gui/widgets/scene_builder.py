@@ -0,0 +1,1251 @@
+"""
+Bygging av 3D-scenen for dørforhåndsvisningen.
+
+Ren geometri: fra DoorParams til NumPy-buffere (vertices, faces, farger)
+per scenekomponent, uten GL-objekter. Kan derfor kjøres i en bakgrunnstråd;
+opplasting til GLMeshItem skjer i DoorPreview3D på GUI-tråden.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from PyQt6.QtGui import QColor
+
+from ...models.door import DoorParams
+from ...utils.constants import RAL_COLORS, POLYKARBONAT_COLORS, KARM_SIDESTOLPE_WIDTH
+from ...utils.production_measures import production_measures
+from ...doors import DOOR_REGISTRY
+from ..karm_profiles import KARM_PROFILES
+from . import graphics_settings as gfx
+from .geometry_cache import GeometryCache
+
+# --- Konstanter ---
+WALL_COLOR = (0.55, 0.55, 0.52, 1)
+WALL_MARGIN = 800                        # mm synlig vegg rundt åpning
+KARM_DEPTHS = {'SD1': 77, 'SD2': 84, 'SD3/ID': 92, 'KD1': 97, 'KD2': 104,
+               'PD1': 77, 'PD2': 84, 'BD1': 77,
+               'FD1': 97, 'FD2': 104, 'FD3': 112}
+BLADE_GAP = 4                            # mm gap mellom 2 dørblad
+SPARKEPLATE_THICKNESS = 1                # mm tykkelse
+SPARKEPLATE_COLOR = (0.0, 0.0, 0.0, 1.0)  # Svart
+KLEMSIKRING_COLOR = (0.05, 0.05, 0.05, 1.0)  # Svart silikon
+PIVOT_PLATE_COLOR = (0.75, 0.75, 0.73, 1.0)  # Sølv/aluminium hengsleplate
+PIVOT_HOLE_COLOR = (0.08, 0.08, 0.08, 1.0)   # Mørke skruehull
+RYGGFORST_DEPTH = 40    # mm — dybde ryggforsterkning (lik PDI-bladtykkelse)
+RYGGFORST_OVERLAP = 10  # mm — sidestolpe overlapper bladkant innover
+
+# Rom-visning
+ROOM_DEPTH = 3000                              # mm — rommet strekker seg 3m fra veggen
+ROOM_SHELL_T = 15                              # mm — tykkelse gulv/tak/sidevegg-skall
+
+# Maks antall memoiserte håndtak-mesher (skilt og grep)
+MESH_MEMO_SIZE = 64
+
+# Ferdige karmbuffere per (karmtype, kb, kh, veggtykkelse, karmdybde,
+# sidestolpebredde, bladtykkelse). Statistikk: FRAME_GEOMETRY_CACHE.stats()
+FRAME_CACHE_SIZE = 32
+FRAME_GEOMETRY_CACHE = GeometryCache(FRAME_CACHE_SIZE)
+
+# Feltavhengigheter per scenekomponent. En komponent bygges bare på nytt
+# når verdien av minst ett av feltene (eller åpen/lukket) er endret.
+_WALL_FIELDS = ('width', 'height', 'thickness', 'wall_color')
+_FRAME_FIELDS = ('karm_type', 'width', 'height', 'adjufix', 'thickness',
+                 'blade_thickness', 'karm_color')
+# Felter som bestemmer plasseringen av dørbladene (og alt som følger dem)
+_LAYOUT_FIELDS = ('door_type', 'karm_type', 'floyer', 'floyer_split', 'hinge_type',
+                  'hinge_count', 'width', 'height', 'adjufix', 'threshold_type',
+                  'luftspalte', 'thickness', 'blade_thickness', 'swing_direction')
+
+
+@dataclass
+class MeshSpec:
+    """Ferdig mesh-data for ett GLMeshItem, før opplasting til GL."""
+    verts: np.ndarray
+    faces: np.ndarray
+    colors: np.ndarray
+    group: str                          # 'wall', 'room', 'frame' eller 'blade'
+    smooth: bool = False
+    gl_options: Optional[str] = None
+    pivot: Optional[tuple] = None       # Åpen-dør-rotasjon (se _get_open_pivot)
+
+
+# =============================================================================
+# MESH-GENERATORER (memoisert)
+# =============================================================================
+
+def _readonly(*arrays):
+    """Markerer arrays som skrivebeskyttet (de deles via memo-cachen)."""
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+@lru_cache(maxsize=MESH_MEMO_SIZE)
+def _rounded_rect_mesh(cx, cy, cz, width, height, depth, radius, segments):
+    """Vertices og faces for avrundet rektangel (se SceneBuilder._make_rounded_rect)."""
+    hw = width / 2
+    hh = height / 2
+    r = min(radius, hw, hh)
+
+    # 2D-profil (X, Z) — fire hjørner med kvartssirkel:
+    # nedre høyre, øvre høyre, øvre venstre, nedre venstre
+    corner_x = np.array([cx + hw - r, cx + hw - r, cx - hw + r, cx - hw + r])
+    corner_z = np.array([cz - hh + r, cz + hh - r, cz + hh - r, cz - hh + r])
+    a_start = np.array([np.pi * 1.5, 0.0, np.pi * 0.5, np.pi])
+    a_end = np.array([np.pi * 2.0, np.pi * 0.5, np.pi, np.pi * 1.5])
+    t = np.arange(segments + 1) / segments
+    angles = a_start[:, None] + t[None, :] * (a_end - a_start)[:, None]
+    px = (corner_x[:, None] + r * np.cos(angles)).ravel()
+    pz = (corner_z[:, None] + r * np.sin(angles)).ravel()
+
+    n = len(px)
+    verts = np.empty((2 * n + 2, 3))
+    verts[:n, 0] = verts[n:2 * n, 0] = px
+    verts[:n, 2] = verts[n:2 * n, 2] = pz
+    verts[:n, 1] = cy + depth / 2
+    verts[n:2 * n, 1] = cy - depth / 2
+    verts[2 * n] = (cx, cy + depth / 2, cz)        # Front-senter
+    verts[2 * n + 1] = (cx, cy - depth / 2, cz)    # Bak-senter
+
+    i = np.arange(n)
+    ni = (i + 1) % n
+    front = np.column_stack((np.full(n, 2 * n), i, ni))
+    back = np.column_stack((np.full(n, 2 * n + 1), n + ni, n + i))
+    # Sider: to trekanter per profilsegment
+    sides = np.stack((
+        np.column_stack((i, n + i, ni)),
+        np.column_stack((ni, n + i, n + ni)),
+    ), axis=1).reshape(-1, 3)
+    faces = np.concatenate((front, back, sides))
+    return _readonly(verts, faces)
+
+
+@lru_cache(maxsize=MESH_MEMO_SIZE)
+def _swept_tube_mesh(path, radius, segments):
+    """Vertices og faces for rør langs en bane (se SceneBuilder._make_swept_tube)."""
+    points = np.array(path, dtype=float)
+    n_path = len(points)
+
+    # Tangentretning (sentrerte differanser, ensidige i endene)
+    tangents = np.empty_like(points)
+    tangents[0] = points[1] - points[0]
+    tangents[-1] = points[-1] - points[-2]
+    tangents[1:-1] = points[2:] - points[:-2]
+    tangents /= np.linalg.norm(tangents, axis=1, keepdims=True)
+
+    # Perpendikulær ramme (Z-opp som referanse, Y-opp når tangenten er nesten vertikal)
+    up = np.zeros_like(points)
+    vertical = np.abs(tangents[:, 2]) > 0.99
+    up[~vertical, 2] = 1.0
+    up[vertical, 1] = 1.0
+    normals = np.cross(tangents, up)
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    binormals = np.cross(tangents, normals)
+
+    angles = 2 * np.pi * np.arange(segments) / segments
+    rings = (points[:, None, :]
+             + radius * (np.cos(angles)[None, :, None] * normals[:, None, :]
+                         + np.sin(angles)[None, :, None] * binormals[:, None, :]))
+    verts = np.concatenate((rings.reshape(-1, 3), points[[0, -1]]))
+    start_c = n_path * segments
+    end_c = start_c + 1
+
+    j = np.arange(segments)
+    nj = (j + 1) % segments
+    # Sideflater: to trekanter per (ring, segment)
+    c = (np.arange(n_path - 1) * segments)[:, None]
+    nx = c + segments
+    sides = np.stack((
+        np.stack((c + j, nx + j, c + nj), axis=-1),
+        np.stack((c + nj, nx + j, nx + nj), axis=-1),
+    ), axis=2).reshape(-1, 3)
+    # Endecaps
+    last = (n_path - 1) * segments
+    start_cap = np.column_stack((np.full(segments, start_c), nj, j))
+    end_cap = np.column_stack((np.full(segments, end_c), last + j, last + nj))
+    faces = np.concatenate((sides, start_cap, end_cap))
+    return _readonly(verts, faces)
+
+
+def batch_specs(specs: List[MeshSpec]) -> List[MeshSpec]:
+    """Slår sammen mesh-data med lik gruppe, materiale og transform.
+
+    Vertex-, face- og fargebuffere legges etter hverandre, med face-
+    indeksene forskjøvet, slik at hver kombinasjon blir ett GLMeshItem.
+    """
+    batches: Dict[tuple, List[MeshSpec]] = {}
+    for spec in specs:
+        key = (spec.group, spec.smooth, spec.gl_options, spec.pivot)
+        batches.setdefault(key, []).append(spec)
+
+    merged = []
+    for (group, smooth, gl_options, pivot), parts in batches.items():
+        if len(parts) == 1:
+            merged.append(parts[0])
+            continue
+        offsets = np.cumsum([0] + [len(p.verts) for p in parts[:-1]])
+        merged.append(MeshSpec(
+            np.concatenate([p.verts for p in parts]),
+            np.concatenate([p.faces + offset for p, offset in zip(parts, offsets)]),
+            np.concatenate([p.colors for p in parts]),
+            group, smooth, gl_options, pivot,
+        ))
+    return merged
+
+
+# Scenekomponenter i byggerekkefølge: (navn, feltavhengigheter, byggemetode)
+COMPONENTS = (
+    ('wall', _WALL_FIELDS, '_build_wall'),
+    ('room', _WALL_FIELDS, '_build_room'),
+    ('frame', _FRAME_FIELDS, '_build_frame'),
+    ('klemsikring', _LAYOUT_FIELDS, '_build_klemsikring'),
+    ('blades', _LAYOUT_FIELDS + ('color',), '_add_door_blades'),
+    ('ryggforsterkning', _LAYOUT_FIELDS, '_build_ryggforsterkning'),
+    ('slepelist', _LAYOUT_FIELDS, '_build_slepelist'),
+    ('hinges', _LAYOUT_FIELDS, '_add_hinges'),
+    ('handle', _LAYOUT_FIELDS + ('sparkeplate_hoyde',), '_build_handle'),
+    ('sparkeplater', _LAYOUT_FIELDS + ('sparkeplate', 'sparkeplate_hoyde'),
+     '_build_sparkeplater'),
+)
+
+
+def component_keys(door: DoorParams, door_open: bool = False,
+                   interactive: bool = False) -> Dict[str, tuple]:
+    """Nøkkel per komponent: feltverdier + visningstilstand den avhenger av."""
+    keys = {}
+    for name, fields, _method in COMPONENTS:
+        key = tuple(getattr(door, f) for f in fields)
+        if name not in ('wall', 'room', 'frame', 'klemsikring'):
+            key += (door_open,)
+        if name == 'handle':
+            key += gfx.detail_levels(interactive)
+        keys[name] = key
+    return keys
+
+
+def build_scene(door: DoorParams, names: Optional[Iterable[str]] = None,
+                door_open: bool = False, interactive: bool = False,
+                batch: bool = True,
+                is_cancelled: Optional[Callable[[], bool]] = None,
+                ) -> Optional[Dict[str, List[MeshSpec]]]:
+    """Bygger mesh-data for scenekomponentene.
+
+    Args:
+        door: Dørparametere (leses bare)
+        names: Komponenter som skal bygges (None = alle)
+        door_open: Bygg dørbladene i åpen stilling
+        interactive: Lav detaljgrad (se gfx.detail_levels)
+        batch: Slå sammen mesher med lik gruppe/materiale/transform
+        is_cancelled: Sjekkes mellom komponentene; True avbryter byggingen
+
+    Returns:
+        Komponentnavn → liste med MeshSpec, eller None hvis avbrutt
+    """
+    builder = SceneBuilder(door_open, interactive)
+    wanted = None if names is None else set(names)
+    ctx = builder._scene_context(door)
+    result: Dict[str, List[MeshSpec]] = {}
+    for name, _fields, method in COMPONENTS:
+        if wanted is not None and name not in wanted:
+            continue
+        if is_cancelled is not None and is_cancelled():
+            return None
+        specs = builder.build_component(door, method, ctx)
+        result[name] = batch_specs(specs) if batch else specs
+    return result
+
+
+class SceneBuilder:
+    """Bygger mesh-data for dør, karm, vegg og beslag (mm → scene-enheter)."""
+
+    SCALE = 1.0 / 100.0
+
+    # Håndtak-dimensjoner (mm)
+    HANDLE_CENTER_HEIGHT = 1020          # mm fra gulv (senter håndtak, uten sparkeplate)
+    HANDLE_X_MARGIN = 50
+    # Skilt (bakplate) — avrundede hjørner
+    PLATE_WIDTH = 40
+    PLATE_HEIGHT = 170
+    PLATE_DEPTH = 5
+    PLATE_CORNER_RADIUS = 6
+    # Grep (spak) — bue fra skilt + horisontal sylinder
+    LEVER_RADIUS = 10
+    LEVER_BEND_RADIUS = 30                # mm radius på buen fra skilt
+    LEVER_STRAIGHT = 85                   # mm rett del etter buen
+    LEVER_Z_OFFSET = -45                  # mm under senter av skilt
+
+    # Hengsel-dimensjoner (mm)
+    HINGE_WIDTH = 15
+    HINGE_HEIGHT = 60
+    HINGE_DEPTH = 8
+
+    def __init__(self, door_open: bool = False, interactive: bool = False):
+        self._door_open = door_open
+        self._interactive = interactive
+        self._pending: List[MeshSpec] = []
+
+    def build_component(self, door, method: str, ctx: tuple) -> List[MeshSpec]:
+        """Kjører én byggemetode og returnerer mesh-dataene den la til."""
+        self._pending = []
+        getattr(self, method)(door, *ctx)
+        specs, self._pending = self._pending, []
+        return specs
+
+    def _scene_context(self, door) -> tuple:
+        """Felles mål for byggerne: (profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s)."""
+        # Karmmål (mm), delt med detaljfane og produksjonsliste
+        m = production_measures(door)
+        profile = KARM_PROFILES[door.karm_type]
+        return (
+            profile, m.karm_bredde, m.karm_hoyde, door.thickness,
+            door.blade_thickness,
+            KARM_DEPTHS.get(door.karm_type, 77),
+            profile.luftspalte(door),
+            self.SCALE,
+        )
+
+    def _emit(self, verts, faces, face_colors, group: str,
+              smooth: bool = False, gl_options: Optional[str] = None, pivot=None) -> None:
+        """Legger ferdig mesh-data til komponenten som bygges."""
+        self._pending.append(MeshSpec(verts, faces, face_colors, group,
+                                       smooth, gl_options, pivot))
+
+    # Byggere med felles signatur (door, profile, kb, kh, wall_t, blade_t_mm,
+    # karm_depth, luftspalte_mm, s) for komponenter med egne betingelser
+
+    def _build_wall(self, door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s):
+        """Vegg (alltid bygd, synlighet styrt av toggle)."""
+        self._add_wall(door.width, door.height, wall_t, s, door.wall_color)
+
+    def _build_room(self, door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s):
+        """Rom (gulv, tak, sidevegger)."""
+        self._add_room(door.width, door.height, wall_t, s, door.wall_color)
+
+    def _build_frame(self, door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s):
+        """Karm — bygd fra profil, med geometrien hentet fra FRAME_GEOMETRY_CACHE."""
+        karm_color = np.array(self._ral_to_rgba(door.karm_color))
+        sidestolpe_w = KARM_SIDESTOLPE_WIDTH.get(door.karm_type, 80)
+        key = (door.karm_type, kb, kh, wall_t, karm_depth, sidestolpe_w, blade_t_mm, s)
+        verts, faces = FRAME_GEOMETRY_CACHE.get_or_build(
+            key, lambda: self._frame_geometry(door, profile, kb, kh, wall_t, karm_depth, sidestolpe_w, s)
+        )
+        # Alle karmdeler er bokser med 12 trekanter i samme lysrekkefølge
+        colors = np.tile(self._lit_face_colors(karm_color), (len(faces) // 12, 1))
+        self._emit(verts, faces, colors, 'frame')
+
+    def _frame_geometry(self, door, profile, kb, kh, wall_t, karm_depth, sidestolpe_w, s):
+        """Samlet vertex-/face-buffer for alle karmdelene fra profilen."""
+        parts = profile.build_frame_parts(door, kb, kh, wall_t, karm_depth, sidestolpe_w)
+        boxes = [self._make_box(bx * s, by * s, bz * s, dx * s, dy * s, dz * s)
+                 for (bx, by, bz, dx, dy, dz) in parts]
+        if not boxes:
+            return _readonly(np.empty((0, 3)), np.empty((0, 3), dtype=int))
+        verts = np.concatenate([v for v, _f in boxes])
+        faces = np.concatenate([f + 8 * i for i, (_v, f) in enumerate(boxes)])
+        return _readonly(verts, faces)
+
+    def _build_klemsikring(self, door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s):
+        """Klemsikring (PDI)."""
+        if DOOR_REGISTRY.get(door.door_type, {}).get('klemsikring', False):
+            self._add_klemsikring(door, profile, kb, kh, wall_t, karm_depth, s)
+
+    def _build_ryggforsterkning(self, door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s):
+        """Ryggforsterkning (PDPC/PDPO)."""
+        if DOOR_REGISTRY.get(door.door_type, {}).get('ryggforsterkning_hoyde_offset'):
+            self._add_ryggforsterkning(door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s)
+
+    def _build_slepelist(self, door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s):
+        """Slepelist (terskel under dørblad)."""
+        if door.threshold_type == 'slepelist':
+            self._add_slepelist(door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s)
+
+    def _build_handle(self, door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s):
+        """Håndtak (ikke for pendeldører)."""
+        if not DOOR_REGISTRY.get(door.door_type, {}).get('pendeldor', False):
+            self._add_handle(door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s)
+
+    def _build_sparkeplater(self, door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s):
+        """Sparkeplater (for alle dørtyper med sparkeplate aktivert)."""
+        if door.sparkeplate:
+            self._add_sparkeplater(door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s)
+
+    # =========================================================================
+    # VEGG
+    # =========================================================================
+
+    def _add_wall(self, bm, hm, wall_t, s, wall_color_hex="#8C8C84"):
+        """Vegg med rektangulær utsparing (BM x HM). Semi-transparent."""
+        M = WALL_MARGIN
+        qc = QColor(wall_color_hex)
+        color = np.array((qc.redF(), qc.greenF(), qc.blueF(), WALL_COLOR[3]))
+        wy = -wall_t / 2
+        wd = wall_t
+
+        parts = [
+            # Venstre kolonne (full høyde + margin over åpning)
+            (-(bm / 2 + M), wy, 0, M, wd, hm + M),
+            # Høyre kolonne
+            (bm / 2, wy, 0, M, wd, hm + M),
+            # Topp-bjelke (mellom kolonnene)
+            (-bm / 2, wy, hm, bm, wd, M),
+        ]
+
+        for (bx, by, bz, dx, dy, dz) in parts:
+            self._add_mesh(
+                bx * s, by * s, bz * s, dx * s, dy * s, dz * s,
+                color, gl_options='translucent', group='wall'
+            )
+
+    # =========================================================================
+    # ROM (GULV, TAK, SIDEVEGGER)
+    # =========================================================================
+
+    def _add_room(self, bm, hm, wall_t, s, wall_color_hex="#8C8C84"):
+        """Bygger romvisning: gulv, tak og to sidevegger på begge sider av veggen."""
+        M = WALL_MARGIN
+        wall_w = bm + 2 * M          # Total veggbredde
+        wall_h = hm + M              # Total vegghøyde
+        front_depth = ROOM_DEPTH / 3          # 1000mm framside
+        back_depth = front_depth * 2           # 2000mm bakside
+        t = ROOM_SHELL_T
+
+        qc = QColor(wall_color_hex)
+        color = np.array((qc.redF(), qc.greenF(), qc.blueF(), WALL_COLOR[3]))
+
+        x_left = -wall_w / 2
+        y_back = -(wall_t / 2 + back_depth)   # Bakside av rommet
+        total_depth = wall_t + front_depth + back_depth
+
+        for (bx, by, bz, dx, dy, dz) in [
+            # Gulv
+            (x_left, y_back, -t, wall_w, total_depth, t),
+            # Tak
+            (x_left, y_back, wall_h, wall_w, total_depth, t),
+            # Venstre sidevegg
+            (x_left - t, y_back, -t, t, total_depth, wall_h + 2 * t),
+            # Høyre sidevegg
+            (x_left + wall_w, y_back, -t, t, total_depth, wall_h + 2 * t),
+        ]:
+            self._add_mesh(
+                bx * s, by * s, bz * s, dx * s, dy * s, dz * s,
+                color, gl_options='translucent', group='room'
+            )
+
+    # =========================================================================
+    # SLEPELIST (TERSKEL)
+    # =========================================================================
+
+    def _add_slepelist(self, door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s):
+        """Slepelist under hvert dørblad — følger bladet ved åpning."""
+        sl_color = np.array(SPARKEPLATE_COLOR)  # Svart
+        blade_y = profile.blade_y(wall_t, blade_t_mm, karm_depth)
+        sl_h = 22  # mm, samme som luftspalte
+        sl_depth = blade_t_mm  # Like tykk som dørbladet
+
+        total_hinges = self._get_hinge_count(door)
+        blades = self._get_blade_geometries(door, kb, kh, luftspalte_mm, total_hinges)
+
+        for (bcx, b_w, b_h, _count, hinge_side) in blades:
+            blade_x = bcx - b_w / 2
+            eff_x, eff_w, eff_y, eff_d = self._effective_pivot_params(
+                door, blade_x, b_w, blade_y, blade_t_mm,
+                kb=kb, hinge_side=hinge_side
+            )
+            pivot = self._get_open_pivot(eff_x, eff_w, eff_y, eff_d, hinge_side, s)
+
+            verts, faces = self._make_box(
+                blade_x * s, blade_y * s, 0,
+                b_w * s, sl_depth * s, sl_h * s
+            )
+            face_colors = self._lit_face_colors(sl_color)
+            self._emit(verts, faces, face_colors, 'blade', pivot=pivot)
+
+    # =========================================================================
+    # DØRBLAD
+    # =========================================================================
+
+    def _add_door_blades(self, door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s):
+        """Dørblad med delte produksjonsmål (production_measures)."""
+        blade_color = np.array(self._ral_to_rgba(door.color))
+        blade_y = profile.blade_y(wall_t, blade_t_mm, karm_depth)
+        m = production_measures(door)
+
+        if door.floyer == 1:
+            db_b = m.dorblad_bredde
+            db_h = m.dorblad_hoyde
+            if db_b and db_h:
+                # 3D-koord er speilvendt: inverter slagretning for korrekt visuell plassering
+                hinge_3d = 'right' if door.swing_direction == 'left' else 'left'
+                # Ryggforsterkning: skyv blad til karmkant på ikke-hengselsiden
+                door_def_b = DOOR_REGISTRY.get(door.door_type, {})
+                if 'ryggforsterkning_hoyde_offset' in door_def_b:
+                    anslag_inner = 80
+                    if hinge_3d == 'left':
+                        blade_x = kb / 2 - anslag_inner - db_b
+                    else:
+                        blade_x = -kb / 2 + anslag_inner
+                else:
+                    offset_x = self._klemsikring_blade_offset(door)
+                    blade_x = -db_b / 2 + offset_x
+                eff_x, eff_w, eff_y, eff_d = self._effective_pivot_params(
+                    door, blade_x, db_b, blade_y, blade_t_mm,
+                    kb=kb, hinge_side=hinge_3d
+                )
+                pivot = self._get_open_pivot(eff_x, eff_w, eff_y, eff_d, hinge_3d, s)
+                self._render_single_blade(
+                    blade_x, blade_y, luftspalte_mm,
+                    db_b, blade_t_mm, db_h,
+                    blade_color, s, pivot=pivot
+                )
+        else:
+            db_b_total = m.dorblad_bredde
+            db_h = m.dorblad_hoyde
+            if db_b_total and db_h:
+                db1_b, db2_b = m.blad_bredder
+
+                # Primærblad (aktivt) plasseres på slagretning-siden
+                if door.swing_direction == 'left':
+                    left_w, right_w = db1_b, db2_b
+                else:
+                    left_w, right_w = db2_b, db1_b
+
+                total_w = left_w + BLADE_GAP + right_w
+                start_x = -total_w / 2
+
+                # Visuelt høyre blad (negativ X i 3D), hengsler på ytre kant
+                right_x = start_x
+                eff_rx, eff_rw, eff_ry, eff_rd = self._effective_pivot_params(
+                    door, right_x, right_w, blade_y, blade_t_mm,
+                    kb=kb, hinge_side='left'
+                )
+                pivot_r = self._get_open_pivot(eff_rx, eff_rw, eff_ry, eff_rd, 'left', s)
+                self._render_single_blade(
+                    right_x, blade_y, luftspalte_mm,
+                    right_w, blade_t_mm, db_h,
+                    blade_color, s, pivot=pivot_r
+                )
+                # Visuelt venstre blad (positiv X i 3D), hengsler på ytre kant
+                left_x = start_x + right_w + BLADE_GAP
+                eff_lx, eff_lw, eff_ly, eff_ld = self._effective_pivot_params(
+                    door, left_x, left_w, blade_y, blade_t_mm,
+                    kb=kb, hinge_side='right'
+                )
+                pivot_l = self._get_open_pivot(eff_lx, eff_lw, eff_ly, eff_ld, 'right', s)
+                self._render_single_blade(
+                    left_x, blade_y, luftspalte_mm,
+                    left_w, blade_t_mm, db_h,
+                    blade_color, s, pivot=pivot_l
+                )
+
+    def _render_single_blade(self, x, y, z, w, d, h, color, s, pivot=None):
+        """Tegner ett dørblad med retningsbasert lys."""
+        verts, faces = self._make_box(x * s, y * s, z * s, w * s, d * s, h * s)
+        face_colors = self._lit_face_colors(color)
+
+        gl_options = 'translucent' if color[3] < 1.0 else None
+        self._emit(verts, faces, face_colors, 'blade', gl_options=gl_options, pivot=pivot)
+
+    # =========================================================================
+    # RYGGFORSTERKNING (PDPC/PDPO)
+    # =========================================================================
+
+    def _add_ryggforsterkning(self, door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s):
+        """U-formet aluminiumsramme (2 sider + overdel) rundt hvert dørblad.
+
+        PDPC/PDPO har 5mm polykarbonat-blad som trenger ryggforsterkning
+        for å gi 40mm total dybde der pivot-hengsler monteres.
+        """
+        door_def = DOOR_REGISTRY.get(door.door_type, {})
+        h_offset = door_def.get('ryggforsterkning_hoyde_offset', 99)  # 99mm
+        o_offset = door_def.get('ryggforsterkning_overdel_offset', 98)  # 98mm
+        side_w = o_offset / 2  # 49mm
+
+        # Natureloksert aluminium (sølvgrå med svak varm tone)
+        frame_color = np.array([0.75, 0.73, 0.70, 1.0])
+        blade_y = profile.blade_y(wall_t, blade_t_mm, karm_depth)
+        # Rammen er 40mm dyp, sentrert rundt 5mm bladet
+        frame_y = blade_y + blade_t_mm / 2 - RYGGFORST_DEPTH / 2
+
+        total_hinges = self._get_hinge_count(door)
+        blades = self._get_blade_geometries(door, kb, kh, luftspalte_mm, total_hinges)
+
+        is_double = door.floyer == 2
+
+        for (bcx, b_w, b_h, _count, hinge_side) in blades:
+            blade_x = bcx - b_w / 2
+            side_h = b_h + h_offset  # Sidestolpe-høyde
+
+            # Pivot basert på rammens dimensjoner
+            eff_x, eff_w, eff_y, eff_d = self._effective_pivot_params(
+                door, blade_x, b_w, blade_y, blade_t_mm,
+                kb=kb, hinge_side=hinge_side
+            )
+            pivot = self._get_open_pivot(eff_x, eff_w, eff_y, eff_d, hinge_side, s)
+
+            parts = []
+            lap = RYGGFORST_OVERLAP
+
+            if is_double:
+                # 2-fløyet: sidestolpe fra etter klemsikring (35mm) + 5mm margin
+                klem_offset = 120  # anslag(80) + klemsikring(35) + margin(5)
+                if hinge_side == 'left':
+                    outer_x = -kb / 2 + klem_offset
+                    post_w = blade_x + lap - outer_x
+                    parts.append((outer_x, frame_y, luftspalte_mm,
+                                  post_w, RYGGFORST_DEPTH, side_h))
+                    parts.append((outer_x, frame_y, luftspalte_mm + b_h,
+                                  blade_x + b_w - outer_x, RYGGFORST_DEPTH, h_offset))
+                else:
+                    outer_x = kb / 2 - klem_offset
+                    post_w = outer_x - (blade_x + b_w - lap)
+                    parts.append((blade_x + b_w - lap, frame_y, luftspalte_mm,
+                                  post_w, RYGGFORST_DEPTH, side_h))
+                    parts.append((blade_x, frame_y, luftspalte_mm + b_h,
+                                  outer_x - blade_x, RYGGFORST_DEPTH, h_offset))
+            else:
+                # 1-fløyet: sidestolpe fra klemsikring + overdel, kun hengslesiden
+                klem_offset = 120  # anslag(80) + klemsikring(35) + margin(5)
+                if hinge_side == 'left':
+                    outer_x = -kb / 2 + klem_offset
+                    post_w = blade_x + lap - outer_x
+                    parts.append((outer_x, frame_y, luftspalte_mm,
+                                  post_w, RYGGFORST_DEPTH, side_h))
+                    parts.append((outer_x, frame_y, luftspalte_mm + b_h,
+                                  blade_x + b_w - outer_x, RYGGFORST_DEPTH, h_offset))
+                else:
+                    outer_x = kb / 2 - klem_offset
+                    post_w = outer_x - (blade_x + b_w - lap)
+                    parts.append((blade_x + b_w - lap, frame_y, luftspalte_mm,
+                                  post_w, RYGGFORST_DEPTH, side_h))
+                    parts.append((blade_x, frame_y, luftspalte_mm + b_h,
+                                  outer_x - blade_x, RYGGFORST_DEPTH, h_offset))
+
+            for (bx, by, bz, dx, dy, dz) in parts:
+                verts, faces = self._make_box(
+                    bx * s, by * s, bz * s, dx * s, dy * s, dz * s
+                )
+                face_colors = self._lit_face_colors(frame_color)
+                self._emit(verts, faces, face_colors, 'blade', pivot=pivot)
+
+    # =========================================================================
+    # HENGSLER
+    # =========================================================================
+
+    def _add_hinges(self, door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s):
+        """Hengsler fra dørtype-data, plassert på riktig side."""
+        hinge_color = np.array([0.478, 0.478, 0.478, 1.0])
+        door_def = DOOR_REGISTRY.get(door.door_type, {})
+        is_pendel = door_def.get('pendeldor', False)
+
+        total_hinges = self._get_hinge_count(door)
+        blade_y_pos = profile.blade_y(wall_t, blade_t_mm, karm_depth)
+
+        # Bygg liste over blad å feste hengsler på
+        blades = self._get_blade_geometries(door, kb, kh, luftspalte_mm, total_hinges)
+
+        if is_pendel:
+            self._add_pivot_hinges(door, blades, blade_y_pos, blade_t_mm, luftspalte_mm, hinge_color, s, kb)
+        else:
+            hw = self.HINGE_WIDTH
+            hh = self.HINGE_HEIGHT
+            hd = self.HINGE_DEPTH
+            hy = profile.hinge_y(wall_t, blade_t_mm, karm_depth, hd)
+
+            for (bcx, b_w, b_h, count, hinge_side) in blades:
+                blade_x = bcx - b_w / 2
+                pivot = self._get_open_pivot(blade_x, b_w, blade_y_pos, blade_t_mm, hinge_side, s)
+
+                z_positions = self._hinge_z_positions(b_h, max(count, 2))
+
+                for z_center in z_positions:
+                    hz = luftspalte_mm + z_center - hh / 2
+                    if hinge_side == 'left':
+                        hx = bcx - b_w / 2 - hw
+                    else:
+                        hx = bcx + b_w / 2
+
+                    verts, faces = self._make_box(
+                        hx * s, hy * s, hz * s, hw * s, hd * s, hh * s
+                    )
+                    face_colors = self._normal_lit_face_colors(verts, faces, hinge_color)
+                    self._emit(verts, faces, face_colors, 'blade', pivot=pivot)
+
+    def _add_pivot_hinges(self, door, blades, blade_y_pos, blade_t_mm, luftspalte_mm, hinge_color, s, kb=None):
+        """Pivot-hengsler (KIAS 92 stop) for pendeldører — én solid boks per hengsel."""
+        door_def = DOOR_REGISTRY.get(door.door_type, {})
+        has_rygg = 'ryggforsterkning_hoyde_offset' in door_def
+
+        # Dimensjoner (mm)
+        pw = 80   # Bredde (X)
+        if has_rygg:
+            pd = RYGGFORST_DEPTH + 2 + 2  # 44mm: rammedybde + 2mm plate på hver side
+            frame_y = blade_y_pos + blade_t_mm / 2 - RYGGFORST_DEPTH / 2
+            py = frame_y - 2
+        else:
+            pd = blade_t_mm + 2 + 2
+            py = blade_y_pos - 2
+        ph = 60   # Høyde (Z)
+
+        h_offset = door_def.get('ryggforsterkning_hoyde_offset', 0)
+        is_double = door.floyer == 2
+
+        for (bcx, b_w, b_h, count, hinge_side) in blades:
+            blade_x = bcx - b_w / 2
+            if has_rygg and kb is not None:
+                # Hengsler etter klemsikring (35mm) + 5mm margin
+                klem_offset = 120  # anslag(80) + klemsikring(35) + margin(5)
+                if hinge_side == 'left':
+                    px = -kb / 2 + klem_offset
+                else:
+                    px = kb / 2 - klem_offset - pw
+            else:
+                overhang = 5  # mm utenfor bladkanten
+                if hinge_side == 'left':
+                    px = blade_x - overhang
+                else:
+                    px = blade_x + b_w + overhang - pw
+
+            # Hengsel-Z basert på rammehøyde (inkl. ryggforsterkning)
+            ref_h = b_h + h_offset if has_rygg else b_h
+            z_positions = self._hinge_z_positions(ref_h, max(count, 2))
+
+            # Skruehull-dimensjoner og 2×2 mønster (relativt til hengselets hjørne)
+            hole_size = 8   # mm
+            hole_t = 0.3    # mm tykkelse
+            hole_offsets_x = [pw * 0.25 - hole_size / 2, pw * 0.75 - hole_size / 2]
+            hole_offsets_z = [ph * 0.25 - hole_size / 2, ph * 0.75 - hole_size / 2]
+
+            for z_center in z_positions:
+                pz = luftspalte_mm + z_center - ph / 2
+
+                # Hengselkropp
+                verts, faces = self._make_box(
+                    px * s, py * s, pz * s, pw * s, pd * s, ph * s
+                )
+                face_colors = self._normal_lit_face_colors(verts, faces, PIVOT_PLATE_COLOR)
+                self._emit(verts, faces, face_colors, 'blade')
+
+                # 4 skruehull på fram- og bakside
+                for hox in hole_offsets_x:
+                    for hoz in hole_offsets_z:
+                        hx = px + hox
+                        hz = pz + hoz
+                        for face_y in (py + pd, py - hole_t):  # fram / bak
+                            verts, faces = self._make_box(
+                                hx * s, face_y * s, hz * s,
+                                hole_size * s, hole_t * s, hole_size * s
+                            )
+                            face_colors = self._normal_lit_face_colors(verts, faces, PIVOT_HOLE_COLOR)
+                            self._emit(verts, faces, face_colors, 'blade')
+
+    def _get_hinge_count(self, door) -> int:
+        """Hent hengselantall fra DoorParams."""
+        count = door.hinge_count
+        if door.floyer == 2:
+            count *= 2  # Per fløy → totalt
+        return count if count > 0 else 2
+
+    HINGE_EDGE_OFFSET = 250  # mm fra bunn/topp av dørblad til nærmeste hengsel (senter)
+
+    def _hinge_z_positions(self, blade_h, count):
+        """Returnerer hengsel-senterposisjoner (mm fra bunn av dørblad)."""
+        d = self.HINGE_EDGE_OFFSET
+        bottom = d
+        top = blade_h - d
+        if count == 2:
+            return [bottom, top]
+        elif count == 3:
+            return [bottom, top, blade_h - 2 * d]
+        elif count == 4:
+            return [bottom, top, blade_h - 2 * d, 2 * d]
+        else:
+            positions = [bottom, top]
+            inner_start = 2 * d
+            inner_end = blade_h - 2 * d
+            extras = count - 2
+            for i in range(extras):
+                positions.append(inner_start + (inner_end - inner_start) * i / max(extras - 1, 1))
+            return positions
+
+    def _get_blade_geometries(self, door, kb, kh, luftspalte_mm, total_hinges):
+        """Returnerer liste av (senter_x, bredde, høyde, hengsler_per_blad, hengselside) for hvert blad.
+
+        hengselside er 'left' eller 'right' — angir hvilken kant hengselet sitter på.
+        """
+        m = production_measures(door)
+        if door.floyer == 1:
+            db_b = m.dorblad_bredde or (kb - 128)
+            db_h = m.dorblad_hoyde or (kh - 85)
+            # 3D-koord er speilvendt: inverter slagretning for korrekt visuell plassering
+            hinge_3d = 'right' if door.swing_direction == 'left' else 'left'
+            per_blade = max(1, total_hinges)
+            # Ryggforsterkning 1-fløyet: skyv blad til karmkant på ikke-hengselsiden
+            door_def = DOOR_REGISTRY.get(door.door_type, {})
+            if 'ryggforsterkning_hoyde_offset' in door_def:
+                anslag_inner = 80  # list(60) + anslag(20)
+                if hinge_3d == 'left':
+                    offset_x = kb / 2 - anslag_inner - db_b / 2
+                else:
+                    offset_x = -kb / 2 + anslag_inner + db_b / 2
+            else:
+                offset_x = self._klemsikring_blade_offset(door)
+            return [(offset_x, db_b, db_h, per_blade, hinge_3d)]
+        else:
+            db_b_total = m.dorblad_bredde or (kb - 132)
+            db_h = m.dorblad_hoyde or (kh - 85)
+            db1_b = round(db_b_total * door.floyer_split / 100)
+            db2_b = db_b_total - db1_b
+            per_blade = max(1, total_hinges // 2)
+
+            # Primærblad (aktivt) plasseres på slagretning-siden
+            if door.swing_direction == 'left':
+                left_w, right_w = db1_b, db2_b
+            else:
+                left_w, right_w = db2_b, db1_b
+
+            total_w = left_w + BLADE_GAP + right_w
+            # Visuelt høyre (negativ X i 3D), visuelt venstre (positiv X)
+            right_cx = -total_w / 2 + right_w / 2
+            left_cx = -total_w / 2 + right_w + BLADE_GAP + left_w / 2
+            return [(left_cx, left_w, db_h, per_blade, 'right'),
+                    (right_cx, right_w, db_h, per_blade, 'left')]
+
+    # =========================================================================
+    # HÅNDTAK
+    # =========================================================================
+
+    def _add_handle(self, door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s):
+        """Skilthåndtak på motsatt side av hengslene."""
+        margin = self.HANDLE_X_MARGIN
+        tube_segs, bend_segs, corner_segs, smooth = gfx.detail_levels(self._interactive)
+        handle_color = np.array([0.478, 0.478, 0.478, 1.0])
+
+        total_hinges = self._get_hinge_count(door)
+        blades = self._get_blade_geometries(door, kb, kh, luftspalte_mm, total_hinges)
+        # Håndtak på aktivt blad (slagretning-siden)
+        if door.floyer == 2 and door.swing_direction == 'right':
+            bcx, b_w, b_h, _, hinge_side = blades[1]
+        else:
+            bcx, b_w, b_h, _, hinge_side = blades[0]
+
+        # Pivot for open-rotasjon
+        blade_y = profile.blade_y(wall_t, blade_t_mm, karm_depth)
+        blade_x = bcx - b_w / 2
+        pivot = self._get_open_pivot(blade_x, b_w, blade_y, blade_t_mm, hinge_side, s)
+
+        # Senter-X for skiltet (motsatt side av hengselet)
+        if hinge_side == 'left':
+            plate_cx = bcx + b_w / 2 - margin
+        else:
+            plate_cx = bcx - b_w / 2 + margin
+
+        # Y-posisjon (på framside av dørblad)
+        plate_y = profile.handle_y(wall_t, blade_t_mm, karm_depth)
+
+        plate_cy = plate_y + self.PLATE_DEPTH / 2
+        plate_cz = door.sparkeplate_hoyde + 100 + door.effective_luftspalte()
+
+        # Skilt (avrundede hjørner, høyere oppløsning)
+        verts, faces = self._make_rounded_rect(
+            plate_cx * s, plate_cy * s, plate_cz * s,
+            self.PLATE_WIDTH * s, self.PLATE_HEIGHT * s, self.PLATE_DEPTH * s,
+            self.PLATE_CORNER_RADIUS * s,
+            segments=corner_segs
+        )
+        face_colors = self._normal_lit_face_colors(verts, faces, handle_color)
+        self._emit(verts, faces, face_colors, 'blade', smooth=smooth, pivot=pivot)
+
+        # --- Bakside skilt (speilet i Y-retning) ---
+        back_plate_y = blade_y
+        back_plate_cy = back_plate_y - self.PLATE_DEPTH / 2
+
+        verts, faces = self._make_rounded_rect(
+            plate_cx * s, back_plate_cy * s, plate_cz * s,
+            self.PLATE_WIDTH * s, self.PLATE_HEIGHT * s, self.PLATE_DEPTH * s,
+            self.PLATE_CORNER_RADIUS * s,
+            segments=corner_segs
+        )
+        face_colors = self._normal_lit_face_colors(verts, faces, handle_color)
+        self._emit(verts, faces, face_colors, 'blade', smooth=smooth, pivot=pivot)
+
+        # Grep (bue fra skilt + rett spak) — framside
+        bend_r = self.LEVER_BEND_RADIUS
+        lever_cz = plate_cz + self.LEVER_Z_OFFSET
+        lever_y_start = plate_y + self.PLATE_DEPTH
+
+        # Bygg bane: bue (kvartssirkel) + rett strekk
+        path = []
+        if hinge_side == 'left':
+            # Bue fra Y+ retning til X- retning (grep peker mot hengslene)
+            arc_cx = plate_cx - bend_r
+            arc_cy = lever_y_start
+            for i in range(bend_segs + 1):
+                angle = i * (np.pi / 2) / bend_segs
+                px = arc_cx + bend_r * np.cos(angle)
+                py = arc_cy + bend_r * np.sin(angle)
+                path.append((px * s, py * s, lever_cz * s))
+            # Rett del mot venstre
+            end_x = plate_cx - bend_r - self.LEVER_STRAIGHT
+            horiz_y = lever_y_start + bend_r
+            path.append((end_x * s, horiz_y * s, lever_cz * s))
+        else:
+            # Bue fra Y+ retning til X+ retning (grep peker mot hengslene)
+            arc_cx = plate_cx + bend_r
+            arc_cy = lever_y_start
+            for i in range(bend_segs + 1):
+                angle = np.pi - i * (np.pi / 2) / bend_segs
+                px = arc_cx + bend_r * np.cos(angle)
+                py = arc_cy + bend_r * np.sin(angle)
+                path.append((px * s, py * s, lever_cz * s))
+            # Rett del mot høyre
+            end_x = plate_cx + bend_r + self.LEVER_STRAIGHT
+            horiz_y = lever_y_start + bend_r
+            path.append((end_x * s, horiz_y * s, lever_cz * s))
+
+        verts, faces = self._make_swept_tube(
+            path, self.LEVER_RADIUS * s, segments=tube_segs
+        )
+        face_colors = self._normal_lit_face_colors(verts, faces, handle_color)
+        self._emit(verts, faces, face_colors, 'blade', smooth=smooth, pivot=pivot)
+
+        # --- Bakside grep (speilet i Y-retning) ---
+        back_lever_y_start = back_plate_y - self.PLATE_DEPTH
+
+        back_path = []
+        if hinge_side == 'left':
+            arc_cx = plate_cx - bend_r
+            arc_cy = back_lever_y_start
+            for i in range(bend_segs + 1):
+                angle = i * (np.pi / 2) / bend_segs
+                px = arc_cx + bend_r * np.cos(angle)
+                py = arc_cy - bend_r * np.sin(angle)
+                back_path.append((px * s, py * s, lever_cz * s))
+            end_x = plate_cx - bend_r - self.LEVER_STRAIGHT
+            horiz_y = back_lever_y_start - bend_r
+            back_path.append((end_x * s, horiz_y * s, lever_cz * s))
+        else:
+            arc_cx = plate_cx + bend_r
+            arc_cy = back_lever_y_start
+            for i in range(bend_segs + 1):
+                angle = np.pi - i * (np.pi / 2) / bend_segs
+                px = arc_cx + bend_r * np.cos(angle)
+                py = arc_cy - bend_r * np.sin(angle)
+                back_path.append((px * s, py * s, lever_cz * s))
+            end_x = plate_cx + bend_r + self.LEVER_STRAIGHT
+            horiz_y = back_lever_y_start - bend_r
+            back_path.append((end_x * s, horiz_y * s, lever_cz * s))
+
+        verts, faces = self._make_swept_tube(
+            back_path, self.LEVER_RADIUS * s, segments=tube_segs
+        )
+        face_colors = self._normal_lit_face_colors(verts, faces, handle_color)
+        self._emit(verts, faces, face_colors, 'blade', smooth=smooth, pivot=pivot)
+
+    # =========================================================================
+    # SPARKEPLATER
+    # =========================================================================
+
+    def _add_sparkeplater(self, door, profile, kb, kh, wall_t, blade_t_mm, karm_depth, luftspalte_mm, s):
+        """Sparkeplater på begge sider av hvert dørblad (pendeldører)."""
+        sp_color = np.array(SPARKEPLATE_COLOR)
+        blade_y = profile.blade_y(wall_t, blade_t_mm, karm_depth)
+        sp_t = SPARKEPLATE_THICKNESS
+
+        # Sparkeplater monteres alltid på dørbladets overflate (5mm for PDPC/PDPO)
+        door_def = DOOR_REGISTRY.get(door.door_type, {})
+        has_rygg = 'ryggforsterkning_hoyde_offset' in door_def
+        sp_surface_y = blade_y
+        sp_surface_depth = blade_t_mm
+
+        m = production_measures(door)
+        if door.floyer == 1:
+            db_b = m.dorblad_bredde
+            db_h = m.dorblad_hoyde
+            if db_b and db_h:
+                sp_b = m.sparkeplate_bredder[0]
+                if sp_b:
+                    sp_h = min(door.sparkeplate_hoyde, db_h)
+                    hinge_3d = 'right' if door.swing_direction == 'left' else 'left'
+                    if has_rygg:
+                        anslag_inner = 80
+                        if hinge_3d == 'left':
+                            blade_x = kb / 2 - anslag_inner - db_b
+                        else:
+                            blade_x = -kb / 2 + anslag_inner
+                    else:
+                        offset_x = self._klemsikring_blade_offset(door)
+                        blade_x = -db_b / 2 + offset_x
+                    sp_x = blade_x + (db_b - sp_b) / 2
+                    eff_x, eff_w, eff_y, eff_d = self._effective_pivot_params(
+                        door, blade_x, db_b, blade_y, blade_t_mm,
+                        kb=kb, hinge_side=hinge_3d
+                    )
+                    pivot = self._get_open_pivot(eff_x, eff_w, eff_y, eff_d, hinge_3d, s)
+                    # Framside
+                    self._render_sparkeplate(sp_x, sp_surface_y + sp_surface_depth, luftspalte_mm, sp_b, sp_t, sp_h, sp_color, s, pivot)
+                    # Bakside
+                    self._render_sparkeplate(sp_x, sp_surface_y - sp_t, luftspalte_mm, sp_b, sp_t, sp_h, sp_color, s, pivot)
+        else:
+            db_b_total = m.dorblad_bredde
+            db_h = m.dorblad_hoyde
+            if db_b_total and db_h:
+                db1_b, db2_b = m.blad_bredder
+                sp1_b, sp2_b = m.sparkeplate_bredder
+
+                if door.swing_direction == 'left':
+                    left_w, right_w = db1_b, db2_b
+                    sp_b_l, sp_b_r = sp1_b, sp2_b
+                else:
+                    left_w, right_w = db2_b, db1_b
+                    sp_b_l, sp_b_r = sp2_b, sp1_b
+
+                total_w = left_w + BLADE_GAP + right_w
+                start_x = -total_w / 2
+
+                sp_h = min(door.sparkeplate_hoyde, db_h)
+
+                # Visuelt høyre blad
+                right_x = start_x
+                if sp_b_r:
+                    sp_x_r = right_x + (right_w - sp_b_r) / 2
+                    eff_rx, eff_rw, eff_ry, eff_rd = self._effective_pivot_params(
+                        door, right_x, right_w, blade_y, blade_t_mm,
+                        kb=kb, hinge_side='left'
+                    )
+                    pivot_r = self._get_open_pivot(eff_rx, eff_rw, eff_ry, eff_rd, 'left', s)
+                    self._render_sparkeplate(sp_x_r, sp_surface_y + sp_surface_depth, luftspalte_mm, sp_b_r, sp_t, sp_h, sp_color, s, pivot_r)
+                    self._render_sparkeplate(sp_x_r, sp_surface_y - sp_t, luftspalte_mm, sp_b_r, sp_t, sp_h, sp_color, s, pivot_r)
+
+                # Visuelt venstre blad
+                left_x = start_x + right_w + BLADE_GAP
+                if sp_b_l:
+                    sp_x_l = left_x + (left_w - sp_b_l) / 2
+                    eff_lx, eff_lw, eff_ly, eff_ld = self._effective_pivot_params(
+                        door, left_x, left_w, blade_y, blade_t_mm,
+                        kb=kb, hinge_side='right'
+                    )
+                    pivot_l = self._get_open_pivot(eff_lx, eff_lw, eff_ly, eff_ld, 'right', s)
+                    self._render_sparkeplate(sp_x_l, sp_surface_y + sp_surface_depth, luftspalte_mm, sp_b_l, sp_t, sp_h, sp_color, s, pivot_l)
+                    self._render_sparkeplate(sp_x_l, sp_surface_y - sp_t, luftspalte_mm, sp_b_l, sp_t, sp_h, sp_color, s, pivot_l)
+
+    def _render_sparkeplate(self, x, y, z, w, d, h, color, s, pivot=None):
+        """Tegner én sparkeplate med retningsbasert lys."""
+        verts, faces = self._make_box(x * s, y * s, z * s, w * s, d * s, h * s)
+        face_colors = self._lit_face_colors(color)
+
+        self._emit(verts, faces, face_colors, 'blade', pivot=pivot)
+
+    # =========================================================================
+    # KLEMSIKRING
+    # =========================================================================
+
+    def _klemsikring_blade_offset(self, door):
+        """Returnerer X-offset for dørblad pga. klemsikring (kun PDI 1-fløyet)."""
+        door_def = DOOR_REGISTRY.get(door.door_type, {})
+        if not door_def.get('klemsikring', False) or door.floyer != 1:
+            return 0
+        bredde = door_def.get('klemsikring_bredde', 8)
+        hinge_3d = 'right' if door.swing_direction == 'left' else 'left'
+        if hinge_3d == 'left':
+            return bredde / 2
+        else:
+            return -bredde / 2
+
+    def _add_klemsikring(self, door, profile, kb, kh, wall_t, karm_depth, s):
+        """Tegner svarte klemsikring-striper på innsiden av anslagene."""
+        door_def = DOOR_REGISTRY.get(door.door_type, {})
+        ks_bredde = door_def.get('klemsikring_bredde', 8)
+        ks_color = np.array(KLEMSIKRING_COLOR)
+
+        list_w = 60    # listverk bredde
+        anslag_w = 20  # anslag bredde
+
+        # Klemsikring-dimensjoner
+        ks_depth = door.blade_thickness  # Dekker hele bladtykkelsen
+        blade_y = profile.blade_y(wall_t, door.blade_thickness, karm_depth)
+        ks_y = blade_y
+        ks_h = kh - list_w  # Full anslagshøyde
+
+        # Anslag innerkant: -kb/2 + list_w + anslag_w = -kb/2 + 80
+        left_x = -kb / 2 + list_w + anslag_w
+        right_x = kb / 2 - list_w - anslag_w - ks_bredde
+
+        if door.floyer == 1:
+            # Kun på hengslesiden
+            hinge_3d = 'right' if door.swing_direction == 'left' else 'left'
+            if hinge_3d == 'left':
+                # Hengsel på negativ X (visuelt høyre) → klemsikring på venstre side
+                x = left_x
+            else:
+                # Hengsel på positiv X (visuelt venstre) → klemsikring på høyre side
+                x = right_x
+            self._add_mesh(
+                x * s, ks_y * s, 0,
+                ks_bredde * s, ks_depth * s, ks_h * s,
+                ks_color, group='frame'
+            )
+        else:
+            # 2-fløyet: begge sider
+            for x in [left_x, right_x]:
+                self._add_mesh(
+                    x * s, ks_y * s, 0,
+                    ks_bredde * s, ks_depth * s, ks_h * s,
+                    ks_color, group='frame'
+                )
+
+    # =========================================================================
+    # HJELPEMETODER
+    # =========================================================================
+
+    def _effective_pivot_params(self, door, blade_x, blade_w, blade_y, blade_t,
+                                kb=None, hinge_side=None):
+        """Returnerer (eff_x, eff_w, eff_y, eff_d) for pivot-beregning.
+
+        Når ryggforsterkning finnes (PDPC/PDPO), brukes rammens dimensjoner
+        i stedet for bladets for korrekt rotasjon rundt hengselkant.
+        For 2-fløyet strekker rammen seg fra karm innerkant til over bladet.
+        """
+        door_def = DOOR_REGISTRY.get(door.door_type, {})
+        if 'ryggforsterkning_hoyde_offset' in door_def:
+            frame_y = blade_y + blade_t / 2 - RYGGFORST_DEPTH / 2
+            if kb is not None and hinge_side is not None:
+                # Ramme fra etter klemsikring (35mm) + 5mm margin
+                klem_offset = 120  # anslag(80) + klemsikring(35) + margin(5)
+                lap = RYGGFORST_OVERLAP
+                if hinge_side == 'left':
+                    outer_x = -kb / 2 + klem_offset
+                    return (outer_x, blade_x + blade_w + lap - outer_x,
+                            frame_y, RYGGFORST_DEPTH)
+                else:
+                    outer_x = kb / 2 - klem_offset
+                    return (blade_x - lap, outer_x - blade_x + lap,
+                            frame_y, RYGGFORST_DEPTH)
+            else:
+                # Fallback uten kb/hinge_side
+                side_w = door_def['ryggforsterkning_overdel_offset'] / 2  # 49mm
+                return (blade_x - side_w, blade_w + 2 * side_w,
+                        frame_y, RYGGFORST_DEPTH)
+        return (blade_x, blade_w, blade_y, blade_t)
+
+    def _get_open_pivot(self, blade_x, blade_w, blade_y, blade_d, hinge_side, s):
+        """Returnerer (vinkel, pivot_x, pivot_y, y_offset) for open-dør-rotasjon, eller None."""
+        if not self._door_open:
+            return None
+        if hinge_side == 'left':
+            px = blade_x * s
+            angle = 90.0
+        else:
+            px = (blade_x + blade_w) * s
+            angle = -90.0
+        py = (blade_y + blade_d / 2) * s
+        y_offset = blade_d * s
+        return (angle, px, py, y_offset)
+
+    _FACE_LIGHT = gfx.BOX_FACE_LIGHT
+
+    @staticmethod
+    def _lit_face_colors(base_color, light_factors=None):
+        """Beregn 12 flatefarger (2 trekanter × 6 sider) med retningsbasert lys."""
+        if light_factors is None:
+            light_factors = SceneBuilder._FACE_LIGHT
+        r, g, b, a = base_color[0], base_color[1], base_color[2], base_color[3]
+        add = gfx.LIGHT_ADDITIVE
+        colors = []
+        for f in light_factors:
+            c = (min(1.0, r * f + add), min(1.0, g * f + add), min(1.0, b * f + add), a)
+            colors.append(c)
+            colors.append(c)  # 2 trekanter per side
+        return np.array(colors)
+
+    def _add_mesh(self, x, y, z, dx, dy, dz, color, group: str, gl_options=None):
+        """Legger til boks med simulert retningslys i gitt synlighetsgruppe."""
+        verts, faces = self._make_box(x, y, z, dx, dy, dz)
+        self._emit(verts, faces, self._lit_face_colors(color), group, gl_options=gl_options)
+
+    @staticmethod
+    def _make_box(x, y, z, dx, dy, dz):
+        """Genererer vertices og faces for en boks."""
+        verts = np.array([
+            [x,      y,      z],
+            [x + dx, y,      z],
+            [x + dx, y + dy, z],
+            [x,      y + dy, z],
+            [x,      y,      z + dz],
+            [x + dx, y,      z + dz],
+            [x + dx, y + dy, z + dz],
+            [x,      y + dy, z + dz],
+        ])
+        faces = np.array([
+            [0, 1, 2], [0, 2, 3],     # Bunn
+            [4, 6, 5], [4, 7, 6],     # Topp
+            [3, 2, 6], [3, 6, 7],     # Front (y + dy)
+            [0, 5, 1], [0, 4, 5],     # Bak (y)
+            [0, 3, 7], [0, 7, 4],     # Venstre (x)
+            [1, 5, 6], [1, 6, 2],     # Høyre (x + dx)
+        ])
+        return verts, faces
+
+    @staticmethod
+    def _make_rounded_rect(cx, cy, cz, width, height, depth, radius, segments=8):
+        """Ekstrudert rektangel med avrundede hjørner, sentrert på (cx, cy, cz).
+
+        Profil i XZ-planet, ekstrudert langs Y. Resultatet memoiseres
+        (se _rounded_rect_mesh); arrayene er skrivebeskyttet.
+        """
+        return _rounded_rect_mesh(cx, cy, cz, width, height, depth, radius, segments)
+
+    @staticmethod
+    def _make_swept_tube(path, radius, segments=24):
+        """Rørform langs en bane (liste av (x, y, z) punkt).
+
+        Resultatet memoiseres på (bane, radius, segmenter) (se
+        _swept_tube_mesh); arrayene er skrivebeskyttet.
+        """
+        return _swept_tube_mesh(tuple(tuple(float(c) for c in p) for p in path),
+                                radius, segments)
+
+    @staticmethod
+    def _normal_lit_face_colors(verts, faces, base_color):
+        """Per-face lys med ambient, diffuse og spekulær refleksjon.
+
+        Normaler og lys beregnes for alle flater samtidig med array-operasjoner.
+        """
+        light_dir = np.array(gfx.LIGHT_DIRECTION, dtype=float)
+        light_dir = light_dir / np.linalg.norm(light_dir)
+        view_dir = np.array(gfx.VIEW_DIRECTION, dtype=float)
+        view_dir = view_dir / np.linalg.norm(view_dir)
+        halfway = light_dir + view_dir
+        halfway = halfway / np.linalg.norm(halfway)
+
+        verts = np.asarray(verts, dtype=float)
+        faces = np.asarray(faces, dtype=np.intp).reshape(-1, 3)
+        v0 = verts[faces[:, 0]]
+        normals = np.cross(verts[faces[:, 1]] - v0, verts[faces[:, 2]] - v0)
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        np.divide(normals, lengths, out=normals, where=lengths > 0)
+
+        # Diffus komponent
+        n_dot_l = np.maximum(0.0, normals @ light_dir)
+        # Spekulær komponent (Blinn-Phong), kun for flater som vender mot lyset
+        n_dot_h = np.maximum(0.0, normals @ halfway)
+        spec = np.where(n_dot_l > 0, gfx.LIGHT_SPECULAR * n_dot_h ** gfx.LIGHT_SHININESS, 0.0)
+
+        brightness = gfx.LIGHT_AMBIENT + gfx.LIGHT_DIFFUSE * n_dot_l + spec
+        colors = np.empty((len(faces), 4))
+        colors[:, :3] = np.minimum(1.0, np.outer(brightness, base_color[:3]) + gfx.LIGHT_ADDITIVE)
+        colors[:, 3] = base_color[3]
+        return colors
+
+    @staticmethod
+    def _ral_to_rgba(ral_code: str, alpha: float = 1.0) -> tuple:
+        """Konverterer RAL-kode eller polykarbonat-farge til (r, g, b, a) tuple for OpenGL."""
+        if ral_code in RAL_COLORS:
+            r, g, b = RAL_COLORS[ral_code]['rgb']
+            return (r, g, b, alpha)
+        if ral_code in POLYKARBONAT_COLORS:
+            entry = POLYKARBONAT_COLORS[ral_code]
+            r, g, b = entry['rgb']
+            return (r, g, b, entry.get('alpha', alpha))
+        return (0.5, 0.5, 0.5, alpha)
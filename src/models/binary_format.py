@@ -0,0 +1,323 @@
+"""
+Kompakt binærformat for prosjektfiler (.kdf) og dørlister (.kdl).
+
+Samme filendelser som JSON-formatene; load_project() og load_door_list()
+kjenner igjen binærfilene på de fire første bytene (MAGIC).
+
+Oppbygning:
+    MAGIC (4) | versjon (H) | filtype (B) | komprimering (B) | hodelengde (I)
+    hode: komprimert JSON med feltskjema, strengtabell og blokkindeks
+    blokker: komprimerte, struct-pakkede rader (BLOCK_SIZE dører per blokk)
+
+Alle strengverdier (dørtype, karmtype, hengsel, farger osv.) lagres én
+gang i strengtabellen og refereres med et heltall per rad. Datoer lagres
+som mikrosekunder. Blokkene kan leses én og én, slik at store lister
+ikke må pakkes ut samlet.
+"""
+import json
+import os
+import struct
+import zlib
+from itertools import islice, starmap
+from operator import itemgetter
+from dataclasses import fields
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .door import DoorParams
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+_DECOMPRESS_ERRORS = (zlib.error,) + ((zstandard.ZstdError,) if HAS_ZSTD else ())
+
+MAGIC = b'KDB\x01'
+FORMAT_VERSION = 1
+
+KIND_PROJECT = 1
+KIND_DOOR_LIST = 2
+
+COMPRESSION_NONE = 'none'
+COMPRESSION_ZLIB = 'zlib'
+COMPRESSION_ZSTD = 'zstd'
+_COMPRESSION_CODES = {COMPRESSION_NONE: 0, COMPRESSION_ZLIB: 1, COMPRESSION_ZSTD: 2}
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# Dører per blokk
+BLOCK_SIZE = 1024
+
+# Datofelter (ISO-tekst i DoorParams, mikrosekunder i filen)
+DATE_FIELDS = frozenset({'created_date', 'modified_date'})
+
+# Feltkoder i skjemaet → struct-format
+_FIELD_FORMATS = {'s': 'I', 'i': 'q', 'b': '?', 'd': 'q'}
+
+_PREFIX = struct.Struct('<4sHBBI')
+_DATE_EPOCH = datetime(1, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _field_code(name: str, ftype) -> str:
+    if name in DATE_FIELDS:
+        return 'd'
+    if ftype is bool:
+        return 'b'
+    if ftype is int:
+        return 'i'
+    return 's'
+
+
+def door_schema() -> List[Tuple[str, str]]:
+    """(feltnavn, feltkode) for feltene i DoorParams.to_dict()."""
+    types = {f.name: f.type for f in fields(DoorParams)}
+    return [(name, _field_code(name, types.get(name, str)))
+            for name in DoorParams().to_dict()]
+
+
+def is_binary_file(filepath: Path | str) -> bool:
+    """True hvis filen starter med MAGIC."""
+    with open(filepath, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+# =============================================================================
+# KOMPRIMERING
+# =============================================================================
+
+def _compressor(compression: str):
+    if compression == COMPRESSION_ZLIB:
+        return lambda data: zlib.compress(data, ZLIB_LEVEL)
+    if compression == COMPRESSION_ZSTD:
+        if not HAS_ZSTD:
+            raise ValueError("zstd-komprimering krever pakken 'zstandard'")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress
+    if compression == COMPRESSION_NONE:
+        return bytes
+    raise ValueError(f"Ukjent komprimering: {compression}")
+
+
+def _decompressor(code: int):
+    if code == _COMPRESSION_CODES[COMPRESSION_ZLIB]:
+        return zlib.decompress
+    if code == _COMPRESSION_CODES[COMPRESSION_ZSTD]:
+        if not HAS_ZSTD:
+            raise ValueError("Filen er zstd-komprimert, men pakken 'zstandard' er ikke installert")
+        return zstandard.ZstdDecompressor().decompress
+    if code == _COMPRESSION_CODES[COMPRESSION_NONE]:
+        return bytes
+    raise ValueError(f"Ukjent komprimeringskode i fil: {code}")
+
+
+# =============================================================================
+# SKRIVING
+# =============================================================================
+
+class _StringTable:
+    """Strengtabell der hver unike streng får et fast nummer."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+
+def _encode_date(value, table: _StringTable) -> int:
+    """0 = tom, > 0 = mikrosekunder + 1, < 0 = -(strengkode + 1)."""
+    if value == '':
+        return 0
+    try:
+        dt = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        dt = None
+    # Bare verdier som gir nøyaktig samme tekst tilbake lagres som tall
+    if dt is not None and dt.tzinfo is None and dt.isoformat() == value:
+        return (dt - _DATE_EPOCH) // _MICROSECOND + 1
+    return -(table.code(value) + 1)
+
+
+def _block_encoder(schema: List[Tuple[str, str]], table: _StringTable, row: struct.Struct):
+    """Funksjon som pakker en liste med params-dicts til bytes.
+
+    Verdiene kodes kolonnevis (map over hver kolonne) og pakkes rad for rad.
+    """
+    getter = itemgetter(*(name for name, _ in schema))
+
+    def encode_date(value) -> int:
+        return _encode_date(value, table)
+
+    def encode(doors: List[dict]) -> bytes:
+        try:
+            rows = list(map(getter, doors))
+        except KeyError as e:
+            raise ValueError(f"Dør mangler feltet {e}") from e
+        columns = []
+        for (name, code), column in zip(schema, zip(*rows)):
+            if code == 's':
+                column = map(table.code, column)
+            elif code == 'd':
+                column = map(encode_date, column)
+            elif code == 'b':
+                column = map(bool, column)
+            elif not all(type(value) is int for value in column):
+                bad = next(v for v in column if type(v) is not int)
+                raise ValueError(f"Feltet '{name}' må være et heltall, fikk {bad!r}")
+            columns.append(column)
+        return b''.join(starmap(row.pack, zip(*columns)))
+    return encode
+
+
+def write_doors(filepath: Path | str, kind: int, doors: Iterable[dict],
+                compression: str = COMPRESSION_ZLIB) -> int:
+    """Skriver dører (params-dicts fra DoorParams.to_dict()) til binærfil.
+
+    Filen skrives til en midlertidig fil og byttes inn til slutt.
+
+    Args:
+        filepath: Målsti
+        kind: KIND_PROJECT eller KIND_DOOR_LIST
+        doors: params-dicts (kan være en generator)
+        compression: COMPRESSION_ZLIB, COMPRESSION_ZSTD eller COMPRESSION_NONE
+
+    Returns:
+        Antall dører skrevet
+
+    Raises:
+        ValueError: Ukjent/utilgjengelig komprimering eller ugyldig feltverdi
+    """
+    compress = _compressor(compression)
+    schema = door_schema()
+    row = struct.Struct('<' + ''.join(_FIELD_FORMATS[code] for _, code in schema))
+    table = _StringTable()
+    encode = _block_encoder(schema, table, row)
+
+    blocks: List[bytes] = []
+    index: List[List[int]] = []     # [offset, lengde, antall dører]
+    offset = count = 0
+    doors = iter(doors)
+    while True:
+        block = list(islice(doors, BLOCK_SIZE))
+        if not block:
+            break
+        data = compress(encode(block))
+        blocks.append(data)
+        index.append([offset, len(data), len(block)])
+        offset += len(data)
+        count += len(block)
+
+    header = {
+        'fields': [[name, code] for name, code in schema],
+        'strings': table.strings,
+        'blocks': index,
+        'count': count,
+    }
+    header_data = compress(json.dumps(header, ensure_ascii=False,
+                                      separators=(',', ':')).encode('utf-8'))
+
+    filepath = Path(filepath)
+    tmp_path = filepath.with_name(filepath.name + '.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, kind,
+                                 _COMPRESSION_CODES[compression], len(header_data)))
+            f.write(header_data)
+            for data in blocks:
+                f.write(data)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return count
+
+
+# =============================================================================
+# LESING
+# =============================================================================
+
+def _block_decoder(schema: List[Tuple[str, str]], strings: List[str]):
+    """Funksjon som gjør utpakkede rader om til params-dicts.
+
+    Dekodingen gjøres kolonnevis for hele blokken (map over hver kolonne),
+    som er vesentlig raskere enn felt for felt per rad.
+    """
+    names = [name for name, _ in schema]
+    codes = [code for _, code in schema]
+    lookup = strings.__getitem__
+
+    def decode_date(value: int) -> str:
+        if value == 0:
+            return ''
+        if value < 0:
+            return strings[-value - 1]
+        return (_DATE_EPOCH + (value - 1) * _MICROSECOND).isoformat()
+
+    def decode(rows: List[tuple]) -> List[dict]:
+        if not rows:
+            return []
+        columns = []
+        for code, column in zip(codes, zip(*rows)):
+            if code == 's':
+                column = map(lookup, column)
+            elif code == 'd':
+                column = map(decode_date, column)
+            columns.append(column)
+        return [dict(zip(names, values)) for values in zip(*columns)]
+    return decode
+
+
+def iter_doors(filepath: Path | str, kind: int) -> Iterator[dict]:
+    """Leser params-dicts fra en binærfil, blokk for blokk.
+
+    Args:
+        filepath: Sti til filen
+        kind: Forventet filtype (KIND_PROJECT eller KIND_DOOR_LIST)
+
+    Yields:
+        params-dict per dør (som DoorParams.to_dict())
+
+    Raises:
+        ValueError: Feil filtype, versjon eller skadet fil
+    """
+    with open(filepath, 'rb') as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError("Ugyldig binærfil: for kort")
+        magic, version, file_kind, comp_code, header_len = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise ValueError("Ugyldig binærfil: feil filsignatur")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Binærfilen har nyere versjon ({version}) enn støttet")
+        if file_kind != kind:
+            raise ValueError("Ugyldig filformat: feil filtype")
+        decompress = _decompressor(comp_code)
+        try:
+            header = json.loads(decompress(f.read(header_len)).decode('utf-8'))
+            schema = [(name, code) for name, code in header['fields']]
+            row = struct.Struct('<' + ''.join(_FIELD_FORMATS[code] for _, code in schema))
+            decode = _block_decoder(schema, header['strings'])
+            blocks = [(int(o), int(n), int(c)) for o, n, c in header['blocks']]
+        except (KeyError, TypeError, ValueError, *_DECOMPRESS_ERRORS) as e:
+            raise ValueError(f"Ugyldig binærfil: skadet hode ({e})") from e
+
+        start = f.tell()
+        for block_no, (offset, length, count) in enumerate(blocks):
+            f.seek(start + offset)
+            try:
+                data = decompress(f.read(length))
+                rows = list(row.iter_unpack(data))
+                if len(rows) != count:
+                    raise ValueError(f"forventet {count} dører, fant {len(rows)}")
+                decoded = decode(rows)
+            except (struct.error, IndexError, ValueError, *_DECOMPRESS_ERRORS) as e:
+                raise ValueError(f"Ugyldig blokk {block_no + 1} i binærfil: {e}") from e
+            yield from decoded
@@ -17,6 +17,11 @@ from ..utils.constants import (
     DEFAULT_THRESHOLDS, DEFAULT_LUFTSPALTE
 )
 
+# Felter som kun er metadata – påvirker verken mål, geometri eller utseende
+METADATA_FIELDS = frozenset({
+    'project_id', 'customer', 'notes', 'created_date', 'modified_date',
+})
+
 
 @dataclass
 class DoorParams:
@@ -77,6 +82,51 @@ class DoorParams:
     created_date: str = field(default_factory=lambda: datetime.now().isoformat())
     modified_date: str = ""
 
+    def __post_init__(self):
+        # Endringssporing starter etter __init__, så startverdier er ikke "endret"
+        object.__setattr__(self, '_dirty', set())
+
+    def __copy__(self):
+        # Kopien får sitt eget sett med endrede felter (ikke delt med originalen)
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        object.__setattr__(clone, '_dirty', set(self._dirty))
+        return clone
+
+    def __setattr__(self, name, value):
+        # Registrer feltet som endret kun når verdien faktisk er ny
+        dirty = self.__dict__.get('_dirty')
+        if dirty is not None and name not in dirty and name in self.__dataclass_fields__:
+            if self.__dict__.get(name) != value:
+                dirty.add(name)
+        object.__setattr__(self, name, value)
+
+    # ── Endringssporing ───────────────────────────────────────────
+
+    def dirty_fields(self) -> frozenset:
+        """Felter som er endret siden forrige clear_dirty()/pop_dirty()."""
+        return frozenset(self._dirty)
+
+    def pop_dirty(self) -> frozenset:
+        """Returnerer endrede felter og nullstiller sporingen."""
+        fields = frozenset(self._dirty)
+        self._dirty.clear()
+        return fields
+
+    def clear_dirty(self) -> None:
+        """Nullstiller endringssporingen."""
+        self._dirty.clear()
+
+    def is_dirty(self, fields=None) -> bool:
+        """True hvis noe (eller noen av de angitte feltene) er endret."""
+        if fields is None:
+            return bool(self._dirty)
+        return not self._dirty.isdisjoint(fields)
+
+    def only_metadata_dirty(self) -> bool:
+        """True hvis noe er endret, og kun metadata-felter (notater, kunde osv.)."""
+        return bool(self._dirty) and self._dirty <= METADATA_FIELDS
+
     def apply_defaults_for_type(self) -> None:
         """Setter standardverdier basert på valgt dørtype."""
         defaults = DEFAULT_DIMENSIONS.get(self.door_type)
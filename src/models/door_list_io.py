@@ -1,30 +1,116 @@
 """
 Import/eksport av dørlister i .kdl-format (KIAS Door List).
+
+To varianter leses automatisk:
+- JSON: ett objekt med alle dører i 'doors' (versjon 1.0)
+- JSON Lines: en hodelinje med "format": "jsonl", deretter én dør per
+  linje. Skrives og leses dør for dør, slik at store lister ikke må
+  ligge i minnet som ett JSON-dokument.
+- Binært: kompakt format fra binary_format (samme filendelse).
 """
 import json
+import os
 from pathlib import Path
+from typing import Iterator, Optional
 
+from . import binary_format
 from .production_list import ProductionList
 
+JSONL_FORMAT = 'jsonl'
+JSONL_VERSION = '1.1'
+# Lister med minst så mange dører lagres som JSON Lines (streaming=None)
+STREAMING_MIN_DOORS = 500
+
+
+def _check_type(data) -> None:
+    if not isinstance(data, dict) or data.get('type') != 'door_list':
+        raise ValueError("Ugyldig filformat: forventet 'door_list'")
+
 
-def save_door_list(prod_list: ProductionList, filepath: Path) -> None:
+def save_door_list(prod_list: ProductionList, filepath: Path,
+                   streaming: Optional[bool] = None, binary: bool = False,
+                   compression: str = binary_format.COMPRESSION_ZLIB) -> None:
     """Eksporterer dørlisten til en .kdl-fil.
 
     Args:
         prod_list: ProductionList som skal eksporteres
         filepath: Målsti for .kdl-filen
+        streaming: True = JSON Lines, False = JSON, None = JSON Lines
+                   fra STREAMING_MIN_DOORS dører
+        binary: Lagre i kompakt binærformat (streaming ignoreres).
+                Dør-ID og etikett lagres ikke; de lages på nytt ved import.
+        compression: Komprimering for binærformatet
     """
-    data = prod_list.to_list_dict()
     filepath = Path(str(filepath))
     if not filepath.suffix:
         filepath = filepath.with_suffix('.kdl')
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    if binary:
+        binary_format.write_doors(
+            filepath, binary_format.KIND_DOOR_LIST,
+            (door.params.to_dict() for door in prod_list.doors), compression)
+        return
+    if streaming is None:
+        streaming = prod_list.door_count >= STREAMING_MIN_DOORS
+
+    # Skriv til midlertidig fil og bytt ut til slutt, så en avbrutt
+    # eksport ikke etterlater en halv liste
+    tmp_path = filepath.with_name(filepath.name + '.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            if not streaming:
+                json.dump(prod_list.to_list_dict(), f, indent=2, ensure_ascii=False)
+            else:
+                header = {'version': JSONL_VERSION, 'type': 'door_list',
+                          'format': JSONL_FORMAT, 'count': prod_list.door_count}
+                f.write(json.dumps(header, ensure_ascii=False) + '\n')
+                for entry in prod_list.iter_list_entries():
+                    f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def iter_door_list(filepath: Path) -> Iterator[dict]:
+    """Leser oppføringene (id, label, params) i en .kdl-fil én og én.
+
+    JSON Lines og binærfiler leses fortløpende; eldre JSON-filer leses i
+    sin helhet. Binærfiler gir bare 'params'.
+
+    Raises:
+        ValueError: Filen er ikke en dørliste eller har en ugyldig linje
+    """
+    if binary_format.is_binary_file(filepath):
+        for params in binary_format.iter_doors(filepath, binary_format.KIND_DOOR_LIST):
+            yield {'params': params}
+        return
+    with open(filepath, 'r', encoding='utf-8') as f:
+        first = f.readline()
+        try:
+            header = json.loads(first)
+        except json.JSONDecodeError:
+            header = None
+        if isinstance(header, dict) and header.get('format') == JSONL_FORMAT:
+            _check_type(header)
+            for line_no, line in enumerate(f, start=2):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Ugyldig linje {line_no} i dørliste: {e}") from e
+            return
+        f.seek(0)
+        data = json.load(f)
+    _check_type(data)
+    yield from data.get('doors', [])
 
 
 def load_door_list(filepath: Path, prod_list: ProductionList) -> int:
     """Importerer dører fra en .kdl-fil (adderer til eksisterende liste).
 
+    Dørene legges inn samlet med én oppdatering av listens cacher.
+
     Args:
         filepath: Sti til .kdl-filen
         prod_list: ProductionList å legge til i
@@ -32,10 +118,4 @@ def load_door_list(filepath: Path, prod_list: ProductionList) -> int:
     Returns:
         Antall importerte dører
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    if data.get('type') != 'door_list':
-        raise ValueError("Ugyldig filformat: forventet 'door_list'")
-
-    return prod_list.from_list_dict(data)
+    return prod_list.import_entries(iter_door_list(filepath))
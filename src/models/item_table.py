@@ -0,0 +1,166 @@
+"""
+Kolonnebasert komponenttabell for KIAS Dørkonfigurator.
+
+Lagrer produksjonskomponenter som NumPy-kolonner i stedet for én
+Python-objekt per komponent. Tekstfelter (komponent, farge, side,
+karmtype, karmfamilie, ordre-ref) lagres som kategorikoder, slik at
+gruppering og akkumulering kan gjøres som sortering + reduksjon over
+heltallskolonner. Beregnet for store produksjonskjøringer på tvers av
+mange prosjekter.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .kappeliste import KARM_FAMILY_GROUPS
+
+# Verdi for manglende mål (None) i heltallskolonnene
+MISSING = np.iinfo(np.int64).min
+
+NUMERIC_COLUMNS = ('antall', 'bredde', 'hoyde', 'lengde')
+CATEGORICAL_COLUMNS = ('komponent', 'farge', 'side', 'karm_type', 'family', 'ordre_ref')
+
+
+def _encode(values: Iterable, count: int) -> Tuple[np.ndarray, list]:
+    """Koder verdier som heltall i første-forekomst-rekkefølge."""
+    codes: Dict[object, int] = {}
+    array = np.fromiter((codes.setdefault(v, len(codes)) for v in values),
+                        dtype=np.int32, count=count)
+    return array, list(codes)
+
+
+class ItemTable:
+    """Kolonnebasert tabell over produksjonskomponenter.
+
+    Tallkolonner (antall, bredde, hoyde, lengde) er int64, med MISSING
+    for None. Kategorikolonner er int32-koder med tilhørende
+    verdiliste (categories).
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray],
+                 categories: Dict[str, list]):
+        self._columns = columns
+        self._categories = categories
+
+    @classmethod
+    def from_items(cls, items: Sequence) -> 'ItemTable':
+        """Bygger tabellen fra en liste med ProductionItem."""
+        n = len(items)
+        columns: Dict[str, np.ndarray] = {
+            'antall': np.fromiter((it.antall for it in items), dtype=np.int64, count=n),
+        }
+        for name in ('bredde', 'hoyde', 'lengde'):
+            columns[name] = np.fromiter(
+                (MISSING if v is None else v for v in (getattr(it, name) for it in items)),
+                dtype=np.int64, count=n,
+            )
+
+        categories: Dict[str, list] = {}
+        for name in ('komponent', 'farge', 'side', 'karm_type', 'ordre_ref'):
+            columns[name], categories[name] = _encode(
+                (getattr(it, name) for it in items), n)
+
+        # Karmfamilie avledes fra karmtype-kategoriene (ett oppslag per kategori)
+        families = [KARM_FAMILY_GROUPS.get(kt, kt) for kt in categories['karm_type']]
+        family_codes, categories['family'] = _encode(families, len(families))
+        columns['family'] = family_codes[columns['karm_type']] if n else family_codes
+        return cls(columns, categories)
+
+    @classmethod
+    def concat(cls, tables: Sequence['ItemTable']) -> 'ItemTable':
+        """Slår sammen flere tabeller (f.eks. fra flere prosjekter) til én.
+
+        Kategorikodene mappes om til en felles verdiliste.
+        """
+        columns: Dict[str, np.ndarray] = {}
+        categories: Dict[str, list] = {}
+        for name in NUMERIC_COLUMNS:
+            columns[name] = np.concatenate(
+                [t._columns[name] for t in tables] or [np.empty(0, np.int64)])
+        for name in CATEGORICAL_COLUMNS:
+            merged: Dict[object, int] = {}
+            parts = []
+            for t in tables:
+                remap = np.array([merged.setdefault(v, len(merged))
+                                  for v in t._categories[name]], dtype=np.int32)
+                parts.append(remap[t._columns[name]] if len(t) else t._columns[name])
+            columns[name] = np.concatenate(parts or [np.empty(0, np.int32)])
+            categories[name] = list(merged)
+        return cls(columns, categories)
+
+    def __len__(self) -> int:
+        return len(self._columns['antall'])
+
+    def column(self, name: str) -> np.ndarray:
+        """Returnerer en kolonne (koder for kategorikolonner)."""
+        return self._columns[name]
+
+    def categories(self, name: str) -> list:
+        """Returnerer verdilisten for en kategorikolonne."""
+        return self._categories[name]
+
+    def value(self, name: str, row: int):
+        """Returnerer dekodet verdi for én rad (None for manglende mål)."""
+        v = self._columns[name][row]
+        if name in self._categories:
+            return self._categories[name][v]
+        return None if v == MISSING else int(v)
+
+    def mask(self, name: str, values: Iterable) -> np.ndarray:
+        """Boolsk maske for rader der kategorikolonnen har en av verdiene."""
+        wanted = set(values)
+        codes = [i for i, v in enumerate(self._categories[name]) if v in wanted]
+        return np.isin(self._columns[name], codes)
+
+    def group_sum(self, keys: Sequence[str],
+                  where: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Grupperer på nøkkelkolonnene og summerer antall.
+
+        Args:
+            keys: Kolonnenavn som utgjør gruppenøkkelen
+            where: Valgfri boolsk maske for hvilke rader som tas med
+
+        Returns:
+            (rader, antall): første rad i hver gruppe og summert antall,
+            sortert etter første forekomst
+        """
+        rows = np.arange(len(self))
+        if where is not None:
+            rows = rows[where]
+        if len(rows) == 0:
+            return rows, np.empty(0, np.int64)
+
+        # np.lexsort bruker siste nøkkel som primær
+        key_cols = [self._columns[k][rows] for k in keys]
+        order = np.lexsort(key_cols[::-1]) if key_cols else np.arange(len(rows))
+        boundary = np.zeros(len(rows), dtype=bool)
+        boundary[0] = True
+        for col in key_cols:
+            sorted_col = col[order]
+            boundary[1:] |= sorted_col[1:] != sorted_col[:-1]
+        starts = np.flatnonzero(boundary)
+
+        sorted_rows = rows[order]
+        first = np.minimum.reduceat(sorted_rows, starts)
+        sums = np.add.reduceat(self._columns['antall'][sorted_rows], starts)
+        by_first = np.argsort(first, kind='stable')
+        return first[by_first], sums[by_first]
+
+    def totals(self, name: str) -> Dict[object, int]:
+        """Summert antall per verdi i en kategorikolonne."""
+        sums = np.bincount(self._columns[name], weights=self._columns['antall'],
+                           minlength=len(self._categories[name]))
+        return {v: int(s) for v, s in zip(self._categories[name], sums) if s}
+
+    def rows(self, indices: Iterable[int], names: Sequence[str]) -> List[tuple]:
+        """Dekoder valgte kolonner for gitte rader til tupler."""
+        index = np.fromiter(indices, dtype=np.intp)
+        decoded = []
+        for name in names:
+            col = self._columns[name][index].tolist()
+            cats = self._categories.get(name)
+            if cats is not None:
+                decoded.append([cats[c] for c in col])
+            else:
+                decoded.append([None if v == MISSING else v for v in col])
+        return list(zip(*decoded))
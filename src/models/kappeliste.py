@@ -0,0 +1,383 @@
+"""
+Inkrementell aggregering av kappeliste for KIAS Dørkonfigurator.
+
+Holder akkumulerte grupper (antall, V/H-telling, ordre-referanser,
+merknader, karmhylser og hengsler) for hele produksjonslisten.
+Når en dør endres trekkes dørens gamle komponenter fra og de nye
+legges til, slik at kun berørte seksjoner må sorteres på nytt.
+
+Resultatet avhenger bare av dørene og rekkefølgen deres, ikke av
+hvilke endringer som førte dit, og er det samme som en samlet
+gruppering av alle komponentene: rader med lik sorteringsnøkkel og
+merknader ordnes etter første forekomst (dør i listen, deretter
+komponent i døren).
+"""
+from itertools import groupby
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Karmtype-familier for kappeliste-gruppering
+KARM_FAMILY_GROUPS = {
+    'SD1': 'SD1_SD2',
+    'SD2': 'SD1_SD2',
+    'SD3/ID': 'SD3_ID',
+    'KD1': 'KD1_KD2',
+    'KD2': 'KD1_KD2',
+    'PD1': 'PD1_PD2',
+    'PD2': 'PD1_PD2',
+    'BD1': 'SD1_SD2',
+    'FD1': 'FD1_FD2',
+    'FD2': 'FD1_FD2',
+    'FD3': 'FD3',
+}
+
+KARM_FAMILY_TITLES = {
+    'SD1_SD2': 'Slagdørkarm Justerbar (SD1 og SD2)',
+    'SD3_ID': 'Slagdørkarm Justerbar (SD3/ID)',
+    'KD1_KD2': 'Kjøleromskarm (KD1 og KD2)',
+    'PD1_PD2': 'Pendeldørkarm (PD1 og PD2)',
+    'FD1_FD2': 'Fjøsdørkarm (FD1 og FD2)',
+    'FD3': 'Fjøsdørkarm (FD3)',
+}
+
+KARM_FAMILY_ORDER = ['SD1_SD2', 'SD3_ID', 'KD1_KD2', 'PD1_PD2', 'FD1_FD2', 'FD3']
+
+KARM_KOMPONENT_ORDER = ['Overligger', 'Hengselside', 'Sluttstykkeside']
+DIVERSE_KOMPONENT_ORDER = [
+    'Dekklist',
+    'Avviserbøyler',
+    'PC dørblad klar', 'PC dørblad sotet', 'PC dørblad opal',
+    'Sparkeplate i sort PC',
+    'Ryggforst. side', 'Ryggforst. overdel',
+]
+
+KARM_KOMPONENTER = {'Overligger', 'Hengselside', 'Sluttstykkeside'}
+DIVERSE_KOMPONENTER = set(DIVERSE_KOMPONENT_ORDER)
+
+# Seksjonsnøkler for dørramme og diverse (karm bruker familie-nøkkelen)
+_DORRAMME = 'DR'
+_DIVERSE = 'DIVERSE'
+
+
+def format_ordre_refs(counts: Dict[str, int]) -> str:
+    """Formaterer ordre-referanser med antall, f.eks. 'o1000(2), o1001(3)'."""
+    parts = []
+    for ref, count in sorted(counts.items()):
+        if ref:
+            parts.append(f"o{ref}({count})")
+    return ', '.join(parts)
+
+
+def format_vh(side_counts: Dict[str, int]) -> str:
+    """Formaterer V/H-telling for parentes, f.eks. '1V, 2H'."""
+    parts = []
+    if side_counts.get('V', 0):
+        parts.append(f"{side_counts['V']}V")
+    if side_counts.get('H', 0):
+        parts.append(f"{side_counts['H']}H")
+    return ', '.join(parts)
+
+
+def _bump(counts: dict, key, delta: int) -> None:
+    """Legger delta til en teller og fjerner nøkkelen når den når null."""
+    value = counts.get(key, 0) + delta
+    if value:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+class _Group:
+    """Akkumulert tilstand for én rad i kappelisten."""
+
+    __slots__ = ('items', 'total', 'sides', 'ordre', 'notes',
+                 'adjufix_sides', 'hinge_count_sides', 'doors')
+
+    def __init__(self):
+        self.items = 0            # Antall bidragende items (rad fjernes ved 0)
+        self.total = 0
+        self.sides: Dict[str, int] = {}
+        self.ordre: Dict[str, int] = {}
+        self.notes: Dict[str, Dict[str, int]] = {}   # Merknad → {dor_id → antall items}
+        self.adjufix_sides: Dict[str, int] = {}
+        self.hinge_count_sides: Dict[int, Dict[str, int]] = {}
+        # dor_id → [antall items, første item-posisjon i døren]
+        self.doors: Dict[str, List[int]] = {}
+
+
+class KappelisteAggregator:
+    """Persistent kappeliste-aggregering med per-dør delta-oppdatering.
+
+    Komponentene legges til med add_items() og trekkes fra med
+    remove_items(). Ferdige rader sorteres kun for seksjoner som er
+    endret siden forrige uthenting.
+
+    door_position gir dørens posisjon i listen (for rekkefølgen på like
+    rader og merknader). Når dører flyttes må aggregeringen bygges på nytt.
+    Komponentene til én dør må komme samlet og i dørens rekkefølge.
+    """
+
+    def __init__(self, door_position: Optional[Callable[[str], Optional[int]]] = None):
+        self._door_position = door_position
+        self._groups: Dict[str, Dict[tuple, _Group]] = {}
+        self._rows: Dict[str, List[dict]] = {}
+        self._dirty: set = set()
+
+    def clear(self) -> None:
+        """Tømmer all akkumulert tilstand."""
+        self._groups.clear()
+        self._rows.clear()
+        self._dirty.clear()
+
+    def add_items(self, items) -> None:
+        """Legger komponenter til i aggregeringen."""
+        self._apply_all(items, 1)
+
+    def remove_items(self, items) -> None:
+        """Trekker komponenter fra aggregeringen."""
+        self._apply_all(items, -1)
+
+    def _apply_all(self, items, sign: int) -> None:
+        dor_id = None
+        seq = 0
+        for item in items:
+            # Posisjonen i døren teller fra 0 for hver ny dør
+            if item.dor_id != dor_id:
+                dor_id = item.dor_id
+                seq = 0
+            self._apply(item, sign, seq)
+            seq += 1
+
+    # ------------------------------------------------------------------
+    # Delta-oppdatering
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _section_key(item) -> tuple[Optional[str], Optional[tuple]]:
+        """Returnerer (seksjon, gruppenøkkel) for en komponent, eller (None, None)."""
+        komponent = item.komponent
+        if komponent in KARM_KOMPONENTER:
+            family = KARM_FAMILY_GROUPS.get(item.karm_type, item.karm_type)
+            return family, (komponent, item.lengde, item.farge)
+        if komponent.startswith('DR'):
+            if item.bredde and item.hoyde:
+                mm_str = f"{item.bredde} x {item.hoyde}"
+            elif item.lengde:
+                mm_str = str(item.lengde)
+            else:
+                mm_str = ''
+            return _DORRAMME, (komponent, mm_str, item.farge or '')
+        if komponent in DIVERSE_KOMPONENTER:
+            return _DIVERSE, (komponent, item.bredde, item.hoyde,
+                              item.lengde, item.farge or '')
+        return None, None
+
+    def _apply(self, item, sign: int, seq: int = 0) -> None:
+        """Legger til (sign=1) eller trekker fra (sign=-1) ett item.
+
+        seq er itemets posisjon blant dørens komponenter.
+        """
+        section, key = self._section_key(item)
+        if section is None:
+            return
+
+        groups = self._groups.setdefault(section, {})
+        group = groups.get(key)
+        if group is None:
+            if sign < 0:
+                return
+            group = groups[key] = _Group()
+
+        antall = sign * item.antall
+        group.items += sign
+        group.total += antall
+        door = group.doors.get(item.dor_id)
+        if door is None:
+            group.doors[item.dor_id] = [1, seq]
+        else:
+            door[0] += sign
+            if door[0] <= 0:
+                del group.doors[item.dor_id]
+            elif sign > 0:
+                door[1] = min(door[1], seq)
+        _bump(group.ordre, item.ordre_ref, antall)
+
+        if section not in (_DORRAMME, _DIVERSE):
+            side_key = item.side if item.side in ('V', 'H') else 'none'
+            _bump(group.sides, side_key, antall)
+            if item.notes:
+                note_doors = group.notes.setdefault(item.notes, {})
+                _bump(note_doors, item.dor_id, sign)
+                if not note_doors:
+                    del group.notes[item.notes]
+            # Adjufix (for Hengselside og Sluttstykkeside)
+            if item.komponent in ('Hengselside', 'Sluttstykkeside') and item.adjufix:
+                _bump(group.adjufix_sides, item.side or 'none', antall)
+            # Hengsler > 2 (kun Hengselside)
+            if item.komponent == 'Hengselside' and item.hinge_count > 2:
+                hc_sides = group.hinge_count_sides.setdefault(item.hinge_count, {})
+                _bump(hc_sides, item.side or 'none', antall)
+                if not hc_sides:
+                    del group.hinge_count_sides[item.hinge_count]
+
+        if group.items <= 0:
+            del groups[key]
+            if not groups:
+                del self._groups[section]
+        self._dirty.add(section)
+
+    # ------------------------------------------------------------------
+    # Uthenting
+    # ------------------------------------------------------------------
+
+    def sections(self) -> List[dict]:
+        """Returnerer seksjoner for kappeliste-visning (karm + dørramme)."""
+        sections: List[dict] = []
+        for family_key in KARM_FAMILY_ORDER:
+            rows = self._section_rows(family_key)
+            if rows:
+                sections.append({
+                    'title': KARM_FAMILY_TITLES[family_key],
+                    'rows': rows,
+                })
+
+        rows = self._section_rows(_DORRAMME)
+        if rows:
+            sections.append({'title': 'Dørrammer', 'rows': rows})
+        return sections
+
+    def diverse_rows(self) -> List[dict]:
+        """Returnerer rader for diverse-tabellen."""
+        return self._section_rows(_DIVERSE)
+
+    def _section_rows(self, section: str) -> List[dict]:
+        """Henter (og ved behov bygger) sorterte rader for én seksjon."""
+        if section in self._dirty or section not in self._rows:
+            groups = self._groups.get(section, {})
+            if section == _DORRAMME:
+                rows = self._build_standard_rows(groups)
+            elif section == _DIVERSE:
+                rows = self._build_diverse_rows(groups)
+            else:
+                rows = self._build_karm_rows(groups)
+            self._rows[section] = rows
+            self._dirty.discard(section)
+        return self._rows[section]
+
+    def _first_position(self, group: _Group) -> Tuple[float, int]:
+        """(dørposisjon, item-posisjon) for gruppens første item i listen."""
+        position = self._door_position
+        if position is None:
+            return (0, 0)
+        first = (float('inf'), 0)
+        for dor_id, (_count, seq) in group.doors.items():
+            index = position(dor_id)
+            if index is not None and (index, seq) < first:
+                first = (index, seq)
+        return first
+
+    def _sorted_groups(self, groups: Dict[tuple, _Group], sort_key) -> List[tuple]:
+        """Gruppene sortert på sort_key; like nøkler i rekkefølge etter første item."""
+        entries = sorted(groups.items(), key=sort_key)
+        result = []
+        for _key, run in groupby(entries, key=sort_key):
+            run = list(run)
+            if len(run) > 1:
+                run.sort(key=lambda entry: self._first_position(entry[1]))
+            result.extend(run)
+        return result
+
+    def _ordered_notes(self, group: _Group) -> List[str]:
+        """Merknadene i gruppen, i rekkefølgen til første dør som har dem."""
+        position = self._door_position
+        if position is None:
+            return list(group.notes)
+
+        def first_door(note: str) -> tuple:
+            positions = (position(dor_id) for dor_id in group.notes[note])
+            return (min((p for p in positions if p is not None), default=float('inf')), note)
+        return sorted(group.notes, key=first_door)
+
+    def _build_karm_rows(self, groups: Dict[tuple, _Group]) -> List[dict]:
+        """Bygger karm-rader med V/H-telling og merknader."""
+        def sort_key(entry):
+            (komponent, lengde, farge) = entry[0]
+            order = (KARM_KOMPONENT_ORDER.index(komponent)
+                     if komponent in KARM_KOMPONENT_ORDER else 99)
+            return (order, lengde or 0)
+
+        rows = []
+        for (komponent, lengde, farge), group in self._sorted_groups(groups, sort_key):
+            slagretning = format_vh(group.sides)
+
+            # Bygg merknad
+            merknad_parts = []
+
+            # Karmhylser (Hengselside + Sluttstykkeside, ikke Overligger)
+            if group.adjufix_sides:
+                vh = format_vh(group.adjufix_sides)
+                merknad_parts.append(f'Karmhylser ({vh})')
+
+            # Hengsler > 2 (kun Hengselside)
+            for hc in sorted(group.hinge_count_sides):
+                vh = format_vh(group.hinge_count_sides[hc])
+                merknad_parts.append(f'{hc} hengsler ({vh})')
+
+            # GUI-merknader
+            merknad_parts.extend(self._ordered_notes(group))
+
+            rows.append({
+                'profilnavn': komponent,
+                'stk': group.total,
+                'mm': str(lengde) if lengde else '',
+                'slagretning': slagretning,
+                'farge': farge or '',
+                'ordre': format_ordre_refs(group.ordre),
+                'merknad': ', '.join(merknad_parts),
+            })
+        return rows
+
+    def _build_standard_rows(self, groups: Dict[tuple, _Group]) -> List[dict]:
+        """Bygger dørramme-rader sortert etter komponentnavn og mål."""
+        rows = []
+        for (komponent, mm_str, farge), group in self._sorted_groups(
+            groups, lambda entry: (entry[0][0], entry[0][1])
+        ):
+            rows.append({
+                'profilnavn': komponent,
+                'stk': group.total,
+                'mm': mm_str,
+                'slagretning': '',
+                'farge': farge,
+                'ordre': format_ordre_refs(group.ordre),
+                'merknad': '',
+            })
+        return rows
+
+    def _build_diverse_rows(self, groups: Dict[tuple, _Group]) -> List[dict]:
+        """Bygger diverse-rader sortert etter komponentrekkefølge og mål."""
+        def sort_key(entry):
+            (komponent, bredde, hoyde, lengde, farge) = entry[0]
+            # Alle PC dørblad-varianter sorteres samlet (order 2)
+            if komponent.startswith('PC dørblad'):
+                return (2, bredde or 0, hoyde or 0, komponent)
+            order = (DIVERSE_KOMPONENT_ORDER.index(komponent)
+                     if komponent in DIVERSE_KOMPONENT_ORDER else 99)
+            return (order, bredde or 0, hoyde or 0, lengde or 0)
+
+        rows = []
+        for (komponent, bredde, hoyde, lengde, farge), group in self._sorted_groups(
+            groups, sort_key
+        ):
+            b_mm = str(bredde) if bredde else (str(lengde) if lengde else '')
+            h_mm = str(hoyde) if hoyde else ''
+            rows.append({
+                'forklaring': komponent,
+                'stk': group.total,
+                'b_mm': b_mm,
+                'h_mm': h_mm,
+                'farge': farge,
+                'ordre': format_ordre_refs(group.ordre),
+                'merknad': '',
+            })
+        return rows
@@ -5,24 +5,27 @@ Håndterer samling av dører til en produksjonsliste med gruppering
 av like komponenter for kappeliste-generering.
 """
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterable, Iterator, Tuple
 from collections import defaultdict
+import sys
 import uuid
 
 from .door import DoorParams
 from ..doors import DOOR_REGISTRY
-from ..utils.calculations import (
-    karm_bredde, karm_hoyde,
-    dorblad_bredde, dorblad_hoyde,
-    terskel_lengde, dekklist_lengde,
-    laminat_mal, laminat_2_mal,
-)
+from ..utils.production_measures import production_measures
 from ..utils.constants import DOOR_TYPES, KARM_DISPLAY_NAMES
+from .kappeliste import KappelisteAggregator
+from .item_table import ItemTable
 
 
-@dataclass
+@dataclass(slots=True)
 class ProductionItem:
-    """En komponent i produksjonslisten."""
+    """En komponent i produksjonslisten.
+
+    Bruker __slots__ (ingen __dict__ per item), og gjentatte strenger
+    (komponent, farge, karmtype, ordre-ref) interneres slik at like
+    verdier deler ett objekt og sammenligninger i grupperingen går raskt.
+    """
     komponent: str           # "Overligger", "Hengselside", "Dørblad", etc.
     antall: int
     bredde: Optional[int] = None
@@ -38,19 +41,41 @@ class ProductionItem:
     adjufix: bool = False      # Adjufix karmhylser
     notes: str = ''            # Bruker-merknad fra GUI (DoorParams.notes)
 
+    def __post_init__(self):
+        self.komponent = sys.intern(self.komponent)
+        if self.farge:
+            self.farge = sys.intern(self.farge)
+        if self.karm_type:
+            self.karm_type = sys.intern(self.karm_type)
+        if self.ordre_ref:
+            self.ordre_ref = sys.intern(self.ordre_ref)
+
 
 @dataclass
 class ProductionDoor:
-    """En dør i produksjonslisten med unik ID."""
+    """En dør i produksjonslisten med unik ID.
+
+    Visningsnavnet genereres først når label leses, slik at masseimport
+    ikke bygger navn for dører som aldri vises.
+    """
     id: str
     params: DoorParams
-    label: str = ''  # Visningsnavn i listen
+    _label: str = field(default='', repr=False)  # '' = ikke generert ennå
 
     def __post_init__(self):
         if not self.id:
             self.id = str(uuid.uuid4())[:8]
-        if not self.label:
-            self.label = self._generate_label()
+
+    @property
+    def label(self) -> str:
+        """Visningsnavn i listen."""
+        if not self._label:
+            self._label = self._generate_label()
+        return self._label
+
+    @label.setter
+    def label(self, value: str) -> None:
+        self._label = value
 
     def _generate_label(self) -> str:
         """Genererer visningsnavn, f.eks. 'Innerdør - SD1 10x21'."""
@@ -62,40 +87,74 @@ class ProductionDoor:
         return f"{door_type_name} - {karm_display} {dm_w}x{dm_h}"
 
 
-# Karmtype-familier for kappeliste-gruppering
-KARM_FAMILY_GROUPS = {
-    'SD1': 'SD1_SD2',
-    'SD2': 'SD1_SD2',
-    'SD3/ID': 'SD3_ID',
-    'KD1': 'KD1_KD2',
-    'KD2': 'KD1_KD2',
-    'PD1': 'PD1_PD2',
-    'PD2': 'PD1_PD2',
-    'BD1': 'SD1_SD2',
-    'FD1': 'FD1_FD2',
-    'FD2': 'FD1_FD2',
-    'FD3': 'FD3',
-}
-
-KARM_FAMILY_TITLES = {
-    'SD1_SD2': 'Slagdørkarm Justerbar (SD1 og SD2)',
-    'SD3_ID': 'Slagdørkarm Justerbar (SD3/ID)',
-    'KD1_KD2': 'Kjøleromskarm (KD1 og KD2)',
-    'PD1_PD2': 'Pendeldørkarm (PD1 og PD2)',
-    'FD1_FD2': 'Fjøsdørkarm (FD1 og FD2)',
-    'FD3': 'Fjøsdørkarm (FD3)',
-}
-
-KARM_FAMILY_ORDER = ['SD1_SD2', 'SD3_ID', 'KD1_KD2', 'PD1_PD2', 'FD1_FD2', 'FD3']
-
-KARM_KOMPONENT_ORDER = ['Overligger', 'Hengselside', 'Sluttstykkeside']
-DIVERSE_KOMPONENT_ORDER = [
-    'Dekklist',
-    'Avviserbøyler',
-    'PC dørblad klar', 'PC dørblad sotet', 'PC dørblad opal',
-    'Sparkeplate i sort PC',
-    'Ryggforst. side', 'Ryggforst. overdel',
-]
+# Maks antall poster i endringsloggen (se ProductionList.changes_since)
+CHANGE_LOG_SIZE = 10000
+
+# DoorParams-felter som ikke brukes i produksjonskomponentene
+_ITEM_IGNORED_FIELDS = frozenset({'project_id', 'created_date', 'modified_date', 'wall_color'})
+
+
+def _params_signature(params: DoorParams) -> tuple:
+    """Signatur av DoorParams-feltene som påvirker produksjonskomponentene.
+
+    Endringer i rene metadata-felter (datoer, prosjekt-ID, veggfarge)
+    gir samme signatur, så dørens komponenter gjenbrukes.
+    """
+    return tuple(value for key, value in params.to_dict().items()
+                 if key not in _ITEM_IGNORED_FIELDS)
+
+
+class _ItemOffsets:
+    """Prefikssummer over antall komponenter per dør (Fenwick-tre).
+
+    Gir startposisjonen til en dørs komponenter i den flate listen og
+    oppdaterer et endret antall i O(log n). Fjerning midt i listen
+    bygger treet på nytt.
+    """
+
+    def __init__(self, counts: Iterable[int] = ()):
+        self.rebuild(counts)
+
+    def rebuild(self, counts: Iterable[int]) -> None:
+        self._counts = list(counts)
+        n = len(self._counts)
+        tree = [0] * (n + 1)
+        for i, count in enumerate(self._counts, start=1):
+            tree[i] += count
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def offset(self, index: int) -> int:
+        """Summen av antallene før posisjon index."""
+        total = 0
+        tree = self._tree
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def append(self, count: int) -> None:
+        self._counts.append(count)
+        i = len(self._counts)
+        # Node i dekker posisjonene (i - lavbit, i]
+        self._tree.append(count + self.offset(i - 1) - self.offset(i - (i & -i)))
+
+    def set(self, index: int, count: int) -> None:
+        delta = count - self._counts[index]
+        if not delta:
+            return
+        self._counts[index] = count
+        tree = self._tree
+        i = index + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def delete(self, index: int) -> None:
+        del self._counts[index]
+        self.rebuild(self._counts)
 
 
 class ProductionList:
@@ -104,6 +163,20 @@ class ProductionList:
     def __init__(self):
         self._doors: List[ProductionDoor] = []
         self._items_cache: Optional[List[ProductionItem]] = None
+        # Per-dør cache: {door_id: (params-signatur, items)}
+        self._door_items: Dict[str, Tuple[tuple, List[ProductionItem]]] = {}
+        # Startposisjon per dør i _items_cache, synkron med _items_cache
+        self._item_offsets = _ItemOffsets()
+        # Oppslag door_id → posisjon i self._doors
+        self._index: Dict[str, int] = {}
+        # Kappeliste-aggregering, synkron med _items_cache når den er bygd
+        self._aggregator = KappelisteAggregator(self._index.get)
+        # Kolonnebasert tabell over _items_cache, bygges ved behov
+        self._item_table: Optional[ItemTable] = None
+        # Endringslogg for visninger (se changes_since); _changes_base er
+        # revisjonen før første post i loggen
+        self._changes: List[tuple] = []
+        self._changes_base = 0
 
     @property
     def doors(self) -> List[ProductionDoor]:
@@ -115,6 +188,35 @@ class ProductionList:
         """Antall dører i listen."""
         return len(self._doors)
 
+    @property
+    def revision(self) -> int:
+        """Øker ved hver endring av dørene eller rekkefølgen deres."""
+        return self._changes_base + len(self._changes)
+
+    def changes_since(self, revision: int) -> Optional[List[tuple]]:
+        """Endringer etter gitt revisjon, eldste først.
+
+        Poster: ('insert', start, [ids]), ('remove', index, id),
+        ('move', old_index, new_index, id), ('update', index, id) og
+        ('reset',). Indeksene gjelder listen slik den var da endringen
+        ble gjort.
+
+        Returns:
+            Listen med endringer, eller None hvis revisjonen er eldre enn
+            loggen (mottakeren må da lese hele listen på nytt)
+        """
+        offset = revision - self._changes_base
+        if offset < 0 or offset > len(self._changes):
+            return None
+        return self._changes[offset:]
+
+    def _log_change(self, *change) -> None:
+        self._changes.append(change)
+        if len(self._changes) > CHANGE_LOG_SIZE:
+            drop = len(self._changes) - CHANGE_LOG_SIZE // 2
+            del self._changes[:drop]
+            self._changes_base += drop
+
     def add_door(self, door: DoorParams) -> str:
         """Legger til en dør i produksjonslisten.
 
@@ -125,10 +227,53 @@ class ProductionList:
             ID for den tillagte døren
         """
         prod_door = ProductionDoor(id='', params=door)
+        self._index[prod_door.id] = len(self._doors)
+        self._log_change('insert', len(self._doors), [prod_door.id])
         self._doors.append(prod_door)
-        self._items_cache = None  # Invalider cache
+        self._item_table = None
+        if self._items_cache is not None:
+            new_items = self._items_for_door(prod_door)
+            self._items_cache.extend(new_items)
+            self._item_offsets.append(len(new_items))
+            self._aggregator.add_items(new_items)
         return prod_door.id
 
+    def add_doors(self, doors: Iterable[DoorParams]) -> List[str]:
+        """Legger til flere dører med én oppdatering av cachene.
+
+        Hele sekvensen leses før listen endres, slik at en feil underveis
+        (f.eks. i en generator som leser fra fil) ikke gir halv import.
+        Indeks, komponent-cache og kappeliste-aggregering oppdateres én
+        gang for hele sekvensen, og visningsnavn lages først ved bruk.
+
+        Args:
+            doors: DoorParams-objekter (kan være en generator)
+
+        Returns:
+            ID-er for de tillagte dørene, i samme rekkefølge
+        """
+        new_doors = [ProductionDoor(id='', params=door) for door in doors]
+        if not new_doors:
+            return []
+        start = len(self._doors)
+        self._doors.extend(new_doors)
+        self._reindex(start)
+        self._log_change('insert', start, [door.id for door in new_doors])
+        self._item_table = None
+        if self._items_cache is not None:
+            new_items = []
+            for door in new_doors:
+                door_items = self._items_for_door(door)
+                new_items.extend(door_items)
+                self._item_offsets.append(len(door_items))
+            self._items_cache.extend(new_items)
+            self._aggregator.add_items(new_items)
+        return [door.id for door in new_doors]
+
+    def extend(self, doors: Iterable[DoorParams]) -> List[str]:
+        """Samme som add_doors (navngitt som list.extend)."""
+        return self.add_doors(doors)
+
     def remove_door(self, door_id: str) -> bool:
         """Fjerner en dør fra listen.
 
@@ -138,19 +283,63 @@ class ProductionList:
         Returns:
             True hvis døren ble fjernet, False ellers
         """
-        for i, door in enumerate(self._doors):
-            if door.id == door_id:
-                del self._doors[i]
-                self._items_cache = None  # Invalider cache
-                return True
-        return False
+        i = self._index.get(door_id)
+        if i is None:
+            return False
+        self._item_table = None
+        if self._items_cache is not None:
+            start = self._item_offsets.offset(i)
+            old_items = self._door_items[door_id][1]
+            del self._items_cache[start:start + len(old_items)]
+            self._item_offsets.delete(i)
+            self._aggregator.remove_items(old_items)
+        self._door_items.pop(door_id, None)
+        del self._doors[i]
+        del self._index[door_id]
+        self._reindex(i)
+        self._log_change('remove', i, door_id)
+        return True
 
     def get_door(self, door_id: str) -> Optional[ProductionDoor]:
         """Henter en dør etter ID."""
-        for door in self._doors:
-            if door.id == door_id:
-                return door
-        return None
+        i = self._index.get(door_id)
+        if i is None:
+            return None
+        return self._doors[i]
+
+    def index_of(self, door_id: str) -> Optional[int]:
+        """Returnerer dørens posisjon i listen, eller None hvis den ikke finnes."""
+        return self._index.get(door_id)
+
+    def move_door(self, door_id: str, new_index: int) -> bool:
+        """Flytter en dør til en ny posisjon i listen.
+
+        Args:
+            door_id: ID for døren som skal flyttes
+            new_index: Ny posisjon (begrenses til gyldig område)
+
+        Returns:
+            True hvis døren ble flyttet, False ellers
+        """
+        old_index = self._index.get(door_id)
+        if old_index is None:
+            return False
+        new_index = max(0, min(new_index, len(self._doors) - 1))
+        if new_index == old_index:
+            return True
+        door = self._doors.pop(old_index)
+        self._doors.insert(new_index, door)
+        self._reindex(min(old_index, new_index))
+        self._log_change('move', old_index, new_index, door_id)
+        # Rekkefølgen i den flate listen endres; per-dør cache gjenbrukes
+        self._items_cache = None
+        self._item_table = None
+        return True
+
+    def _reindex(self, start: int = 0) -> None:
+        """Oppdaterer indeks-oppslaget fra og med gitt posisjon."""
+        for i in range(start, len(self._doors)):
+            self._index[self._doors[i].id] = i
 
     def update_door(self, door_id: str, params: DoorParams) -> bool:
         """Oppdaterer parametere for en eksisterende dør.
@@ -162,32 +351,52 @@ class ProductionList:
         Returns:
             True hvis døren ble oppdatert, False ellers
         """
-        for door in self._doors:
-            if door.id == door_id:
-                door.params = params
-                door.label = door._generate_label()
-                self._items_cache = None
-                return True
-        return False
+        i = self._index.get(door_id)
+        if i is None:
+            return False
+        door = self._doors[i]
+        door.params = params
+        door.label = ''  # Genereres på nytt ved neste oppslag
+        self._log_change('update', i, door_id)
+        if self._items_cache is not None:
+            # Patch kun denne dørens del av den flate listen og aggregeringen
+            old_items = self._door_items[door_id][1]
+            new_items = self._items_for_door(door)
+            if new_items is old_items:
+                return True  # Kun metadata endret – komponentene er uendret
+            start = self._item_offsets.offset(i)
+            self._items_cache[start:start + len(old_items)] = new_items
+            self._item_offsets.set(i, len(new_items))
+            self._item_table = None
+            self._aggregator.remove_items(old_items)
+            self._aggregator.add_items(new_items)
+        return True
 
     def clear(self) -> None:
         """Tømmer hele produksjonslisten."""
         self._doors.clear()
         self._items_cache = None
+        self._item_table = None
+        self._door_items.clear()
+        self._index.clear()
+        self._aggregator.clear()
+        self._log_change('reset')
+
+    def iter_list_entries(self) -> Iterator[dict]:
+        """Gir én .kdl-oppføring (id, label, params) per dør."""
+        for d in self._doors:
+            yield {
+                'id': d.id,
+                'label': d.label,
+                'params': d.params.to_dict(),
+            }
 
     def to_list_dict(self) -> dict:
         """Serialiserer hele dørlisten til dict for .kdl-eksport."""
         return {
             'version': '1.0',
             'type': 'door_list',
-            'doors': [
-                {
-                    'id': d.id,
-                    'label': d.label,
-                    'params': d.params.to_dict(),
-                }
-                for d in self._doors
-            ],
+            'doors': list(self.iter_list_entries()),
         }
 
     def from_list_dict(self, data: dict) -> int:
@@ -199,13 +408,20 @@ class ProductionList:
         Returns:
             Antall importerte dører
         """
-        doors = data.get('doors', [])
-        count = 0
-        for entry in doors:
-            params = DoorParams.from_dict(entry.get('params', {}))
-            self.add_door(params)
-            count += 1
-        return count
+        return self.import_entries(data.get('doors', []))
+
+    def import_entries(self, entries: Iterable[dict]) -> int:
+        """Importerer .kdl-oppføringer (adderer til eksisterende liste).
+
+        Args:
+            entries: Oppføringer med 'params' (kan være en generator)
+
+        Returns:
+            Antall importerte dører
+        """
+        return len(self.add_doors(
+            DoorParams.from_dict(entry.get('params', {})) for entry in entries
+        ))
 
     def get_all_items(self) -> List[ProductionItem]:
         """Henter alle produksjonskomponenter fra alle dører.
@@ -216,9 +432,29 @@ class ProductionList:
         if self._items_cache is not None:
             return self._items_cache
         items: List[ProductionItem] = []
+        counts: List[int] = []
         for door in self._doors:
-            items.extend(self._build_items_for_door(door))
+            door_items = self._items_for_door(door)
+            items.extend(door_items)
+            counts.append(len(door_items))
         self._items_cache = items
+        self._item_offsets.rebuild(counts)
+        self._aggregator.clear()
+        self._aggregator.add_items(items)
+        return items
+
+    def _items_for_door(self, door: ProductionDoor) -> List[ProductionItem]:
+        """Henter komponenter for én dør fra per-dør cache.
+
+        Komponentene beregnes kun på nytt når dørens parametere er endret
+        siden forrige beregning.
+        """
+        signature = _params_signature(door.params)
+        cached = self._door_items.get(door.id)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        items = self._build_items_for_door(door)
+        self._door_items[door.id] = (signature, items)
         return items
 
     def _build_items_for_door(self, door: ProductionDoor) -> List[ProductionItem]:
@@ -227,10 +463,10 @@ class ProductionList:
         karm_type = p.karm_type
         hinge_type = p.hinge_type
         floyer = p.floyer
-        luftspalte = p.effective_luftspalte()
+        m = production_measures(p)
 
-        karm_b = karm_bredde(karm_type, p.width, adjufix=p.adjufix)
-        karm_h = karm_hoyde(karm_type, p.height)
+        karm_b = m.karm_bredde
+        karm_h = m.karm_hoyde
 
         # Slagretning: left → hengsler på venstre side
         if p.swing_direction == 'left':
@@ -288,18 +524,8 @@ class ProductionList:
 
         # --- Dørblad-mål ---
         door_def = DOOR_REGISTRY.get(p.door_type, {})
-        db_b_total = dorblad_bredde(karm_type, karm_b, floyer, hinge_type, door_type=p.door_type)
-        db_h = dorblad_hoyde(karm_type, karm_h, floyer, hinge_type, luftspalte, door_type=p.door_type)
-
-        if floyer == 2 and db_b_total:
-            split_pct = p.floyer_split / 100.0
-            db1_b = round(db_b_total * split_pct)
-            db2_b = db_b_total - db1_b
-            blade_widths = [db1_b, db2_b]
-        elif db_b_total:
-            blade_widths = [db_b_total]
-        else:
-            blade_widths = []
+        db_h = m.dorblad_hoyde
+        blade_widths = m.blad_bredder
 
         # --- Dørramme (betinget på har_dorramme) ---
         har_dorramme = door_def.get('har_dorramme', True)
@@ -319,9 +545,8 @@ class ProductionList:
                     ))
 
         # --- Laminat ---
-        for bw in blade_widths:
+        for (lam_b, lam_h), (lam2_b, lam2_h) in zip(m.laminat, m.laminat_2):
             if db_h:
-                lam_b, lam_h = laminat_mal(karm_type, bw, db_h, hinge_type, door_type=p.door_type)
                 if lam_b and lam_h:
                     items.append(ProductionItem(
                         komponent='Laminat 1', antall=2,
@@ -329,7 +554,6 @@ class ProductionList:
                         farge=p.color, dor_id=door.id, karm_type=karm_type,
                         ordre_ref=p.customer,
                     ))
-                    lam2_b, lam2_h = laminat_2_mal(karm_type, lam_b, lam_h)
                     if lam2_b and lam2_h:
                         items.append(ProductionItem(
                             komponent='Laminat 2', antall=2,
@@ -402,7 +626,7 @@ class ProductionList:
         # --- Tilbehør ---
         # Terskel (kun hvis type ≠ 'ingen')
         if p.threshold_type != 'ingen':
-            t_lengde = terskel_lengde(karm_type, karm_b, floyer)
+            t_lengde = m.terskel_lengde
             if t_lengde:
                 items.append(ProductionItem(
                     komponent='Terskel', antall=1, lengde=t_lengde,
@@ -412,7 +636,7 @@ class ProductionList:
 
         # Dekklist (kun SDI 2-fløyet)
         if floyer == 2 and p.door_type == 'SDI':
-            dk_lengde = dekklist_lengde(karm_h)
+            dk_lengde = m.dekklist_lengde
             items.append(ProductionItem(
                 komponent='Dekklist', antall=1, lengde=dk_lengde,
                 farge=p.karm_color, dor_id=door.id, karm_type=karm_type,
@@ -622,6 +846,16 @@ class ProductionList:
 
         return items
 
+    def get_item_table(self) -> ItemTable:
+        """Henter alle komponenter som kolonnebasert tabell.
+
+        Tabellen bygges fra get_all_items() og gjenbrukes til listen endres.
+        """
+        items = self.get_all_items()
+        if self._item_table is None:
+            self._item_table = ItemTable.from_items(items)
+        return self._item_table
+
     def get_grouped_items(self) -> Dict[str, Dict[str, List[ProductionItem]]]:
         """Grupperer komponenter for kappeliste.
 
@@ -630,62 +864,34 @@ class ProductionList:
         2. Komponenttype (Overligger, Hengselside, Dørblad, etc.)
         3. Like mål og farge akkumuleres
 
-        Returns:
-            Nested dict: {karm_type: {komponent: [items]}}
-        """
-        items = self.get_all_items()
-
-        # Grupper etter karmtype og komponent
-        grouped: Dict[str, Dict[str, List[ProductionItem]]] = defaultdict(
-            lambda: defaultdict(list)
-        )
-
-        for item in items:
-            grouped[item.karm_type][item.komponent].append(item)
-
-        # Akkumuler like komponenter innen hver gruppe
-        result = {}
-        for karm_type, komponent_dict in grouped.items():
-            result[karm_type] = {}
-            for komponent, items_list in komponent_dict.items():
-                result[karm_type][komponent] = self._accumulate_items(items_list)
-
-        return result
-
-    def _accumulate_items(self, items: List[ProductionItem]) -> List[ProductionItem]:
-        """Akkumulerer like komponenter.
-
-        Komponenter med samme mål, farge og side slås sammen.
-
-        Args:
-            items: Liste med ProductionItem
+        Grupperingen kjøres som sortering + reduksjon over den
+        kolonnebaserte tabellen (se get_item_table()).
 
         Returns:
-            Liste med akkumulerte ProductionItem
+            Nested dict: {karm_type: {komponent: [items]}}
         """
-        # Bruk tuple av (bredde, hoyde, lengde, farge, side) som nøkkel
-        accumulated: Dict[tuple, ProductionItem] = {}
-
-        for item in items:
-            key = (item.bredde, item.hoyde, item.lengde, item.farge, item.side)
-
-            if key in accumulated:
-                accumulated[key].antall += item.antall
-            else:
-                # Lag kopi uten dor_id (siden vi akkumulerer på tvers av dører)
-                new_item = ProductionItem(
-                    komponent=item.komponent,
-                    antall=item.antall,
-                    bredde=item.bredde,
-                    hoyde=item.hoyde,
-                    lengde=item.lengde,
-                    farge=item.farge,
-                    side=item.side,
-                    karm_type=item.karm_type,
+        table = self.get_item_table()
+        names = ('karm_type', 'komponent', 'bredde', 'hoyde', 'lengde', 'farge', 'side')
+        first, sums = table.group_sum(names)
+
+        # Gruppene kommer i første-forekomst-rekkefølge, som ved akkumulering per item
+        result: Dict[str, Dict[str, List[ProductionItem]]] = {}
+        for (karm_type, komponent, bredde, hoyde, lengde, farge, side), antall in zip(
+            table.rows(first, names), sums.tolist()
+        ):
+            result.setdefault(karm_type, {}).setdefault(komponent, []).append(
+                ProductionItem(
+                    komponent=komponent,
+                    antall=antall,
+                    bredde=bredde,
+                    hoyde=hoyde,
+                    lengde=lengde,
+                    farge=farge,
+                    side=side,
+                    karm_type=karm_type,
                 )
-                accumulated[key] = new_item
-
-        return list(accumulated.values())
+            )
+        return result
 
     def get_summary(self) -> Dict[str, int]:
         """Henter oppsummering av produksjonslisten.
@@ -703,54 +909,14 @@ class ProductionList:
 
         Grupperer produksjonskomponenter etter karmtype-familie
         og akkumulerer like komponenter med V/H-telling.
+        Aggregeringen oppdateres inkrementelt per dør, så kun
+        seksjoner berørt av siste endring sorteres på nytt.
 
         Returns:
             Liste med seksjoner, hver med 'title' og 'rows'
         """
-        items = self.get_all_items()
-        if not items:
-            return []
-
-        sections: List[dict] = []
-
-        # Kategoriser items (kun karm + dørramme i hovedtabellen)
-        karm_komps = {'Overligger', 'Hengselside', 'Sluttstykkeside'}
-
-        karm_items = [i for i in items if i.komponent in karm_komps]
-        dorramme_items = [i for i in items if i.komponent.startswith('DR')]
-
-        # Grupper karm etter familie
-        karm_by_family: Dict[str, List[ProductionItem]] = defaultdict(list)
-        for item in karm_items:
-            family = KARM_FAMILY_GROUPS.get(item.karm_type, item.karm_type)
-            karm_by_family[family].append(item)
-
-        for family_key in KARM_FAMILY_ORDER:
-            family_items = karm_by_family.get(family_key)
-            if not family_items:
-                continue
-            rows = self._accumulate_karm_items(family_items)
-            sections.append({
-                'title': KARM_FAMILY_TITLES[family_key],
-                'rows': rows,
-            })
-
-        # Dørramme (alle karmtyper samlet, sortert etter komponentnavn)
-        if dorramme_items:
-            dr_order = sorted({i.komponent for i in dorramme_items})
-            rows = self._accumulate_standard_items(dorramme_items, dr_order)
-            sections.append({'title': 'Dørrammer', 'rows': rows})
-
-        return sections
-
-    @staticmethod
-    def _format_ordre_refs(counts: Dict[str, int]) -> str:
-        """Formaterer ordre-referanser med antall, f.eks. 'o1000(2), o1001(3)'."""
-        parts = []
-        for ref, count in sorted(counts.items()):
-            if ref:
-                parts.append(f"o{ref}({count})")
-        return ', '.join(parts)
+        self.get_all_items()  # Sørger for at aggregeringen er bygd
+        return self._aggregator.sections()
 
     def get_diverse_rows(self) -> List[dict]:
         """Returnerer rader for diverse-tabellen (separat fra hovedtabellen).
@@ -758,199 +924,8 @@ class ProductionList:
         Returns:
             Liste med rader, hver med 'forklaring', 'stk', 'b_mm', 'h_mm', 'farge', 'ordre'
         """
-        items = self.get_all_items()
-        if not items:
-            return []
-
-        diverse_komps = {'Dekklist', 'Avviserbøyler',
-                         'PC dørblad klar', 'PC dørblad sotet', 'PC dørblad opal',
-                         'Sparkeplate i sort PC',
-                         'Ryggforst. side', 'Ryggforst. overdel'}
-        diverse_items = [i for i in items if i.komponent in diverse_komps]
-        if not diverse_items:
-            return []
-
-        # Grupper på (komponent, bredde, hoyde, lengde, farge)
-        groups: Dict[tuple, int] = defaultdict(int)
-        ordre_counts: Dict[tuple, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        for item in diverse_items:
-            key = (item.komponent, item.bredde, item.hoyde,
-                   item.lengde, item.farge or '')
-            groups[key] += item.antall
-            ordre_counts[key][item.ordre_ref] += item.antall
-
-        def sort_key(entry):
-            (komponent, bredde, hoyde, lengde, farge) = entry[0]
-            # Alle PC dørblad-varianter sorteres samlet (order 2)
-            if komponent.startswith('PC dørblad'):
-                return (2, bredde or 0, hoyde or 0, komponent)
-            order = (DIVERSE_KOMPONENT_ORDER.index(komponent)
-                     if komponent in DIVERSE_KOMPONENT_ORDER else 99)
-            return (order, bredde or 0, hoyde or 0, lengde or 0)
-
-        rows = []
-        for (komponent, bredde, hoyde, lengde, farge), total in sorted(
-            groups.items(), key=sort_key
-        ):
-            key = (komponent, bredde, hoyde, lengde, farge)
-            b_mm = str(bredde) if bredde else (str(lengde) if lengde else '')
-            h_mm = str(hoyde) if hoyde else ''
-            rows.append({
-                'forklaring': komponent,
-                'stk': total,
-                'b_mm': b_mm,
-                'h_mm': h_mm,
-                'farge': farge,
-                'ordre': self._format_ordre_refs(ordre_counts[key]),
-                'merknad': '',
-            })
-
-        return rows
-
-    @staticmethod
-    def _format_vh(side_counts: Dict[str, int]) -> str:
-        """Formaterer V/H-telling for parentes, f.eks. '1V, 2H'."""
-        parts = []
-        if side_counts.get('V', 0):
-            parts.append(f"{side_counts['V']}V")
-        if side_counts.get('H', 0):
-            parts.append(f"{side_counts['H']}H")
-        return ', '.join(parts)
-
-    def _accumulate_karm_items(self, items: List[ProductionItem]) -> List[dict]:
-        """Akkumulerer karm-items med V/H-telling.
-
-        Grupperer på (komponent, lengde, farge) og teller V/H separat.
-        Merknad viser:
-        - Karmhylser (xV, yH) på Hengselside/Sluttstykkeside ved Argenta
-        - X hengsler (xV, yH) på Hengselside ved hinge_count > 2
-        - GUI-merknader (notes) på alle karm-items
-        """
-        groups: Dict[tuple, Dict[str, int]] = defaultdict(
-            lambda: {'V': 0, 'H': 0, 'none': 0}
-        )
-        ordre_counts: Dict[tuple, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        notes_per_group: Dict[tuple, list] = defaultdict(list)
-        # Adjufix-sporing per gruppe: {key → {side → antall}}
-        adjufix_sides: Dict[tuple, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        # Hengsel-antall sporing: {key → {hinge_count → {side → antall}}}
-        hinge_count_sides: Dict[tuple, Dict[int, Dict[str, int]]] = defaultdict(
-            lambda: defaultdict(lambda: defaultdict(int))
-        )
-
-        for item in items:
-            key = (item.komponent, item.lengde, item.farge)
-            side_key = item.side or 'none'
-            if item.side == 'V':
-                groups[key]['V'] += item.antall
-            elif item.side == 'H':
-                groups[key]['H'] += item.antall
-            else:
-                groups[key]['none'] += item.antall
-            ordre_counts[key][item.ordre_ref] += item.antall
-            if item.notes and item.notes not in notes_per_group[key]:
-                notes_per_group[key].append(item.notes)
-            # Spor Adjufix (for Hengselside og Sluttstykkeside)
-            if item.komponent in ('Hengselside', 'Sluttstykkeside'):
-                if item.adjufix:
-                    adjufix_sides[key][side_key] += item.antall
-            # Spor hengsler > 2 (kun Hengselside)
-            if item.komponent == 'Hengselside' and item.hinge_count > 2:
-                hinge_count_sides[key][item.hinge_count][side_key] += item.antall
-
-        def sort_key(entry):
-            (komponent, lengde, farge) = entry[0]
-            order = (KARM_KOMPONENT_ORDER.index(komponent)
-                     if komponent in KARM_KOMPONENT_ORDER else 99)
-            return (order, lengde or 0)
-
-        rows = []
-        for (komponent, lengde, farge), counts in sorted(
-            groups.items(), key=sort_key
-        ):
-            key = (komponent, lengde, farge)
-            total = counts['V'] + counts['H'] + counts['none']
-            parts = []
-            if counts['V']:
-                parts.append(f"{counts['V']}V")
-            if counts['H']:
-                parts.append(f"{counts['H']}H")
-            slagretning = ', '.join(parts)
-
-            # Bygg merknad
-            merknad_parts = []
-
-            # Karmhylser (Hengselside + Sluttstykkeside, ikke Overligger)
-            if key in adjufix_sides:
-                vh = self._format_vh(adjufix_sides[key])
-                merknad_parts.append(f'Karmhylser ({vh})')
-
-            # Hengsler > 2 (kun Hengselside)
-            if key in hinge_count_sides:
-                for hc in sorted(hinge_count_sides[key]):
-                    vh = self._format_vh(hinge_count_sides[key][hc])
-                    merknad_parts.append(f'{hc} hengsler ({vh})')
-
-            # GUI-merknader
-            merknad_parts.extend(notes_per_group[key])
-
-            merknad = ', '.join(merknad_parts)
-
-            rows.append({
-                'profilnavn': komponent,
-                'stk': total,
-                'mm': str(lengde) if lengde else '',
-                'slagretning': slagretning,
-                'farge': farge or '',
-                'ordre': self._format_ordre_refs(ordre_counts[key]),
-                'merknad': merknad,
-            })
-
-        return rows
-
-    def _accumulate_standard_items(
-        self, items: List[ProductionItem], komponent_order: list
-    ) -> List[dict]:
-        """Akkumulerer standard-items (dørramme, diverse).
-
-        Grupperer på (komponent, mål-streng, farge) og summerer antall.
-        """
-        groups: Dict[tuple, int] = defaultdict(int)
-        ordre_counts: Dict[tuple, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-
-        for item in items:
-            if item.bredde and item.hoyde:
-                mm_str = f"{item.bredde} x {item.hoyde}"
-            elif item.lengde:
-                mm_str = str(item.lengde)
-            else:
-                mm_str = ''
-            key = (item.komponent, mm_str, item.farge or '')
-            groups[key] += item.antall
-            ordre_counts[key][item.ordre_ref] += item.antall
-
-        def sort_key(entry):
-            (komponent, mm_str, farge) = entry[0]
-            order = (komponent_order.index(komponent)
-                     if komponent in komponent_order else 99)
-            return (order, mm_str)
-
-        rows = []
-        for (komponent, mm_str, farge), total in sorted(
-            groups.items(), key=sort_key
-        ):
-            key = (komponent, mm_str, farge)
-            rows.append({
-                'profilnavn': komponent,
-                'stk': total,
-                'mm': mm_str,
-                'slagretning': '',
-                'farge': farge,
-                'ordre': self._format_ordre_refs(ordre_counts[key]),
-                'merknad': '',
-            })
-
-        return rows
+        self.get_all_items()  # Sørger for at aggregeringen er bygd
+        return self._aggregator.diverse_rows()
 
 
 # Global produksjonsliste (singleton for enkel tilgang)
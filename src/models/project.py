@@ -1,24 +1,29 @@
 """
 Prosjektfil lagring og lasting.
-Filformat: JSON med .kdf utvidelse (KIAS Door File)
+Filformat: JSON med .kdf utvidelse (KIAS Door File), eller det kompakte
+binærformatet i binary_format (gjenkjennes automatisk ved lasting).
 """
 import json
 from pathlib import Path
 from datetime import datetime
 
 from .door import DoorParams
+from . import binary_format
 
 PROJECT_FILE_VERSION = "1.0"
 PROJECT_EXTENSION = ".kdf"
 
 
-def save_project(door: DoorParams, filepath: Path | str) -> None:
+def save_project(door: DoorParams, filepath: Path | str, binary: bool = False,
+                 compression: str = binary_format.COMPRESSION_ZLIB) -> None:
     """
     Lagrer dørkonfigurasjon til en .kdf fil.
 
     Args:
         door: DoorParams instans
         filepath: Sti til fil (legger til .kdf hvis mangler)
+        binary: Lagre i kompakt binærformat i stedet for JSON
+        compression: Komprimering for binærformatet
     """
     filepath = Path(filepath)
     if not str(filepath).endswith(PROJECT_EXTENSION):
@@ -35,6 +40,11 @@ def save_project(door: DoorParams, filepath: Path | str) -> None:
     # Opprett mappe hvis den ikke finnes
     filepath.parent.mkdir(parents=True, exist_ok=True)
 
+    if binary:
+        binary_format.write_doors(filepath, binary_format.KIND_PROJECT,
+                                  [data["door"]], compression)
+        return
+
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
@@ -58,8 +68,12 @@ def load_project(filepath: Path | str) -> DoorParams:
     if not filepath.exists():
         raise FileNotFoundError(f"Filen finnes ikke: {filepath}")
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    if binary_format.is_binary_file(filepath):
+        doors = list(binary_format.iter_doors(filepath, binary_format.KIND_PROJECT))
+        data = {"door": doors[0] if doors else None}
+    else:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
 
     door_data = data.get("door")
 
@@ -4,23 +4,15 @@ Beregningsmodul for dørkonfigurator.
 Alle beregninger tar karmmål (bredde, høyde) som input.
 Karmmål beregnes fra utsparingsmål: karm = utsparing + offset
 
+Offsets hentes fra den kompilerte tabellen i offset_table.py,
+slik at hver beregning er ett enkelt oppslag.
+
 Alle mål i millimeter (mm).
 """
 from typing import Optional
 
-from ..doors import DOOR_REGISTRY
-from .constants import (
-    KARM_SIZE_OFFSETS,
-    TRANSPORT_WIDTH_OFFSETS,
-    TRANSPORT_HEIGHT_OFFSETS,
-    DORBLAD_OFFSETS,
-    DORBLAD_HOYDE_INKL_LUFTSPALTE,
-    TERSKEL_OFFSETS,
-    LAMINAT_OFFSETS,
-    LAMINAT_OFFSET_DEFAULT,
-    LAMINAT_2_OFFSETS,
-    DEKKLIST_2FLOYET_OFFSET,
-)
+from .constants import DEKKLIST_2FLOYET_OFFSET
+from .offset_table import lookup
 
 
 # =============================================================================
@@ -38,10 +30,10 @@ def karm_bredde(karm_type: str, utsparing_bredde: int, adjufix: bool = False) ->
     Returns:
         Karmbredde i mm
     """
-    offset = KARM_SIZE_OFFSETS.get(karm_type, {}).get('width', 0)
-    base = utsparing_bredde + offset
-    if adjufix and '3' in karm_type:
-        base -= 10
+    offsets = lookup(None, karm_type)
+    base = utsparing_bredde + offsets.karm_bredde
+    if adjufix:
+        base -= offsets.adjufix_trekk
     return base
 
 
@@ -55,8 +47,7 @@ def karm_hoyde(karm_type: str, utsparing_hoyde: int) -> int:
     Returns:
         Karmhøyde i mm
     """
-    offset = KARM_SIZE_OFFSETS.get(karm_type, {}).get('height', 0)
-    return utsparing_hoyde + offset
+    return utsparing_hoyde + lookup(None, karm_type).karm_hoyde
 
 
 def utsparing_fra_karm(karm_type: str, karm_b: int, karm_h: int) -> tuple[int, int]:
@@ -70,8 +61,8 @@ def utsparing_fra_karm(karm_type: str, karm_b: int, karm_h: int) -> tuple[int, i
     Returns:
         Tuple (utsparing_bredde, utsparing_hoyde) i mm
     """
-    offsets = KARM_SIZE_OFFSETS.get(karm_type, {'width': 0, 'height': 0})
-    return (karm_b - offsets['width'], karm_h - offsets['height'])
+    offsets = lookup(None, karm_type)
+    return (karm_b - offsets.karm_bredde, karm_h - offsets.karm_hoyde)
 
 
 # =============================================================================
@@ -89,18 +80,11 @@ def transport_bredde_90(karm_type: str, karm_b: int, floyer: int = 1) -> Optiona
     Returns:
         Transportbredde i mm, eller None hvis ikke støttet
     """
-    karm_offsets = TRANSPORT_WIDTH_OFFSETS.get(karm_type)
-    if not karm_offsets:
-        return None
-
-    floyer_offsets = karm_offsets.get(floyer) or karm_offsets.get(1)
-    if not floyer_offsets or floyer_offsets.get('90') is None:
+    offsets = lookup(None, karm_type, None, floyer)
+    if offsets.transport_90 is None:
         return None
 
-    size_offset = KARM_SIZE_OFFSETS.get(karm_type, {}).get('width', 0)
-    transport_offset = floyer_offsets['90']
-
-    return karm_b - size_offset + transport_offset
+    return karm_b - offsets.karm_bredde + offsets.transport_90
 
 
 def transport_bredde_180(karm_type: str, karm_b: int, floyer: int = 1) -> Optional[int]:
@@ -114,18 +98,11 @@ def transport_bredde_180(karm_type: str, karm_b: int, floyer: int = 1) -> Option
     Returns:
         Transportbredde i mm, eller None hvis ikke støttet
     """
-    karm_offsets = TRANSPORT_WIDTH_OFFSETS.get(karm_type)
-    if not karm_offsets:
-        return None
-
-    floyer_offsets = karm_offsets.get(floyer) or karm_offsets.get(1)
-    if not floyer_offsets or floyer_offsets.get('180') is None:
+    offsets = lookup(None, karm_type, None, floyer)
+    if offsets.transport_180 is None:
         return None
 
-    size_offset = KARM_SIZE_OFFSETS.get(karm_type, {}).get('width', 0)
-    transport_offset = floyer_offsets['180']
-
-    return karm_b - size_offset + transport_offset
+    return karm_b - offsets.karm_bredde + offsets.transport_180
 
 
 def transport_hoyde(karm_type: str, karm_h: int, terskel_type: str = 'ingen') -> Optional[int]:
@@ -139,17 +116,11 @@ def transport_hoyde(karm_type: str, karm_h: int, terskel_type: str = 'ingen') ->
     Returns:
         Transporthøyde i mm, eller None hvis ikke støttet
     """
-    offsets = TRANSPORT_HEIGHT_OFFSETS.get(karm_type)
-    if not offsets:
-        return None
-
-    transport_offset = offsets.get(terskel_type)
-    if transport_offset is None:
+    offsets = lookup(None, karm_type, None, 1, terskel_type)
+    if offsets.transport_hoyde is None:
         return None
 
-    size_offset = KARM_SIZE_OFFSETS.get(karm_type, {}).get('height', 0)
-
-    return karm_h - size_offset + transport_offset
+    return karm_h - offsets.karm_hoyde + offsets.transport_hoyde
 
 
 # =============================================================================
@@ -173,28 +144,11 @@ def dorblad_bredde(karm_type: str, karm_b: int, floyer: int = 1,
         Dørbladbredde i mm, eller None hvis ikke støttet
     """
     # Dørtype-bevisst oppslag (unngår kollisjon ved delte karmtyper som PD1/PD2)
-    if door_type and door_type in DOOR_REGISTRY:
-        offsets = DOOR_REGISTRY[door_type].get('dorblad_offsets', {}).get(karm_type)
-    else:
-        offsets = DORBLAD_OFFSETS.get(karm_type)
-
-    if not offsets:
+    offsets = lookup(door_type, karm_type, hinge_type, floyer)
+    if offsets.dorblad_bredde is None:
         return None
 
-    # Sjekk om offsets er per hengseltype (SD3/ID-struktur)
-    if hinge_type and hinge_type in offsets:
-        # SD3/ID-struktur: {hengseltype: {floyer: {...}}}
-        hinge_offsets = offsets[hinge_type]
-        floyer_data = hinge_offsets.get(floyer) or hinge_offsets.get(1)
-    else:
-        # Standard struktur: {floyer: {...}}
-        floyer_data = offsets.get(floyer) or offsets.get(1)
-
-    if not floyer_data:
-        return None
-
-    bredde_offset = floyer_data.get('bredde', 0)
-    return karm_b - bredde_offset
+    return karm_b - offsets.dorblad_bredde
 
 
 def dorblad_hoyde(karm_type: str, karm_h: int, floyer: int = 1,
@@ -217,35 +171,16 @@ def dorblad_hoyde(karm_type: str, karm_h: int, floyer: int = 1,
     Returns:
         Dørbladhøyde i mm, eller None hvis ikke støttet
     """
-    # Dørtype-bevisst oppslag
-    if door_type and door_type in DOOR_REGISTRY:
-        offsets = DOOR_REGISTRY[door_type].get('dorblad_offsets', {}).get(karm_type)
-    else:
-        offsets = DORBLAD_OFFSETS.get(karm_type)
-
-    if not offsets:
-        return None
-
-    # Sjekk om offsets er per hengseltype (SD3/ID-struktur)
-    if hinge_type and hinge_type in offsets:
-        # SD3/ID-struktur: {hengseltype: {floyer: {...}}}
-        hinge_offsets = offsets[hinge_type]
-        floyer_data = hinge_offsets.get(floyer) or hinge_offsets.get(1)
-        # SD3/ID bruker 'hoyde_base' i stedet for 'hoyde'
-        hoyde_offset = floyer_data.get('hoyde_base', 0) if floyer_data else 0
-    else:
-        # Standard struktur: {floyer: {...}}
-        floyer_data = offsets.get(floyer) or offsets.get(1)
-        hoyde_offset = floyer_data.get('hoyde', 0) if floyer_data else 0
-
-    if not floyer_data:
+    # Dørtype-bevisst oppslag (SD3/ID bruker 'hoyde_base' per hengseltype)
+    offsets = lookup(door_type, karm_type, hinge_type, floyer)
+    if offsets.dorblad_hoyde is None:
         return None
 
     # Trekk fra luftspalte hvis karmtypen krever det (SD3/ID, FD1/FD2/FD3)
-    if karm_type in DORBLAD_HOYDE_INKL_LUFTSPALTE:
-        return karm_h - hoyde_offset - luftspalte
+    if offsets.dorblad_inkl_luftspalte:
+        return karm_h - offsets.dorblad_hoyde - luftspalte
 
-    return karm_h - hoyde_offset
+    return karm_h - offsets.dorblad_hoyde
 
 
 def terskel_lengde(karm_type: str, karm_b: int, floyer: int = 1) -> Optional[int]:
@@ -259,11 +194,7 @@ def terskel_lengde(karm_type: str, karm_b: int, floyer: int = 1) -> Optional[int
     Returns:
         Terskellengde i mm, eller None hvis ikke støttet
     """
-    offsets = TERSKEL_OFFSETS.get(karm_type)
-    if not offsets:
-        return None
-
-    offset = offsets.get(floyer) or offsets.get(1)
+    offset = lookup(None, karm_type, None, floyer).terskel
     if offset is None:
         return None
 
@@ -300,24 +231,9 @@ def laminat_mal(karm_type: str, dorblad_b: int, dorblad_h: int,
         Tuple (laminat_bredde, laminat_høyde) i mm, eller (None, None) hvis ikke støttet
     """
     # Dørtype-bevisst oppslag (unngår kollisjon ved delte karmtyper)
-    if door_type and door_type in DOOR_REGISTRY:
-        door_laminat = DOOR_REGISTRY[door_type].get('laminat_offsets', {})
-        offsets = door_laminat.get(karm_type)
-        # Hvis dørtypen har tom laminat_offsets og karmtypen ikke finnes → ingen laminat
-        if not door_laminat:
-            return (None, None)
-    else:
-        offsets = LAMINAT_OFFSETS.get(karm_type)
-
-    if offsets is None:
-        # Bruk default
-        offset = LAMINAT_OFFSET_DEFAULT
-    elif isinstance(offsets, dict):
-        # SD3/ID-struktur: {hengseltype: offset}
-        offset = offsets.get(hinge_type, LAMINAT_OFFSET_DEFAULT)
-    else:
-        # Standard: enkelt tall
-        offset = offsets
+    offset = lookup(door_type, karm_type, hinge_type).laminat
+    if offset is None:
+        return (None, None)
 
     return (dorblad_b - offset, dorblad_h - offset)
 
@@ -335,7 +251,7 @@ def laminat_2_mal(karm_type: str, laminat_1_b: int, laminat_1_h: int) -> tuple[O
     Returns:
         Tuple (laminat_2_bredde, laminat_2_høyde) i mm, eller (None, None) hvis ikke aktuelt
     """
-    offset = LAMINAT_2_OFFSETS.get(karm_type)
+    offset = lookup(None, karm_type).laminat_2
     if offset is None:
         return (None, None)
     return (laminat_1_b - offset, laminat_1_h - offset)
@@ -358,9 +274,7 @@ def sparkeplate_bredde(door_type: str, dorblad_b: int) -> int:
     Returns:
         Sparkeplatebredde i mm
     """
-    door_def = DOOR_REGISTRY.get(door_type, {})
-    offset = door_def.get('sparkeplate_offset', -9)
-    return dorblad_b + offset
+    return dorblad_b + lookup(door_type, None).sparkeplate
 
 
 def avviserboyler_lengde(door_type: str, dorblad_b: int) -> Optional[int]:
@@ -373,8 +287,7 @@ def avviserboyler_lengde(door_type: str, dorblad_b: int) -> Optional[int]:
     Returns:
         Avviserbøyler-lengde i mm, eller None hvis dørtypen ikke har avviserbøyler
     """
-    door_def = DOOR_REGISTRY.get(door_type, {})
-    offset = door_def.get('avviserboyler_offset')
+    offset = lookup(door_type, None).avviserboyler
     if offset is None:
         return None
     return dorblad_b + offset
@@ -390,8 +303,7 @@ def ryggforsterkning_hoyde(door_type: str, dorblad_h: int) -> Optional[int]:
     Returns:
         Ryggforsterkning-høyde i mm, eller None hvis dørtypen ikke har ryggforsterkning
     """
-    door_def = DOOR_REGISTRY.get(door_type, {})
-    offset = door_def.get('ryggforsterkning_hoyde_offset')
+    offset = lookup(door_type, None).ryggforsterkning_hoyde
     if offset is None:
         return None
     return dorblad_h + offset
@@ -407,8 +319,7 @@ def ryggforsterkning_overdel(door_type: str, dorblad_b: int) -> Optional[int]:
     Returns:
         Ryggforsterkning overdel-lengde i mm, eller None hvis ikke aktuelt
     """
-    door_def = DOOR_REGISTRY.get(door_type, {})
-    offset = door_def.get('ryggforsterkning_overdel_offset')
+    offset = lookup(door_type, None).ryggforsterkning_overdel
     if offset is None:
         return None
     return dorblad_b + offset
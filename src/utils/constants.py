@@ -31,6 +31,7 @@ PROJECT_FILTER = f"KIAS Dørfil (*{PROJECT_EXTENSION})"
 
 DOOR_LIST_EXTENSION = ".kdl"
 DOOR_LIST_FILTER = f"KIAS Dørliste (*{DOOR_LIST_EXTENSION})"
+DOOR_LIST_COMPACT_FILTER = f"KIAS Dørliste, kompakt (*{DOOR_LIST_EXTENSION})"
 
 # =============================================================================
 # DYNAMISK OPPBYGGING FRA DOOR_REGISTRY
@@ -0,0 +1,243 @@
+"""
+Kompilert offset-tabell for dørkonfigurator.
+
+Flater ut alle kombinasjoner av (dørtype, karmtype, hengseltype,
+fløyer, terskeltype) fra DOOR_REGISTRY til én tuple-nøklet tabell med
+ferdig oppløste offsets. Tabellen bygges ved import, og hull i
+registeret (f.eks. manglende dørblad-offsets for en tillatt
+kombinasjon) gir feil allerede da.
+
+Beregningsfunksjonene i calculations.py og production_measures.py
+slår opp her i stedet for å gå gjennom nøstede registerdicts.
+
+Alle mål i millimeter (mm).
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from ..doors import DOOR_REGISTRY
+from .constants import (
+    KARM_SIZE_OFFSETS,
+    TRANSPORT_WIDTH_OFFSETS,
+    TRANSPORT_HEIGHT_OFFSETS,
+    DORBLAD_OFFSETS,
+    DORBLAD_HOYDE_INKL_LUFTSPALTE,
+    TERSKEL_OFFSETS,
+    LAMINAT_OFFSETS,
+    LAMINAT_OFFSET_DEFAULT,
+    LAMINAT_2_OFFSETS,
+    KARM_THRESHOLD_TYPES,
+)
+
+
+# Nøkkel: (door_type, karm_type, hinge_type, floyer, threshold)
+OffsetKey = Tuple[Optional[str], Optional[str], Optional[str], int, Optional[str]]
+
+
+@dataclass(frozen=True)
+class ResolvedOffsets:
+    """Ferdig oppløste offsets for én kombinasjon.
+
+    None betyr at målet ikke er støttet for kombinasjonen.
+    """
+    karm_bredde: int = 0               # utsparing → karm
+    karm_hoyde: int = 0
+    adjufix_trekk: int = 0             # trekkes fra karmbredde ved Adjufix
+    transport_90: Optional[int] = None
+    transport_180: Optional[int] = None
+    transport_hoyde: Optional[int] = None
+    dorblad_bredde: Optional[int] = None   # karm → dørblad (trekkes fra)
+    dorblad_hoyde: Optional[int] = None
+    dorblad_inkl_luftspalte: bool = False
+    terskel: Optional[int] = None
+    laminat: Optional[int] = None      # dørblad → laminat (trekkes fra)
+    laminat_2: Optional[int] = None    # laminat 1 → laminat 2 (trekkes fra)
+    sparkeplate: int = -9              # dørblad → sparkeplate (legges til)
+    avviserboyler: Optional[int] = None
+    ryggforsterkning_hoyde: Optional[int] = None
+    ryggforsterkning_overdel: Optional[int] = None
+
+
+def resolve_offsets(door_type: Optional[str], karm_type: Optional[str],
+                    hinge_type: Optional[str] = None, floyer: int = 1,
+                    threshold: Optional[str] = None) -> ResolvedOffsets:
+    """Løser opp offsets for én kombinasjon ved å gå gjennom registeret.
+
+    Brukes for å bygge tabellen, og som fallback for kombinasjoner
+    som ikke finnes i den (f.eks. ukjent dørtype eller fløyer).
+    """
+    door_def = DOOR_REGISTRY.get(door_type) if door_type else None
+
+    # Karmmål
+    size = KARM_SIZE_OFFSETS.get(karm_type, {})
+    adjufix_trekk = 10 if karm_type and '3' in karm_type else 0
+
+    # Transportbredde
+    transport_90 = transport_180 = None
+    karm_transport = TRANSPORT_WIDTH_OFFSETS.get(karm_type)
+    if karm_transport:
+        floyer_transport = karm_transport.get(floyer) or karm_transport.get(1)
+        if floyer_transport:
+            transport_90 = floyer_transport.get('90')
+            transport_180 = floyer_transport.get('180')
+
+    # Transporthøyde
+    transport_hoyde = None
+    height_offsets = TRANSPORT_HEIGHT_OFFSETS.get(karm_type)
+    if height_offsets and threshold is not None:
+        transport_hoyde = height_offsets.get(threshold)
+
+    # Dørblad (dørtype-bevisst oppslag unngår kollisjon ved delte karmtyper)
+    if door_def is not None:
+        offsets = door_def.get('dorblad_offsets', {}).get(karm_type)
+    else:
+        offsets = DORBLAD_OFFSETS.get(karm_type)
+
+    db_bredde = db_hoyde = None
+    if offsets:
+        if hinge_type and hinge_type in offsets:
+            # SD3/ID-struktur: {hengseltype: {floyer: {...}}}
+            hinge_offsets = offsets[hinge_type]
+            floyer_data = hinge_offsets.get(floyer) or hinge_offsets.get(1)
+            hoyde_key = 'hoyde_base'
+        else:
+            # Standard struktur: {floyer: {...}}
+            floyer_data = offsets.get(floyer) or offsets.get(1)
+            hoyde_key = 'hoyde'
+        if floyer_data:
+            db_bredde = floyer_data.get('bredde', 0)
+            db_hoyde = floyer_data.get(hoyde_key, 0)
+
+    # Terskel
+    terskel = None
+    terskel_offsets = TERSKEL_OFFSETS.get(karm_type)
+    if terskel_offsets:
+        terskel = terskel_offsets.get(floyer) or terskel_offsets.get(1)
+
+    # Laminat
+    laminat: Optional[int]
+    if door_def is not None:
+        door_laminat = door_def.get('laminat_offsets', {})
+        lam_offsets = door_laminat.get(karm_type)
+    else:
+        door_laminat = None
+        lam_offsets = LAMINAT_OFFSETS.get(karm_type)
+
+    if door_laminat is not None and not door_laminat:
+        # Dørtypen har tom laminat_offsets → ingen laminat
+        laminat = None
+    elif lam_offsets is None:
+        laminat = LAMINAT_OFFSET_DEFAULT
+    elif isinstance(lam_offsets, dict):
+        # SD3/ID-struktur: {hengseltype: offset}
+        laminat = lam_offsets.get(hinge_type, LAMINAT_OFFSET_DEFAULT)
+    else:
+        laminat = lam_offsets
+
+    # Tilbehør per dørtype
+    accessory = DOOR_REGISTRY.get(door_type, {}) if door_type else {}
+
+    return ResolvedOffsets(
+        karm_bredde=size.get('width', 0),
+        karm_hoyde=size.get('height', 0),
+        adjufix_trekk=adjufix_trekk,
+        transport_90=transport_90,
+        transport_180=transport_180,
+        transport_hoyde=transport_hoyde,
+        dorblad_bredde=db_bredde,
+        dorblad_hoyde=db_hoyde,
+        dorblad_inkl_luftspalte=karm_type in DORBLAD_HOYDE_INKL_LUFTSPALTE,
+        terskel=terskel,
+        laminat=laminat,
+        laminat_2=LAMINAT_2_OFFSETS.get(karm_type),
+        sparkeplate=accessory.get('sparkeplate_offset', -9),
+        avviserboyler=accessory.get('avviserboyler_offset'),
+        ryggforsterkning_hoyde=accessory.get('ryggforsterkning_hoyde_offset'),
+        ryggforsterkning_overdel=accessory.get('ryggforsterkning_overdel_offset'),
+    )
+
+
+def _hinge_keys(door_def: Optional[dict], karm_type: str) -> list:
+    """Alle hengseltyper som kan påvirke oppslag for en karmtype (inkl. None)."""
+    keys = [None]
+    if door_def is not None:
+        keys.extend(door_def.get('karm_hengsel_typer', {}).get(karm_type, []))
+        dorblad = door_def.get('dorblad_offsets', {}).get(karm_type) or {}
+        laminat = door_def.get('laminat_offsets', {}).get(karm_type)
+    else:
+        dorblad = DORBLAD_OFFSETS.get(karm_type) or {}
+        laminat = LAMINAT_OFFSETS.get(karm_type)
+    keys.extend(k for k in dorblad if isinstance(k, str))
+    if isinstance(laminat, dict):
+        keys.extend(laminat)
+    return list(dict.fromkeys(keys))
+
+
+def _check_gaps(door_type: str, door_def: dict) -> list:
+    """Finner tillatte kombinasjoner som mangler offsets i registeret."""
+    gaps = []
+    for karm_type in door_def.get('karm_types', []):
+        if karm_type not in door_def.get('karm_size_offsets', {}):
+            gaps.append(f"{door_type}/{karm_type}: mangler karm_size_offsets")
+        floyer_list = door_def.get('karm_floyer', {}).get(karm_type, door_def.get('floyer', [1]))
+        hinge_list = door_def.get('karm_hengsel_typer', {}).get(karm_type) or [None]
+        for floyer in floyer_list:
+            for hinge_type in hinge_list:
+                resolved = OFFSET_TABLE[(door_type, karm_type, hinge_type, floyer, None)]
+                if resolved.dorblad_bredde is None:
+                    gaps.append(f"{door_type}/{karm_type}/{hinge_type}/{floyer}: "
+                                f"mangler dorblad_offsets")
+        height_offsets = door_def.get('transport_height_offsets', {}).get(karm_type, {})
+        for threshold in door_def.get('karm_threshold_types', {}).get(karm_type, []):
+            if threshold not in height_offsets:
+                gaps.append(f"{door_type}/{karm_type}/{threshold}: "
+                            f"mangler transport_height_offsets")
+    return gaps
+
+
+def _compile() -> Dict[OffsetKey, ResolvedOffsets]:
+    """Bygger tabellen for alle dørtyper (og dørtype None) i registeret."""
+    table: Dict[OffsetKey, ResolvedOffsets] = {}
+    karm_sources = [(key, d, d.get('karm_types', [])) for key, d in DOOR_REGISTRY.items()]
+    karm_sources.append((None, None, list(KARM_SIZE_OFFSETS)))
+
+    for door_type, door_def, karm_types in karm_sources:
+        for karm_type in karm_types:
+            thresholds = [None]
+            thresholds.extend(KARM_THRESHOLD_TYPES.get(karm_type, []))
+            thresholds.extend(TRANSPORT_HEIGHT_OFFSETS.get(karm_type, {}))
+            thresholds = list(dict.fromkeys(thresholds))
+            for hinge_type in _hinge_keys(door_def, karm_type):
+                for floyer in (1, 2):
+                    for threshold in thresholds:
+                        key = (door_type, karm_type, hinge_type, floyer, threshold)
+                        table[key] = resolve_offsets(*key)
+
+    # Dørtype-nivå (sparkeplate, avviserbøyler, ryggforsterkning)
+    for door_type in DOOR_REGISTRY:
+        key = (door_type, None, None, 1, None)
+        table[key] = resolve_offsets(*key)
+    return table
+
+
+OFFSET_TABLE: Dict[OffsetKey, ResolvedOffsets] = _compile()
+
+_gaps = [gap for key, d in DOOR_REGISTRY.items() for gap in _check_gaps(key, d)]
+if _gaps:
+    raise ValueError("Ufullstendig DOOR_REGISTRY:\n  " + "\n  ".join(_gaps))
+
+
+def lookup(door_type: Optional[str], karm_type: Optional[str],
+           hinge_type: Optional[str] = None, floyer: int = 1,
+           threshold: Optional[str] = None) -> ResolvedOffsets:
+    """Slår opp ferdige offsets for en kombinasjon.
+
+    Kombinasjoner utenfor registeret løses opp ved hvert kall og
+    legges ikke til i tabellen, slik at den ikke vokser med ukjente
+    verdier (produksjonsmålene caches uansett i production_measures).
+    """
+    key = (door_type, karm_type, hinge_type, floyer, threshold)
+    resolved = OFFSET_TABLE.get(key)
+    if resolved is None:
+        return resolve_offsets(*key)
+    return resolved
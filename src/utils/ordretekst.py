@@ -4,6 +4,7 @@ Genererer ordretekst (ordrelinjetekst) fra DoorParams og DOOR_REGISTRY.
 
 from ..doors import DOOR_REGISTRY
 from .constants import RAL_COLORS, POLYKARBONAT_COLORS, SWING_DIRECTIONS, THRESHOLD_LUFTSPALTE
+from .production_measures import production_measures
 
 
 # Globale terskel-tekster (felles for alle dørtyper)
@@ -53,9 +54,10 @@ def generer_ordretekst(door) -> list[str]:
     # --- Slagretning ---
     slagretning = SWING_DIRECTIONS.get(door.swing_direction, door.swing_direction)
 
-    # --- Transportmål ---
-    bt_b = door.transport_width_90()
-    bt_h = door.transport_height_by_threshold()
+    # --- Transportmål (delte produksjonsmål) ---
+    m = production_measures(door)
+    bt_b = m.transport_bredde_90
+    bt_h = m.transport_hoyde
 
     # --- Karmbeskrivelse ---
     karm_besk_maler = door_def.get('karm_beskrivelse', {})
@@ -80,7 +82,7 @@ def generer_ordretekst(door) -> list[str]:
     beslag = door.handle_type if door.handle_type else ''
 
     # --- Luftspalte ---
-    luftspalte = door.effective_luftspalte()
+    luftspalte = m.luftspalte
 
     # --- Placeholder-verdier ---
     verdier = {
@@ -0,0 +1,132 @@
+"""
+Felles produksjonsmål per dør for dørkonfigurator.
+
+Karm-, dørblad-, laminat-, terskel- og tilbehørsmål beregnes én gang
+fra feltene i DoorParams som påvirker dem, og deles av detaljfanen,
+3D-visningen, ordreteksten og produksjonslisten. Resultatene ligger i
+en begrenset LRU-cache, så samme dør beregnes ikke flere ganger per
+redigering.
+
+Alle mål i millimeter (mm).
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from .calculations import (
+    karm_bredde, karm_hoyde,
+    dorblad_bredde, dorblad_hoyde,
+    terskel_lengde, dekklist_lengde,
+    laminat_mal, laminat_2_mal,
+    sparkeplate_bredde, avviserboyler_lengde,
+    ryggforsterkning_hoyde, ryggforsterkning_overdel,
+)
+from .offset_table import lookup
+
+# Maks antall dørkonfigurasjoner som holdes i cachen
+MEASURES_CACHE_SIZE = 512
+
+_Mal = Tuple[Optional[int], Optional[int]]
+
+
+@dataclass(frozen=True)
+class ProductionMeasures:
+    """Beregnede produksjonsmål for én dørkonfigurasjon.
+
+    Per-blad-verdier er tupler med ett element per dørblad (tom hvis
+    dørbladbredden ikke er støttet). None betyr at målet ikke finnes.
+    """
+    luftspalte: int
+    karm_bredde: int
+    karm_hoyde: int
+    transport_bredde_90: Optional[int]
+    transport_bredde_180: Optional[int]
+    transport_hoyde: Optional[int]
+    dorblad_bredde: Optional[int]            # Samlet for alle fløyer
+    dorblad_hoyde: Optional[int]
+    blad_bredder: Tuple[int, ...]            # Per fløy etter floyer_split
+    terskel_lengde: Optional[int]
+    dekklist_lengde: Optional[int]           # Kun 2-fløyet
+    has_laminat: bool
+    has_laminat_2: bool
+    laminat: Tuple[_Mal, ...]                # (bredde, høyde) per blad
+    laminat_2: Tuple[_Mal, ...]
+    sparkeplate_bredder: Tuple[int, ...]
+    avviserboyler_lengder: Tuple[Optional[int], ...]
+    ryggforsterkning_hoyde: Optional[int]
+    ryggforsterkning_overdel: Tuple[Optional[int], ...]
+
+
+def production_measures(door) -> ProductionMeasures:
+    """Returnerer (cachede) produksjonsmål for en DoorParams."""
+    return _compute(
+        door.door_type, door.karm_type, door.floyer, door.floyer_split,
+        door.hinge_type, door.width, door.height, door.adjufix,
+        door.threshold_type, door.effective_luftspalte(),
+    )
+
+
+def clear_measures_cache() -> None:
+    """Tømmer cachen (f.eks. etter endring i dørtype-registeret)."""
+    _compute.cache_clear()
+
+
+@lru_cache(maxsize=MEASURES_CACHE_SIZE)
+def _compute(door_type: str, karm_type: str, floyer: int, floyer_split: int,
+             hinge_type: Optional[str], width: int, height: int, adjufix: bool,
+             threshold_type: str, luftspalte: int) -> ProductionMeasures:
+    """Beregner alle produksjonsmål for én kombinasjon av relevante felter."""
+    karm_b = karm_bredde(karm_type, width, adjufix=adjufix)
+    karm_h = karm_hoyde(karm_type, height)
+
+    # Transportmål regnes fra utsparing (som DoorParams.transport_*)
+    transport = lookup(None, karm_type, None, floyer, threshold_type)
+    t90 = width + transport.transport_90 if transport.transport_90 is not None else None
+    t180 = width + transport.transport_180 if transport.transport_180 is not None else None
+    t_h = height + transport.transport_hoyde if transport.transport_hoyde is not None else None
+
+    db_b_total = dorblad_bredde(karm_type, karm_b, floyer, hinge_type, door_type=door_type)
+    db_h = dorblad_hoyde(karm_type, karm_h, floyer, hinge_type, luftspalte, door_type=door_type)
+
+    if floyer == 2 and db_b_total:
+        db1_b = round(db_b_total * floyer_split / 100.0)
+        blad_bredder: Tuple[int, ...] = (db1_b, db_b_total - db1_b)
+    elif db_b_total:
+        blad_bredder = (db_b_total,)
+    else:
+        blad_bredder = ()
+
+    has_laminat = laminat_mal(karm_type, 100, 100, door_type=door_type) != (None, None)
+    has_laminat_2 = has_laminat and laminat_2_mal(karm_type, 100, 100) != (None, None)
+
+    laminat = []
+    laminat_2 = []
+    for bw in blad_bredder:
+        lam = laminat_mal(karm_type, bw, db_h, hinge_type, door_type=door_type) if db_h else (None, None)
+        laminat.append(lam)
+        if lam[0] and lam[1]:
+            laminat_2.append(laminat_2_mal(karm_type, lam[0], lam[1]))
+        else:
+            laminat_2.append((None, None))
+
+    return ProductionMeasures(
+        luftspalte=luftspalte,
+        karm_bredde=karm_b,
+        karm_hoyde=karm_h,
+        transport_bredde_90=t90,
+        transport_bredde_180=t180,
+        transport_hoyde=t_h,
+        dorblad_bredde=db_b_total,
+        dorblad_hoyde=db_h,
+        blad_bredder=blad_bredder,
+        terskel_lengde=terskel_lengde(karm_type, karm_b, floyer),
+        dekklist_lengde=dekklist_lengde(karm_h) if floyer == 2 else None,
+        has_laminat=has_laminat,
+        has_laminat_2=has_laminat_2,
+        laminat=tuple(laminat),
+        laminat_2=tuple(laminat_2),
+        sparkeplate_bredder=tuple(sparkeplate_bredde(door_type, bw) for bw in blad_bredder),
+        avviserboyler_lengder=tuple(avviserboyler_lengde(door_type, bw) for bw in blad_bredder),
+        ryggforsterkning_hoyde=ryggforsterkning_hoyde(door_type, db_h) if db_h else None,
+        ryggforsterkning_overdel=tuple(ryggforsterkning_overdel(door_type, bw) for bw in blad_bredder),
+    )
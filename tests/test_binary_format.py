@@ -0,0 +1,164 @@
+"""
+Binærformatet (.kdf/.kdl): dører skal komme uendret tilbake for alle
+komprimeringer, og skadede filer skal gi en tydelig ValueError.
+"""
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.models import binary_format as bf
+from src.models.door import DoorParams
+from src.models.door_list_io import load_door_list, save_door_list
+from src.models.production_list import ProductionList
+from src.models.project import load_project, save_project
+
+COMPRESSIONS = [bf.COMPRESSION_NONE, bf.COMPRESSION_ZLIB] + (
+    [bf.COMPRESSION_ZSTD] if bf.HAS_ZSTD else [])
+
+
+def sample_doors(count: int, seed: int = 0) -> list:
+    """params-dicts med varierte strenger, datoer og tall."""
+    rng = random.Random(seed)
+    texts = ['', 'Prosjekt Ærø', 'Kunde «Øst» – bygg 2', '日本語', 'emoji 🚪', 'a\nb\tc']
+    dates = ['', '2024-03-01T12:30:45.123456', '2024-03-01T12:30:45',
+             '2024-03-01', 'ikke en dato', '2024-03-01T12:30:45+01:00']
+    doors = []
+    for i in range(count):
+        params = DoorParams(
+            project_id=f'P-{i}', customer=rng.choice(texts), notes=rng.choice(texts),
+            width=rng.randint(600, 2400), height=rng.randint(1900, 2600),
+            adjufix=rng.random() < 0.5, sound_rating=rng.choice([0, 35, -1, 2 ** 40]),
+        ).to_dict()
+        params['created_date'] = rng.choice(dates)
+        params['modified_date'] = rng.choice(dates)
+        doors.append(params)
+    return doors
+
+
+class BinaryFormatTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def roundtrip(self, doors: list, compression: str, kind: int = bf.KIND_DOOR_LIST) -> list:
+        path = self.dir / f'doors-{compression}.kdl'
+        self.assertEqual(bf.write_doors(path, kind, iter(doors), compression), len(doors))
+        self.assertTrue(bf.is_binary_file(path))
+        return list(bf.iter_doors(path, kind))
+
+    def write_sample(self, compression: str = bf.COMPRESSION_ZLIB, count: int = 50) -> Path:
+        path = self.dir / 'sample.kdl'
+        bf.write_doors(path, bf.KIND_DOOR_LIST, sample_doors(count), compression)
+        return path
+
+    def test_roundtrip_all_compressions(self):
+        # Flere blokker, siste blokk ufullstendig
+        doors = sample_doors(bf.BLOCK_SIZE * 2 + 7)
+        for compression in COMPRESSIONS:
+            with self.subTest(compression=compression):
+                self.assertEqual(self.roundtrip(doors, compression), doors)
+
+    def test_empty_list(self):
+        for compression in COMPRESSIONS:
+            with self.subTest(compression=compression):
+                self.assertEqual(self.roundtrip([], compression), [])
+
+    def test_none_values(self):
+        doors = sample_doors(3)
+        doors[0]['customer'] = None
+        doors[1]['created_date'] = None
+        doors[2]['modified_date'] = None
+        for compression in COMPRESSIONS:
+            with self.subTest(compression=compression):
+                self.assertEqual(self.roundtrip(doors, compression), doors)
+
+    def test_dates_keep_exact_text(self):
+        doors = self.roundtrip(sample_doors(200, seed=3), bf.COMPRESSION_NONE)
+        self.assertEqual({d['created_date'] for d in doors} | {d['modified_date'] for d in doors},
+                         {'', '2024-03-01T12:30:45.123456', '2024-03-01T12:30:45',
+                          '2024-03-01', 'ikke en dato', '2024-03-01T12:30:45+01:00'})
+
+    def test_invalid_integer_rejected(self):
+        doors = sample_doors(2)
+        doors[1]['width'] = '1010'
+        with self.assertRaisesRegex(ValueError, 'width'):
+            bf.write_doors(self.dir / 'bad.kdl', bf.KIND_DOOR_LIST, doors)
+
+    def test_unknown_compression_rejected(self):
+        with self.assertRaisesRegex(ValueError, 'komprimering'):
+            bf.write_doors(self.dir / 'bad.kdl', bf.KIND_DOOR_LIST, [], 'lz4')
+
+    @unittest.skipIf(bf.HAS_ZSTD, "zstandard er installert")
+    def test_zstd_without_package(self):
+        with self.assertRaisesRegex(ValueError, 'zstandard'):
+            bf.write_doors(self.dir / 'bad.kdl', bf.KIND_DOOR_LIST, [], bf.COMPRESSION_ZSTD)
+
+    def test_bad_magic(self):
+        path = self.write_sample()
+        data = bytearray(path.read_bytes())
+        data[:4] = b'KDX\x01'
+        path.write_bytes(bytes(data))
+        self.assertFalse(bf.is_binary_file(path))
+        with self.assertRaisesRegex(ValueError, 'filsignatur'):
+            list(bf.iter_doors(path, bf.KIND_DOOR_LIST))
+
+    def test_wrong_kind(self):
+        path = self.write_sample()
+        with self.assertRaisesRegex(ValueError, 'filtype'):
+            list(bf.iter_doors(path, bf.KIND_PROJECT))
+
+    def test_truncated_file(self):
+        for compression in COMPRESSIONS:
+            path = self.write_sample(compression)
+            data = path.read_bytes()
+            for size in (3, 10, 40, len(data) // 2, len(data) - 1):
+                with self.subTest(compression=compression, size=size):
+                    path.write_bytes(data[:size])
+                    with self.assertRaisesRegex(ValueError, 'Ugyldig'):
+                        list(bf.iter_doors(path, bf.KIND_DOOR_LIST))
+
+    def test_corrupt_data(self):
+        for compression in COMPRESSIONS:
+            path = self.write_sample(compression)
+            data = bytearray(path.read_bytes())
+            # Midt i første blokk (etter prefiks og hode)
+            for pos in (20, len(data) - 30):
+                with self.subTest(compression=compression, pos=pos):
+                    corrupt = bytearray(data)
+                    corrupt[pos:pos + 8] = b'\xff' * 8
+                    path.write_bytes(bytes(corrupt))
+                    try:
+                        doors = list(bf.iter_doors(path, bf.KIND_DOOR_LIST))
+                    except ValueError:
+                        continue
+                    # Ukomprimerte tall kan bli gyldige, men andre verdier
+                    self.assertEqual(compression, bf.COMPRESSION_NONE)
+                    self.assertEqual(len(doors), 50)
+
+    def test_project_roundtrip(self):
+        door = DoorParams(project_id='Ærø', customer='Kunde', notes='日本語', width=1234)
+        for compression in COMPRESSIONS:
+            with self.subTest(compression=compression):
+                path = self.dir / 'prosjekt.kdf'
+                save_project(door, path, binary=True, compression=compression)
+                loaded = load_project(path)
+                self.assertEqual(loaded.to_dict(), door.to_dict())
+
+    def test_door_list_roundtrip(self):
+        prod_list = ProductionList()
+        prod_list.add_doors(DoorParams.from_dict(params) for params in sample_doors(30))
+        path = self.dir / 'liste.kdl'
+        save_door_list(prod_list, path, binary=True)
+        loaded = ProductionList()
+        self.assertEqual(load_door_list(path, loaded), 30)
+        self.assertEqual([d.params.to_dict() for d in loaded.doors],
+                         [d.params.to_dict() for d in prod_list.doors])
+
+
+if __name__ == '__main__':
+    unittest.main()
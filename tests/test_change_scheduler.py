@@ -0,0 +1,76 @@
+"""
+ChangeScheduler: vanlige mottakere kjøres én gang etter pausen, strupte
+mottakere straks og deretter høyst én gang per periode.
+"""
+import os
+import time
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import QCoreApplication
+
+from src.gui.change_scheduler import ChangeScheduler
+
+DELAY_MS = 80
+THROTTLE_MS = 40
+
+
+class ChangeSchedulerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.calls = []
+        self.scheduler = ChangeScheduler(DELAY_MS)
+        self.scheduler.register('preview', lambda: self.calls.append('preview'),
+                                ignores={'notes'}, throttle_ms=THROTTLE_MS)
+        self.scheduler.register('detail', lambda: self.calls.append('detail'))
+
+    def wait(self, ms: int) -> None:
+        deadline = time.monotonic() + ms / 1000
+        while time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.002)
+
+    def test_throttled_runs_immediately_then_once_more(self):
+        self.scheduler.schedule({'width'})
+        self.assertEqual(self.calls, ['preview'])
+        self.scheduler.schedule({'width'})
+        self.scheduler.schedule({'height'})
+        self.assertEqual(self.calls, ['preview'])
+
+        self.wait(DELAY_MS * 3)
+        self.assertEqual(sorted(self.calls), ['detail', 'preview', 'preview'])
+        self.assertFalse(self.scheduler.has_pending())
+
+    def test_single_change_is_not_repeated(self):
+        self.scheduler.schedule({'width'})
+        self.wait(DELAY_MS * 3)
+        self.assertEqual(self.calls, ['preview', 'detail'])
+
+    def test_ignored_fields_skip_throttled_consumer(self):
+        self.scheduler.schedule({'notes'})
+        self.assertEqual(self.calls, [])
+        self.scheduler.flush()
+        self.assertEqual(self.calls, ['detail'])
+
+    def test_flush_and_cancel(self):
+        self.scheduler.schedule({'width'})
+        self.scheduler.schedule({'width'})
+        self.scheduler.flush()
+        self.assertEqual(self.calls, ['preview', 'preview', 'detail'])
+
+        self.calls.clear()
+        self.wait(THROTTLE_MS * 2)
+        self.scheduler.schedule({'width'})
+        self.scheduler.schedule({'width'})
+        self.scheduler.cancel()
+        self.wait(DELAY_MS * 3)
+        self.assertEqual(self.calls, ['preview'])
+
+
+if __name__ == '__main__':
+    unittest.main()
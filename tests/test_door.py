@@ -0,0 +1,55 @@
+"""
+Endringssporing i DoorParams: bare faktiske endringer registreres, og
+kopier sporer endringer uavhengig av originalen.
+"""
+import copy
+import dataclasses
+import unittest
+
+from src.models.door import DoorParams
+
+
+class DirtyTrackingTest(unittest.TestCase):
+
+    def test_only_real_changes_tracked(self):
+        door = DoorParams()
+        self.assertFalse(door.is_dirty())
+        door.width = door.width
+        self.assertFalse(door.is_dirty())
+        door.width += 10
+        self.assertEqual(door.pop_dirty(), {'width'})
+        self.assertFalse(door.is_dirty())
+
+    def test_only_metadata_dirty(self):
+        door = DoorParams()
+        self.assertFalse(door.only_metadata_dirty())
+        door.notes = 'Ny merknad'
+        door.customer = 'Kunde'
+        self.assertTrue(door.only_metadata_dirty())
+        door.height += 10
+        self.assertFalse(door.only_metadata_dirty())
+        door.clear_dirty()
+        self.assertFalse(door.only_metadata_dirty())
+
+    def test_copies_track_separately(self):
+        door = DoorParams()
+        door.notes = 'endret'
+        copies = {
+            'copy': copy.copy(door),
+            'deepcopy': copy.deepcopy(door),
+            'replace': dataclasses.replace(door),
+        }
+        for name, clone in copies.items():
+            with self.subTest(name):
+                self.assertEqual(clone, door)
+                clone.width += 10
+                self.assertTrue(clone.is_dirty({'width'}))
+                self.assertFalse(door.is_dirty({'width'}))
+                clone.clear_dirty()
+                self.assertEqual(door.dirty_fields(), {'notes'})
+        self.assertEqual(copies['copy'].dirty_fields(), frozenset())
+        self.assertFalse(dataclasses.replace(door).is_dirty())
+
+
+if __name__ == '__main__':
+    unittest.main()
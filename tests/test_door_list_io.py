@@ -0,0 +1,154 @@
+"""
+Dørlister (.kdl): JSON og JSON Lines på hver side av STREAMING_MIN_DOORS,
+eldre JSON-filer (innrykket og på én linje), og at en mislykket lagring
+ikke ødelegger filen som fantes fra før.
+"""
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.models import door_list_io
+from src.models.door import DoorParams
+from src.models.door_list_io import (
+    JSONL_FORMAT, STREAMING_MIN_DOORS, iter_door_list, load_door_list, save_door_list,
+)
+from src.models.production_list import ProductionList
+
+
+def make_list(count: int) -> ProductionList:
+    prod_list = ProductionList()
+    prod_list.add_doors(
+        DoorParams(project_id=f'P-{i}', customer='Kunde Ærø', width=800 + i % 700,
+                   notes='«notat»' if i % 3 == 0 else '')
+        for i in range(count))
+    return prod_list
+
+
+def params_of(prod_list: ProductionList) -> list:
+    return [door.params.to_dict() for door in prod_list.doors]
+
+
+class DoorListIOTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def first_line(self, path: Path) -> str:
+        with open(path, encoding='utf-8') as f:
+            return f.readline()
+
+    def assert_loads_back(self, prod_list: ProductionList, path: Path) -> None:
+        loaded = ProductionList()
+        self.assertEqual(load_door_list(path, loaded), prod_list.door_count)
+        self.assertEqual(params_of(loaded), params_of(prod_list))
+
+    def test_format_chosen_by_door_count(self):
+        for count, streaming in ((STREAMING_MIN_DOORS - 1, False),
+                                 (STREAMING_MIN_DOORS, True)):
+            with self.subTest(count=count):
+                prod_list = make_list(count)
+                path = self.dir / f'liste-{count}.kdl'
+                save_door_list(prod_list, path)
+                header = json.loads(self.first_line(path)) if streaming else None
+                if streaming:
+                    self.assertEqual(header['format'], JSONL_FORMAT)
+                    self.assertEqual(header['count'], count)
+                else:
+                    self.assertEqual(self.first_line(path).strip(), '{')
+                self.assert_loads_back(prod_list, path)
+
+    def test_explicit_streaming_overrides_count(self):
+        prod_list = make_list(3)
+        path = self.dir / 'liste.kdl'
+        save_door_list(prod_list, path, streaming=True)
+        self.assertEqual(len(list(iter_door_list(path))), 3)
+        self.assert_loads_back(prod_list, path)
+
+    def test_missing_suffix_added(self):
+        save_door_list(make_list(2), self.dir / 'liste')
+        self.assertTrue((self.dir / 'liste.kdl').exists())
+
+    def test_legacy_json_files(self):
+        prod_list = make_list(5)
+        data = prod_list.to_list_dict()
+        for name, text in (
+                ('innrykket.kdl', json.dumps(data, indent=2, ensure_ascii=False)),
+                ('en_linje.kdl', json.dumps(data, ensure_ascii=False)),
+                ('ascii.kdl', json.dumps(data))):
+            with self.subTest(name=name):
+                path = self.dir / name
+                path.write_text(text, encoding='utf-8')
+                self.assert_loads_back(prod_list, path)
+
+    def test_legacy_empty_list(self):
+        path = self.dir / 'tom.kdl'
+        path.write_text('{"version": "1.0", "type": "door_list", "doors": []}', encoding='utf-8')
+        self.assertEqual(load_door_list(path, ProductionList()), 0)
+
+    def test_wrong_type_rejected(self):
+        path = self.dir / 'prosjekt.kdl'
+        path.write_text(json.dumps({'version': '1.0', 'door': {}}), encoding='utf-8')
+        with self.assertRaisesRegex(ValueError, 'door_list'):
+            load_door_list(path, ProductionList())
+        path.write_text(json.dumps({'type': 'project', 'format': JSONL_FORMAT}) + '\n',
+                        encoding='utf-8')
+        with self.assertRaisesRegex(ValueError, 'door_list'):
+            load_door_list(path, ProductionList())
+
+    def test_invalid_jsonl_line(self):
+        path = self.dir / 'liste.kdl'
+        save_door_list(make_list(3), path, streaming=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{ikke json\n')
+        with self.assertRaisesRegex(ValueError, 'linje 5'):
+            load_door_list(path, ProductionList())
+
+    def test_failed_write_keeps_original(self):
+        original = make_list(4)
+        path = self.dir / 'liste.kdl'
+        save_door_list(original, path)
+        before = path.read_bytes()
+
+        def broken_entries():
+            yield from original.iter_list_entries()
+            raise OSError("disken er full")
+
+        def broken_dict():
+            # Feiler midt i json.dump, etter at deler av filen er skrevet
+            data = original.to_list_dict()
+            data['doors'].append({'params': object()})
+            return data
+
+        for streaming, method, broken, error in (
+                (False, 'to_list_dict', broken_dict, TypeError),
+                (True, 'iter_list_entries', broken_entries, OSError)):
+            with self.subTest(streaming=streaming):
+                prod_list = make_list(10)
+                with mock.patch.object(prod_list, method, broken):
+                    with self.assertRaises(error):
+                        save_door_list(prod_list, path, streaming=streaming)
+                self.assertEqual(path.read_bytes(), before)
+                self.assertEqual([p.name for p in self.dir.iterdir()], ['liste.kdl'])
+        self.assert_loads_back(original, path)
+
+    def test_failed_binary_write_keeps_original(self):
+        original = make_list(4)
+        path = self.dir / 'liste.kdl'
+        save_door_list(original, path)
+        before = path.read_bytes()
+        with mock.patch.object(door_list_io.binary_format.os, 'replace',
+                               side_effect=OSError("ingen tilgang")):
+            with self.assertRaises(OSError):
+                save_door_list(make_list(10), path, binary=True)
+        self.assertEqual(path.read_bytes(), before)
+        self.assertEqual([p.name for p in self.dir.iterdir()], ['liste.kdl'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Dørlistemodellen: sync() skal gi radsignaler som holder en visning i takt
+med produksjonslisten. Radnummeret (#) ligger i den vertikale overskriften,
+så forskjøvne rader trenger ikke dataChanged.
+"""
+import dataclasses
+import os
+import random
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import QModelIndex, Qt
+from PyQt6.QtTest import QAbstractItemModelTester
+from PyQt6.QtWidgets import QApplication
+
+from src.gui.widgets.door_list_model import HEADERS, DoorListModel
+from src.models.door import DoorParams
+from src.models.production_list import ProductionList
+
+
+class ShadowView:
+    """Kopi av modellens tekst, oppdatert bare fra modellens signaler."""
+
+    def __init__(self, model: DoorListModel):
+        self.model = model
+        self.rows = [self.read(row) for row in range(model.rowCount())]
+        model.rowsInserted.connect(self._inserted)
+        model.rowsRemoved.connect(self._removed)
+        model.rowsMoved.connect(self._moved)
+        model.dataChanged.connect(self._changed)
+        model.modelReset.connect(self._reset)
+
+    def read(self, row: int) -> list:
+        return [self.model.data(self.model.index(row, col)) for col in range(len(HEADERS))]
+
+    def _inserted(self, parent, first, last):
+        self.rows[first:first] = [self.read(row) for row in range(first, last + 1)]
+
+    def _removed(self, parent, first, last):
+        del self.rows[first:last + 1]
+
+    def _moved(self, parent, start, end, destination, row):
+        moved = self.rows[start:end + 1]
+        del self.rows[start:end + 1]
+        if row > start:
+            row -= end - start + 1
+        self.rows[row:row] = moved
+
+    def _changed(self, top_left, bottom_right, roles=()):
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            for col in range(top_left.column(), bottom_right.column() + 1):
+                self.rows[row][col] = self.model.data(self.model.index(row, col))
+
+    def _reset(self):
+        self.rows = [self.read(row) for row in range(self.model.rowCount())]
+
+
+class DoorListModelSyncTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_random_edits_keep_view_in_sync(self):
+        rng = random.Random(5)
+        prod_list = ProductionList()
+        for i in range(5):
+            prod_list.add_door(DoorParams(project_id=f'P{i}'))
+        model = DoorListModel(prod_list)
+        tester = QAbstractItemModelTester(
+            model, QAbstractItemModelTester.FailureReportingMode.Fatal)
+        view = ShadowView(model)
+
+        for step in range(200):
+            # Flere endringer før hver sync(), slik fanen samler dem opp
+            for _ in range(rng.randint(1, 4)):
+                op = rng.random()
+                if op < 0.35 or prod_list.door_count < 3:
+                    prod_list.add_door(DoorParams(project_id=f'N{step}',
+                                                  width=rng.randint(700, 2000)))
+                elif op < 0.45:
+                    prod_list.add_doors(DoorParams(project_id=f'B{step}-{k}')
+                                        for k in range(rng.randint(1, 3)))
+                elif op < 0.65:
+                    prod_list.remove_door(rng.choice(prod_list.doors).id)
+                elif op < 0.85:
+                    prod_list.move_door(rng.choice(prod_list.doors).id,
+                                        rng.randrange(prod_list.door_count))
+                else:
+                    door = rng.choice(prod_list.doors)
+                    prod_list.update_door(door.id, dataclasses.replace(
+                        door.params, width=rng.randint(700, 2000)))
+            model.sync()
+            expected = [view.read(row) for row in range(model.rowCount())]
+            self.assertEqual(view.rows, expected, f"steg {step}")
+            self.assertEqual([model.headerData(row, Qt.Orientation.Vertical)
+                              for row in range(model.rowCount())],
+                             [str(n) for n in range(1, prod_list.door_count + 1)])
+            self.assertEqual([row[0] for row in view.rows],
+                             [door.params.project_id for door in prod_list.doors])
+        del tester
+
+    def test_changes_signal_only_affected_rows(self):
+        prod_list = ProductionList()
+        for _ in range(20):
+            prod_list.add_door(DoorParams())
+        model = DoorListModel(prod_list)
+        changed = []
+        model.dataChanged.connect(
+            lambda top, bottom, roles=(): changed.append((top.row(), bottom.row())))
+        door = prod_list.doors[7]
+        prod_list.update_door(door.id, dataclasses.replace(door.params, color='RAL 9005'))
+        model.sync()
+        self.assertEqual(changed, [(7, 7)])
+
+        changed.clear()
+        prod_list.remove_door(prod_list.doors[15].id)
+        model.sync()
+        self.assertEqual(changed, [])
+        self.assertEqual(model.rowCount(QModelIndex()), 19)
+
+
+if __name__ == '__main__':
+    unittest.main()
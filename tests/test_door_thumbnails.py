@@ -0,0 +1,72 @@
+"""
+Miniatyrbilder: like dører deler én bestilling, men alle radene som venter
+på bildet skal få det når det er ferdig.
+"""
+import os
+import tempfile
+import time
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+
+from src.gui.widgets.door_list_model import NAME_COLUMN, DoorListModel
+from src.gui.widgets.door_thumbnails import ThumbnailProvider
+from src.models.door import DoorParams
+from src.models.production_list import ProductionList
+
+TIMEOUT_S = 30
+
+
+class IdenticalDoorsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.provider = ThumbnailProvider(cache_dir=self._tmp.name, size=32)
+
+    def tearDown(self):
+        self.provider.shutdown()
+        self._tmp.cleanup()
+
+    def wait_until(self, condition) -> None:
+        deadline = time.monotonic() + TIMEOUT_S
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, "miniatyrbildet ble ikke ferdig")
+            self.app.processEvents()
+            time.sleep(0.01)
+
+    def test_provider_notifies_every_waiting_door(self):
+        ready = []
+        self.provider.thumbnail_ready.connect(
+            lambda door_id, key, image: ready.append((door_id, key)))
+        door = DoorParams()
+        self.assertIsNone(self.provider.request('a', door))
+        self.assertIsNone(self.provider.request('b', DoorParams()))
+        self.wait_until(lambda: len(ready) >= 2)
+        key = self.provider.key(door)
+        self.assertEqual(sorted(ready), [('a', key), ('b', key)])
+
+    def test_model_decorates_both_rows(self):
+        prod_list = ProductionList()
+        prod_list.add_door(DoorParams())
+        prod_list.add_door(DoorParams())
+        model = DoorListModel(prod_list, self.provider)
+        changed = set()
+        model.dataChanged.connect(lambda top, bottom, roles: changed.add(top.row()))
+
+        decoration = Qt.ItemDataRole.DecorationRole
+        for row in range(2):
+            self.assertIsNone(model.data(model.index(row, NAME_COLUMN), decoration))
+        self.wait_until(lambda: changed == {0, 1})
+        for row in range(2):
+            self.assertIsNotNone(model.data(model.index(row, NAME_COLUMN), decoration))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Per-flate-lys i 3D-visningen: den vektoriserte _normal_lit_face_colors
+skal gi samme farger som den opprinnelige løkken over flatene.
+"""
+import unittest
+
+import numpy as np
+
+from src.gui.widgets import graphics_settings as gfx
+from src.gui.widgets.scene_builder import SceneBuilder
+
+
+def reference_face_colors(verts, faces, base_color):
+    """Opprinnelig implementasjon (én flate om gangen), brukt som fasit."""
+    light_dir = np.array(gfx.LIGHT_DIRECTION, dtype=float)
+    light_dir = light_dir / np.linalg.norm(light_dir)
+    view_dir = np.array(gfx.VIEW_DIRECTION, dtype=float)
+    view_dir = view_dir / np.linalg.norm(view_dir)
+
+    r, g, b, a = base_color
+    ambient = gfx.LIGHT_AMBIENT
+    diffuse = gfx.LIGHT_DIFFUSE
+    specular = gfx.LIGHT_SPECULAR
+    shininess = gfx.LIGHT_SHININESS
+
+    colors = []
+    for face in faces:
+        v0, v1, v2 = verts[face[0]], verts[face[1]], verts[face[2]]
+        normal = np.cross(v1 - v0, v2 - v0)
+        norm_len = np.linalg.norm(normal)
+        if norm_len > 0:
+            normal = normal / norm_len
+
+        # Diffus komponent
+        n_dot_l = max(0.0, np.dot(normal, light_dir))
+        diff = diffuse * n_dot_l
+
+        # Spekulær komponent (Blinn-Phong)
+        halfway = light_dir + view_dir
+        halfway = halfway / np.linalg.norm(halfway)
+        n_dot_h = max(0.0, np.dot(normal, halfway))
+        spec = specular * (n_dot_h ** shininess) if n_dot_l > 0 else 0.0
+
+        brightness = ambient + diff + spec
+        add = gfx.LIGHT_ADDITIVE
+        colors.append([min(1.0, r * brightness + add), min(1.0, g * brightness + add),
+                       min(1.0, b * brightness + add), a])
+    return np.array(colors)
+
+
+class FaceLightingTest(unittest.TestCase):
+
+    def assert_same_colors(self, verts, faces, base_color):
+        expected = reference_face_colors(verts, faces, base_color)
+        actual = SceneBuilder._normal_lit_face_colors(verts, faces, base_color)
+        self.assertEqual(actual.shape, expected.shape)
+        self.assertTrue(np.allclose(actual, expected), np.abs(actual - expected).max())
+
+    def test_random_meshes(self):
+        rng = np.random.default_rng(12)
+        for _ in range(20):
+            verts = rng.uniform(-500, 500, size=(rng.integers(3, 60), 3))
+            faces = rng.integers(0, len(verts), size=(rng.integers(1, 200), 3))
+            base_color = tuple(rng.uniform(0, 1, size=4))
+            self.assert_same_colors(verts, faces, base_color)
+
+    def test_degenerate_faces(self):
+        # Flater med gjentatte hjørner og kolineære hjørner har null areal
+        verts = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [2.0, 0.0, 0.0],
+                          [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+        faces = np.array([[0, 0, 0], [0, 1, 1], [0, 1, 2], [0, 1, 3], [0, 3, 4], [4, 3, 0]])
+        self.assert_same_colors(verts, faces, (0.8, 0.2, 0.1, 0.5))
+
+    def test_single_face_from_lists(self):
+        verts = np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0], [0.0, 0.0, 10.0]])
+        self.assert_same_colors(verts, [[0, 1, 2]], (1.0, 1.0, 1.0, 1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
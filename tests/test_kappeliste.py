@@ -0,0 +1,233 @@
+"""
+Kappeliste: inkrementell aggregering skal gi samme resultat som en ny
+liste bygd fra de samme dørene, uansett hvilke endringer som førte dit,
+og samme rader i samme rekkefølge som den opprinnelige samlede
+grupperingen (kopiert under som fasit).
+"""
+import dataclasses
+import random
+import unittest
+from collections import defaultdict
+
+from src.models.door import DoorParams
+from src.models.kappeliste import (
+    DIVERSE_KOMPONENT_ORDER, KARM_FAMILY_GROUPS, KARM_FAMILY_ORDER,
+    KARM_FAMILY_TITLES, KARM_KOMPONENT_ORDER, format_ordre_refs, format_vh,
+)
+from src.models.production_list import ProductionList
+from src.utils.constants import DOOR_KARM_TYPES
+
+COLORS = ['RAL 9010', 'RAL 9016', 'RAL 7035']
+NOTES = ['', '', 'Merk A', 'Merk B', 'Merk C']
+
+
+def random_door(rng: random.Random) -> DoorParams:
+    door = DoorParams()
+    door.door_type = rng.choice(list(DOOR_KARM_TYPES))
+    door.apply_defaults_for_type()
+    door.karm_type = rng.choice(DOOR_KARM_TYPES[door.door_type])
+    door.floyer = rng.choice([1, 2])
+    # Få ulike mål, slik at mange rader bare skiller seg på farge
+    door.width = rng.choice([900, 1010, 1210])
+    door.height = rng.choice([2010, 2110])
+    door.color = rng.choice(COLORS)
+    door.karm_color = rng.choice(COLORS)
+    door.notes = rng.choice(NOTES)
+    door.adjufix = rng.random() < 0.5
+    door.sparkeplate = rng.random() < 0.5
+    door.avviserboyler = rng.random() < 0.5
+    return door
+
+
+# =============================================================================
+# FASIT: opprinnelig gruppering over alle komponenter (før inkrementell versjon)
+# =============================================================================
+
+def baseline_karm_rows(items) -> list:
+    groups = defaultdict(lambda: {'V': 0, 'H': 0, 'none': 0})
+    ordre_counts = defaultdict(lambda: defaultdict(int))
+    notes_per_group = defaultdict(list)
+    adjufix_sides = defaultdict(lambda: defaultdict(int))
+    hinge_count_sides = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+
+    for item in items:
+        key = (item.komponent, item.lengde, item.farge)
+        side_key = item.side or 'none'
+        if item.side in ('V', 'H'):
+            groups[key][item.side] += item.antall
+        else:
+            groups[key]['none'] += item.antall
+        ordre_counts[key][item.ordre_ref] += item.antall
+        if item.notes and item.notes not in notes_per_group[key]:
+            notes_per_group[key].append(item.notes)
+        if item.komponent in ('Hengselside', 'Sluttstykkeside') and item.adjufix:
+            adjufix_sides[key][side_key] += item.antall
+        if item.komponent == 'Hengselside' and item.hinge_count > 2:
+            hinge_count_sides[key][item.hinge_count][side_key] += item.antall
+
+    def sort_key(entry):
+        komponent, lengde, _farge = entry[0]
+        order = (KARM_KOMPONENT_ORDER.index(komponent)
+                 if komponent in KARM_KOMPONENT_ORDER else 99)
+        return (order, lengde or 0)
+
+    rows = []
+    for key, counts in sorted(groups.items(), key=sort_key):
+        komponent, lengde, farge = key
+        merknad_parts = []
+        if key in adjufix_sides:
+            merknad_parts.append(f'Karmhylser ({format_vh(adjufix_sides[key])})')
+        if key in hinge_count_sides:
+            for hc in sorted(hinge_count_sides[key]):
+                merknad_parts.append(f'{hc} hengsler ({format_vh(hinge_count_sides[key][hc])})')
+        merknad_parts.extend(notes_per_group[key])
+        rows.append({
+            'profilnavn': komponent,
+            'stk': counts['V'] + counts['H'] + counts['none'],
+            'mm': str(lengde) if lengde else '',
+            'slagretning': format_vh(counts),
+            'farge': farge or '',
+            'ordre': format_ordre_refs(ordre_counts[key]),
+            'merknad': ', '.join(merknad_parts),
+        })
+    return rows
+
+
+def baseline_standard_rows(items) -> list:
+    groups = defaultdict(int)
+    ordre_counts = defaultdict(lambda: defaultdict(int))
+    for item in items:
+        if item.bredde and item.hoyde:
+            mm_str = f"{item.bredde} x {item.hoyde}"
+        elif item.lengde:
+            mm_str = str(item.lengde)
+        else:
+            mm_str = ''
+        key = (item.komponent, mm_str, item.farge or '')
+        groups[key] += item.antall
+        ordre_counts[key][item.ordre_ref] += item.antall
+
+    rows = []
+    for key, total in sorted(groups.items(), key=lambda entry: (entry[0][0], entry[0][1])):
+        komponent, mm_str, farge = key
+        rows.append({
+            'profilnavn': komponent, 'stk': total, 'mm': mm_str, 'slagretning': '',
+            'farge': farge, 'ordre': format_ordre_refs(ordre_counts[key]), 'merknad': '',
+        })
+    return rows
+
+
+def baseline_sections(items) -> list:
+    karm_komps = {'Overligger', 'Hengselside', 'Sluttstykkeside'}
+    karm_by_family = defaultdict(list)
+    for item in items:
+        if item.komponent in karm_komps:
+            karm_by_family[KARM_FAMILY_GROUPS.get(item.karm_type, item.karm_type)].append(item)
+    sections = [{'title': KARM_FAMILY_TITLES[family], 'rows': baseline_karm_rows(karm_by_family[family])}
+                for family in KARM_FAMILY_ORDER if karm_by_family.get(family)]
+    dorramme_items = [i for i in items if i.komponent.startswith('DR')]
+    if dorramme_items:
+        sections.append({'title': 'Dørrammer', 'rows': baseline_standard_rows(dorramme_items)})
+    return sections
+
+
+def baseline_diverse_rows(items) -> list:
+    groups = defaultdict(int)
+    ordre_counts = defaultdict(lambda: defaultdict(int))
+    for item in items:
+        if item.komponent not in DIVERSE_KOMPONENT_ORDER:
+            continue
+        key = (item.komponent, item.bredde, item.hoyde, item.lengde, item.farge or '')
+        groups[key] += item.antall
+        ordre_counts[key][item.ordre_ref] += item.antall
+
+    def sort_key(entry):
+        komponent, bredde, hoyde, lengde, _farge = entry[0]
+        if komponent.startswith('PC dørblad'):
+            return (2, bredde or 0, hoyde or 0, komponent)
+        return (DIVERSE_KOMPONENT_ORDER.index(komponent), bredde or 0, hoyde or 0, lengde or 0)
+
+    rows = []
+    for key, total in sorted(groups.items(), key=sort_key):
+        komponent, bredde, hoyde, lengde, farge = key
+        rows.append({
+            'forklaring': komponent,
+            'stk': total,
+            'b_mm': str(bredde) if bredde else (str(lengde) if lengde else ''),
+            'h_mm': str(hoyde) if hoyde else '',
+            'farge': farge,
+            'ordre': format_ordre_refs(ordre_counts[key]),
+            'merknad': '',
+        })
+    return rows
+
+
+def fresh_copy(prod_list: ProductionList) -> ProductionList:
+    fresh = ProductionList()
+    fresh.add_doors(dataclasses.replace(door.params) for door in prod_list.doors)
+    return fresh
+
+
+class IncrementalKappelisteTest(unittest.TestCase):
+
+    def assert_matches_fresh(self, prod_list: ProductionList) -> None:
+        fresh = fresh_copy(prod_list)
+        self.assertEqual(prod_list.get_kappeliste_sections(), fresh.get_kappeliste_sections())
+        self.assertEqual(prod_list.get_diverse_rows(), fresh.get_diverse_rows())
+        self.assert_matches_baseline(prod_list)
+
+    def assert_matches_baseline(self, prod_list: ProductionList) -> None:
+        items = prod_list.get_all_items()
+        self.assertEqual(prod_list.get_kappeliste_sections(), baseline_sections(items))
+        self.assertEqual(prod_list.get_diverse_rows(), baseline_diverse_rows(items))
+
+    def test_fresh_build_matches_baseline(self):
+        rng = random.Random(11)
+        prod_list = ProductionList()
+        prod_list.add_doors(random_door(rng) for _ in range(300))
+        self.assert_matches_baseline(prod_list)
+
+    def test_edits_match_fresh_build(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                rng = random.Random(seed)
+                prod_list = ProductionList()
+                prod_list.add_doors(random_door(rng) for _ in range(300))
+                prod_list.get_kappeliste_sections()   # Aggregeringen bygges her
+
+                for _ in range(30):
+                    ids = [door.id for door in prod_list.doors]
+                    action = rng.random()
+                    if action < 0.5:
+                        prod_list.update_door(rng.choice(ids), random_door(rng))
+                    elif action < 0.8:
+                        prod_list.remove_door(rng.choice(ids))
+                    else:
+                        prod_list.add_door(random_door(rng))
+                    self.assert_matches_fresh(prod_list)
+
+    def test_note_order_follows_door_order(self):
+        prod_list = ProductionList()
+        first, second = prod_list.add_doors([DoorParams(notes='A'), DoorParams(notes='B')])
+        prod_list.get_kappeliste_sections()
+        # Merknad A forsvinner og kommer tilbake på den første døren
+        prod_list.update_door(first, DoorParams(notes=''))
+        prod_list.get_kappeliste_sections()
+        prod_list.update_door(first, DoorParams(notes='A'))
+
+        merknader = {row['merknad'] for section in prod_list.get_kappeliste_sections()
+                     for row in section['rows'] if row['merknad']}
+        self.assertEqual(merknader, {'A, B'})
+        self.assert_matches_fresh(prod_list)
+
+    def test_move_matches_fresh_build(self):
+        rng = random.Random(7)
+        prod_list = ProductionList()
+        ids = prod_list.add_doors(random_door(rng) for _ in range(50))
+        prod_list.get_kappeliste_sections()
+        prod_list.move_door(ids[-1], 0)
+        self.assert_matches_fresh(prod_list)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+"""
+Offset-tabellen: ukjente kombinasjoner skal gi samme svar som
+resolve_offsets uten å legges til i tabellen.
+"""
+import unittest
+
+from src.utils import offset_table
+from src.utils.offset_table import OFFSET_TABLE, lookup, resolve_offsets
+
+
+class LookupTest(unittest.TestCase):
+
+    def test_known_key_from_table(self):
+        key = next(iter(OFFSET_TABLE))
+        self.assertIs(lookup(*key), OFFSET_TABLE[key])
+
+    def test_unknown_key_not_stored(self):
+        size = len(OFFSET_TABLE)
+        for i in range(50):
+            key = ('SDI', 'SD1', f'UKJENT_{i}', 1, None)
+            self.assertEqual(lookup(*key), resolve_offsets(*key))
+        self.assertEqual(len(offset_table.OFFSET_TABLE), size)
+
+
+if __name__ == '__main__':
+    unittest.main()
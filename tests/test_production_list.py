@@ -0,0 +1,110 @@
+"""
+ProductionList.add_doors: samlet innsetting skal logge én endring, gi samme
+resultat som add_door for hver dør, og vente med visningsnavnet til det
+leses.
+"""
+import dataclasses
+import random
+import unittest
+from unittest import mock
+
+from src.models.door import DoorParams
+from src.models.production_list import ProductionDoor, ProductionList
+from tests.test_kappeliste import fresh_copy, random_door
+
+
+def snapshot(prod_list: ProductionList) -> tuple:
+    """Alt som er avledet av dørene, uten dør-ID-ene."""
+    return (
+        [door.params.to_dict() for door in prod_list.doors],
+        [door.label for door in prod_list.doors],
+        [dataclasses.replace(item, dor_id='') for item in prod_list.get_all_items()],
+        prod_list.get_kappeliste_sections(),
+        prod_list.get_diverse_rows(),
+    )
+
+
+class AddDoorsTest(unittest.TestCase):
+
+    def test_logs_one_insert(self):
+        prod_list = ProductionList()
+        prod_list.add_door(DoorParams())
+        prod_list.add_door(DoorParams())
+        revision = prod_list.revision
+
+        ids = prod_list.add_doors(DoorParams(width=800 + i) for i in range(5))
+        self.assertEqual(prod_list.changes_since(revision), [('insert', 2, ids)])
+        self.assertEqual(prod_list.revision, revision + 1)
+        self.assertEqual([door.id for door in prod_list.doors[2:]], ids)
+        self.assertEqual([prod_list.index_of(door_id) for door_id in ids], [2, 3, 4, 5, 6])
+
+    def test_empty_sequence_changes_nothing(self):
+        prod_list = ProductionList()
+        revision = prod_list.revision
+        self.assertEqual(prod_list.add_doors([]), [])
+        self.assertEqual(prod_list.changes_since(revision), [])
+
+    def test_failing_sequence_adds_nothing(self):
+        prod_list = ProductionList()
+        prod_list.add_door(DoorParams())
+        revision = prod_list.revision
+
+        def doors():
+            yield DoorParams()
+            raise ValueError("ugyldig dør")
+
+        with self.assertRaises(ValueError):
+            prod_list.add_doors(doors())
+        self.assertEqual(prod_list.door_count, 1)
+        self.assertEqual(prod_list.changes_since(revision), [])
+
+    def test_matches_repeated_add_door(self):
+        rng = random.Random(7)
+        doors = [random_door(rng) for _ in range(120)]
+        for warm_cache in (False, True):
+            with self.subTest(warm_cache=warm_cache):
+                one_by_one = ProductionList()
+                bulk = ProductionList()
+                for prod_list in (one_by_one, bulk):
+                    prod_list.add_door(doors[0])
+                    if warm_cache:
+                        prod_list.get_all_items()
+                for door in doors[1:]:
+                    one_by_one.add_door(door)
+                bulk.extend(iter(doors[1:]))
+                self.assertEqual(snapshot(bulk), snapshot(one_by_one))
+                self.assertEqual(snapshot(bulk), snapshot(fresh_copy(bulk)))
+
+
+class LazyLabelTest(unittest.TestCase):
+
+    def test_label_generated_on_first_access(self):
+        prod_list = ProductionList()
+        with mock.patch.object(ProductionDoor, '_generate_label', autospec=True,
+                               side_effect=ProductionDoor._generate_label) as generate:
+            prod_list.add_doors(DoorParams(width=900 + i * 100) for i in range(3))
+            prod_list.get_all_items()
+            self.assertEqual(generate.call_count, 0)
+
+            door = prod_list.doors[1]
+            label = door.label
+            self.assertEqual(generate.call_count, 1)
+            self.assertEqual(door.label, label)
+            self.assertEqual(generate.call_count, 1)
+        self.assertTrue(label.endswith('10x21'))
+
+    def test_label_regenerated_after_update(self):
+        prod_list = ProductionList()
+        door_id = prod_list.add_door(DoorParams(width=1000))
+        self.assertTrue(prod_list.get_door(door_id).label.endswith('10x21'))
+        prod_list.update_door(door_id, DoorParams(width=1200))
+        self.assertTrue(prod_list.get_door(door_id).label.endswith('12x21'))
+
+    def test_explicit_label_kept(self):
+        door = ProductionDoor(id='', params=DoorParams())
+        door.label = 'Min dør'
+        self.assertEqual(door.label, 'Min dør')
+
+
+if __name__ == '__main__':
+    unittest.main()
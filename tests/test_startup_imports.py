@@ -0,0 +1,63 @@
+"""
+Oppstart: `import main` skal ikke dra inn 3D-visningens OpenGL-pakker
+eller eksportbibliotekene, og importtiden skal holde seg under budsjettet.
+
+Måles med `python -X importtime` i en egen prosess.
+"""
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Budsjett for kumulativ importtid av main (ms). Målt til ca. 350–450 ms;
+# budsjettet gir rom for tregere maskiner.
+IMPORT_BUDGET_MS = 1000
+
+# Moduler som lastes først ved bruk (3D-visning og eksport)
+LAZY_PREFIXES = (
+    'pyqtgraph', 'OpenGL', 'reportlab', 'svglib', 'docx',
+    'src.export.pdf_exporter', 'src.export.pdf_kappeliste',
+    'src.export.docx_ordretekst',
+)
+
+
+def import_main() -> dict:
+    """Kjører `import main` med -X importtime og returnerer {modul: kumulativ µs}."""
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative_us)
+    return modules
+
+
+class StartupImportTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.modules = import_main()
+
+    def test_lazy_modules_not_imported(self):
+        eager = sorted(name for name in self.modules
+                       if any(name == p or name.startswith(p + '.') for p in LAZY_PREFIXES))
+        self.assertEqual(eager, [])
+
+    def test_import_time_within_budget(self):
+        self.assertIn('main', self.modules)
+        elapsed_ms = self.modules['main'] / 1000
+        self.assertLess(elapsed_ms, IMPORT_BUDGET_MS,
+                        f"import main tok {elapsed_ms:.0f} ms (budsjett {IMPORT_BUDGET_MS} ms)")
+
+
+if __name__ == '__main__':
+    unittest.main()